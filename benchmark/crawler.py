@@ -0,0 +1,260 @@
+r'''
+Throughput of each crawler's `main` against local mock websites from
+`benchmark.mock_site`, without touching real websites.
+
+Sleeps in `news.crawlers.util` are disabled since they only measure how long
+we wait after being banned. Each crawler writes to a fresh database under
+`data/raw/benchmark`.
+
+```sh
+python -m benchmark.crawler --crawler_names cna ettoday udn --latency 0.02
+python -m benchmark.crawler --crawler_names ntdtv epochtimes --seen_filter
+python -m benchmark.crawler --crawler_names ltn udn --recrawl_hours 1 \
+    --incremental
+```
+'''
+import argparse
+import glob
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import news.crawlers
+import news.db
+from benchmark.mock_site import EPOCH, FIRST_IDX, MockSite, get_server
+from run_crawler import CRAWLER_DICT
+
+
+def parse_argument():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--crawler_names',
+        nargs='+',
+        choices=CRAWLER_DICT.keys(),
+        type=str,
+        default=list(CRAWLER_DICT.keys()),
+        help='Select crawlers.',
+    )
+    parser.add_argument(
+        '--current_datetime',
+        type=str,
+        default='2021-06-30T00:00:00Z',
+        help='Specify the upper bound of the news release time.',
+    )
+    parser.add_argument(
+        '--days',
+        type=int,
+        default=1,
+        help='Specify number of days to crawl.',
+    )
+    parser.add_argument(
+        '--news_per_day',
+        type=int,
+        default=100,
+        help='Specify number of news per day (per category).',
+    )
+    parser.add_argument(
+        '--miss_ratio',
+        type=float,
+        default=0.1,
+        help='Specify ratio of missing (404) news.',
+    )
+    parser.add_argument(
+        '--ban_ratio',
+        type=float,
+        default=0.0,
+        help='Specify ratio of banned (403) responses.',
+    )
+    parser.add_argument(
+        '--throttle_ratio',
+        type=float,
+        default=0.0,
+        help='Specify ratio of too many requests (429) responses.',
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='Specify seconds to delay each response.',
+    )
+    parser.add_argument(
+        '--page_size',
+        type=int,
+        default=30000,
+        help='Specify number of characters in each generated html.',
+    )
+    parser.add_argument(
+        '--n_workers',
+        type=int,
+        default=1,
+        help='Specify number of workers of crawlers which support it.',
+    )
+    parser.add_argument(
+        '--seen_filter',
+        action='store_true',
+        help='Select whether skip requesting crawled news with bloom filter.',
+    )
+    parser.add_argument(
+        '--recrawl_hours',
+        type=int,
+        default=0,
+        help='Specify hours after which the same time span is crawled again. '
+        'Skip recrawl if 0.',
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Select whether crawl incrementally with listing state and bloom '
+        'filter.',
+    )
+    parser.add_argument(
+        '--metrics_path',
+        type=str,
+        default=None,
+        help='Assign Prometheus text file to write crawler metrics after '
+        'benchmark.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Specify random seed.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    current_datetime = datetime.fromisoformat(
+        args.current_datetime.replace('Z', '+00:00')
+    )
+    past_datetime = current_datetime - timedelta(days=args.days)
+
+    # Websites use UTC+8.
+    site = MockSite(
+        now=current_datetime.astimezone(
+            timezone(timedelta(hours=8))
+        ).replace(tzinfo=None),
+        news_per_day=args.news_per_day,
+        miss_ratio=args.miss_ratio,
+        ban_ratio=args.ban_ratio,
+        throttle_ratio=args.throttle_ratio,
+        page_size=args.page_size,
+        seed=args.seed,
+    )
+    server = get_server(site=site, latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    news.crawlers.util.BASE_URL = (
+        f'http://127.0.0.1:{server.server_address[1]}'
+    )
+
+    for company in news.crawlers.util.BEFORE_BANNED_SLEEP_SECS:
+        news.crawlers.util.BEFORE_BANNED_SLEEP_SECS[company] = 0.0
+        news.crawlers.util.AFTER_BANNED_SLEEP_SECS[company] = 0.0
+
+    # TVBS needs explicit id range.
+    def to_tvbs_idx(value: datetime) -> int:
+        local = value.astimezone(timezone(timedelta(hours=8)))
+        return FIRST_IDX['tvbs'] + int(
+            (local.replace(tzinfo=None) - EPOCH) / site.interval
+        )
+
+    def crawl(
+        name: str,
+        crawler_name: str,
+        db_name: str,
+        current_datetime: datetime,
+        past_datetime: datetime,
+    ):
+        func = CRAWLER_DICT[crawler_name]
+        params = {
+            'current_datetime': current_datetime,
+            'db_name': db_name,
+            'debug': False,
+            'first_idx': -1,
+            'latest_idx': -1,
+            'n_workers': args.n_workers,
+            'past_datetime': past_datetime,
+        }
+        if crawler_name == 'tvbs':
+            params['first_idx'] = to_tvbs_idx(past_datetime)
+            params['latest_idx'] = to_tvbs_idx(current_datetime)
+
+        n_requests = sum(site.stats.values())
+        conn = news.db.util.get_conn(db_name=f'raw/{db_name}')
+        news.db.create.create_table(cur=conn.cursor())
+        n_news = list(conn.execute('SELECT COUNT(*) FROM news'))[0][0]
+        conn.close()
+
+        start = time.perf_counter()
+        func(**dict(
+            (k, v) for k, v in params.items()
+            if k in func.__code__.co_varnames
+        ))
+        elapsed = time.perf_counter() - start
+
+        n_requests = sum(site.stats.values()) - n_requests
+        conn = news.db.util.get_conn(db_name=f'raw/{db_name}')
+        n_news = list(conn.execute('SELECT COUNT(*) FROM news'))[0][0] - n_news
+        conn.close()
+
+        print(
+            f'{name:<16}{n_requests:>10}{n_news:>8}{elapsed:>9.2f}'
+            f'{n_requests / elapsed:>10.1f}{n_news / elapsed:>9.1f}'
+        )
+
+    print(
+        f'{"crawler":<16}{"requests":>10}{"news":>8}{"secs":>9}'
+        f'{"pages/s":>10}{"news/s":>9}'
+    )
+    for crawler_name in args.crawler_names:
+        db_name = f'benchmark/{crawler_name}.db'
+        for path in glob.glob(news.db.util.get_path(f'raw/{db_name}') + '*'):
+            os.remove(path)
+
+        # Listings of categories overlap, so news crawled in previous units
+        # are skipped.
+        if args.seen_filter or args.incremental:
+            bloom_name = f'raw/benchmark/{crawler_name}.bloom'
+            if os.path.exists(news.db.util.get_path(bloom_name)):
+                os.remove(news.db.util.get_path(bloom_name))
+            news.crawlers.seen.set_seen(
+                bloom_name=bloom_name,
+                db_names=[f'raw/{db_name}'],
+            )
+        if args.incremental:
+            news.crawlers.listing.set_listing_state(db_name=f'raw/{db_name}')
+
+        crawl(
+            name=crawler_name,
+            crawler_name=crawler_name,
+            db_name=db_name,
+            current_datetime=current_datetime,
+            past_datetime=past_datetime,
+        )
+
+        # Crawl the same time span again after new news are released.
+        if args.recrawl_hours:
+            recrawl = timedelta(hours=args.recrawl_hours)
+            site.now += recrawl
+            crawl(
+                name=f'{crawler_name}+{args.recrawl_hours}h',
+                crawler_name=crawler_name,
+                db_name=db_name,
+                current_datetime=current_datetime + recrawl,
+                past_datetime=past_datetime + recrawl,
+            )
+            site.now -= recrawl
+
+        news.crawlers.listing.set_listing_state(db_name=None)
+
+    news.crawlers.seen.set_seen(bloom_name=None)
+    server.shutdown()
+
+    if args.metrics_path:
+        with open(args.metrics_path, 'w') as f:
+            f.write(news.crawlers.metrics.METRICS.to_prometheus())
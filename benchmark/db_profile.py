@@ -0,0 +1,183 @@
+r'''
+Insert and full scan throughput of each `news.db.util.CONN_PROFILES`.
+
+Each profile writes its own generated database under `data/benchmark` with
+one commit per batch (like crawlers do), then every profile scans the
+same database, the one written with SQLite default settings, so that scan
+throughput only differs by connection settings.
+
+```sh
+python -m benchmark.db_profile --db_size_mb 4096
+```
+'''
+import argparse
+import os
+import random
+import time
+from typing import Dict, List
+
+import news.db
+from news.db.schema import News
+
+# `None` means SQLite default settings.
+PROFILES = [None, *news.db.util.CONN_PROFILES.keys()]
+
+
+def parse_argument():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--db_size_mb',
+        type=int,
+        default=2048,
+        help='Specify approximate size of each generated database.',
+    )
+    parser.add_argument(
+        '--raw_xml_size',
+        type=int,
+        default=60000,
+        help='Specify number of characters in each `raw_xml`.',
+    )
+    parser.add_argument(
+        '--batch_size',
+        type=int,
+        default=1000,
+        help='Specify number of records per commit.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Specify random seed.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+def generate_batch(
+    first_idx: int,
+    batch_size: int,
+    raw_xml_size: int,
+    pool: str,
+) -> List[News]:
+    news_list = []
+    for idx in range(first_idx, first_idx + batch_size):
+        start = random.randrange(len(pool) - raw_xml_size)
+        raw_xml = pool[start:start + raw_xml_size]
+        news_list.append(News(
+            article=raw_xml[:raw_xml_size // 20],
+            category='政治',
+            company='中央社',
+            datetime=f'2021-{idx % 12 + 1:02d}-01T00:00:00.000000Z',
+            raw_xml=raw_xml,
+            reporter='記者',
+            title=raw_xml[:30],
+            url=f'https://example.com/news/{idx}',
+        ))
+    return news_list
+
+
+def bench_insert(
+    db_name: str,
+    profile: str,
+    n_records: int,
+    batch_size: int,
+    raw_xml_size: int,
+    pool: str,
+) -> Dict[str, float]:
+    db_path = news.db.util.get_path(db_name)
+    for suffix in ['', '-wal', '-shm']:
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    conn = news.db.util.get_conn(db_name=db_name, profile=profile)
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+
+    elapsed = 0.0
+    for first_idx in range(0, n_records, batch_size):
+        news_list = generate_batch(
+            first_idx=first_idx,
+            batch_size=min(batch_size, n_records - first_idx),
+            raw_xml_size=raw_xml_size,
+            pool=pool,
+        )
+        # Exclude data generation time.
+        start = time.perf_counter()
+        news.db.write.write_new_records(cur=cur, news_list=news_list)
+        conn.commit()
+        elapsed += time.perf_counter() - start
+
+    conn.close()
+
+    return {
+        'records/s': n_records / elapsed,
+        'MB/s': os.path.getsize(db_path) / 1024 ** 2 / elapsed,
+    }
+
+
+def bench_scan(db_name: str, profile: str) -> Dict[str, float]:
+    conn = news.db.util.get_conn(db_name=db_name, profile=profile)
+    cur = conn.cursor()
+
+    start = time.perf_counter()
+    n_records = 0
+    n_bytes = 0
+    for article, raw_xml in cur.execute('SELECT article, raw_xml FROM news'):
+        n_records += 1
+        n_bytes += len(article) + len(raw_xml)
+    elapsed = time.perf_counter() - start
+
+    conn.close()
+
+    return {
+        'records/s': n_records / elapsed,
+        'MB/s': n_bytes / 1024 ** 2 / elapsed,
+    }
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+    random.seed(args.seed)
+
+    # CJK characters are 3 bytes in UTF-8.
+    n_records = max(1, args.db_size_mb * 1024 ** 2 // (3 * args.raw_xml_size))
+    pool = ''.join(
+        chr(random.randint(0x4E00, 0x9FFF))
+        for _ in range(args.raw_xml_size * 4)
+    )
+
+    print(f'{"profile":<16}{"insert records/s":>18}{"insert MB/s":>14}')
+    db_names = {}
+    for profile in PROFILES:
+        # Read only profile cannot insert.
+        if profile and news.db.util.CONN_PROFILES[profile].get('query_only'):
+            continue
+
+        db_names[profile] = f'benchmark/db_profile_{profile or "default"}.db'
+        result = bench_insert(
+            db_name=db_names[profile],
+            profile=profile,
+            n_records=n_records,
+            batch_size=args.batch_size,
+            raw_xml_size=args.raw_xml_size,
+            pool=pool,
+        )
+        print(
+            f'{profile or "default":<16}'
+            f'{result["records/s"]:>18.1f}{result["MB/s"]:>14.1f}'
+        )
+
+    print(f'{"profile":<16}{"scan records/s":>18}{"scan MB/s":>14}')
+    for profile in PROFILES:
+        result = bench_scan(db_name=db_names[None], profile=profile)
+        print(
+            f'{profile or "default":<16}'
+            f'{result["records/s"]:>18.1f}{result["MB/s"]:>14.1f}'
+        )
+
+    for db_name in db_names.values():
+        db_path = news.db.util.get_path(db_name)
+        for suffix in ['', '-wal', '-shm']:
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
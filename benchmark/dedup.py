@@ -0,0 +1,182 @@
+r'''
+Precision, recall and throughput of `news.db.dedup` on a generated corpus.
+
+Corpus contains original articles, syndicated copies (verbatim or lightly
+edited, with different reporter lines), and follow-up articles which quote
+part of an original but are not duplicates.
+
+```sh
+python -m benchmark.dedup --n_originals 20000
+```
+'''
+import argparse
+import random
+import sqlite3
+import time
+from typing import List, Tuple
+
+import news.db
+from news.db.schema import News
+
+
+def parse_argument():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--n_originals',
+        type=int,
+        default=5000,
+        help='Specify number of original articles.',
+    )
+    parser.add_argument(
+        '--copy_ratio',
+        type=float,
+        default=0.3,
+        help='Specify ratio of originals which are syndicated.',
+    )
+    parser.add_argument(
+        '--edit_ratio',
+        type=float,
+        default=0.1,
+        help='Specify ratio of sentences rewritten in edited copies.',
+    )
+    parser.add_argument(
+        '--quote_ratio',
+        type=float,
+        default=0.3,
+        help='Specify ratio of sentences quoted by follow-up articles.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Specify random seed.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+def random_word() -> str:
+    return ''.join(
+        chr(random.randint(0x4E00, 0x9FFF))
+        for _ in range(random.randint(1, 3))
+    )
+
+
+def random_sentence(vocab: List[str]) -> str:
+    return ''.join(random.choices(vocab, k=random.randint(8, 20))) + '。'
+
+
+def generate_corpus(
+    n_originals: int,
+    copy_ratio: float,
+    edit_ratio: float,
+    quote_ratio: float,
+) -> List[Tuple[News, int]]:
+    r'''
+    Return shuffled `(news, group)`. News in the same group are duplicates.
+    '''
+    vocab = [random_word() for _ in range(5000)]
+    corpus = []
+    for group in range(n_originals):
+        sentences = [
+            random_sentence(vocab)
+            for _ in range(random.randint(15, 40))
+        ]
+        corpus.append((sentences, group, 'original'))
+
+        if random.random() < copy_ratio:
+            copied = list(sentences)
+            # Lightly edited copy.
+            if random.random() < 0.5:
+                copied = [
+                    random_sentence(vocab)
+                    if random.random() < edit_ratio else sentence
+                    for sentence in copied
+                ]
+                copied.pop(random.randrange(len(copied)))
+            corpus.append((copied, group, 'copy'))
+
+        if random.random() < 0.2:
+            # Follow-up article quoting part of the original.
+            quoted = random.sample(
+                sentences,
+                k=int(len(sentences) * quote_ratio),
+            )
+            follow_up = quoted + [
+                random_sentence(vocab)
+                for _ in range(len(sentences) - len(quoted))
+            ]
+            random.shuffle(follow_up)
+            corpus.append((follow_up, n_originals + group, 'follow_up'))
+
+    # Originals come before copies in crawling order.
+    random.shuffle(corpus)
+    corpus.sort(key=lambda item: item[2] != 'original')
+
+    return [
+        (
+            News(
+                article=f'(記者{random_word()}台北電)' + ''.join(sentences),
+                company=random.choice(['中央社', '聯合', '自由', '中時']),
+                url=f'https://example.com/{idx}',
+            ),
+            group,
+        )
+        for idx, (sentences, group, _) in enumerate(corpus)
+    ]
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+    random.seed(args.seed)
+
+    corpus = generate_corpus(
+        n_originals=args.n_originals,
+        copy_ratio=args.copy_ratio,
+        edit_ratio=args.edit_ratio,
+        quote_ratio=args.quote_ratio,
+    )
+
+    conn = sqlite3.connect(':memory:')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.db.write.write_new_records(
+        cur=cur,
+        news_list=[n for n, _ in corpus],
+    )
+
+    # Batch mode.
+    news.db.dedup.create_dedup_table(cur=cur)
+    start = time.perf_counter()
+    n_news, n_duplicates = news.db.dedup.index_new_records(cur=cur)
+    elapsed = time.perf_counter() - start
+
+    url_to_group = {n.url: group for n, group in corpus}
+    id_to_group = {
+        news_id: url_to_group[url]
+        for news_id, url in cur.execute('SELECT id, url FROM news')
+    }
+    seen_groups = set()
+    n_true_duplicates = 0
+    for news_id in sorted(id_to_group):
+        if id_to_group[news_id] in seen_groups:
+            n_true_duplicates += 1
+        seen_groups.add(id_to_group[news_id])
+
+    n_correct = 0
+    for news_id, duplicate_of in cur.execute('''
+        SELECT news_id, duplicate_of FROM news_signature
+        WHERE duplicate_of IS NOT NULL
+    '''):
+        if id_to_group[news_id] == id_to_group[duplicate_of]:
+            n_correct += 1
+
+    print(f'news:            {n_news}')
+    print(f'true duplicates: {n_true_duplicates}')
+    print(f'flagged:         {n_duplicates}')
+    print(f'precision:       {n_correct / max(n_duplicates, 1):.4f}')
+    print(f'recall:          {n_correct / max(n_true_duplicates, 1):.4f}')
+    print(f'throughput:      {n_news / elapsed:.1f} news/s')
+
+    conn.close()
@@ -0,0 +1,208 @@
+r'''
+Throughput of merging one generated database into another.
+
+- `list`: algorithm of the former `news.preprocess.preprocess.merge_db`,
+  which loads source news in Python and looks up each url in a list of
+  target urls. It is quadratic, so only `--n_list_records` news are merged.
+- `set`: the same with a set of target urls and streamed source news.
+- `attach`: `news.db.merge.merge_records`.
+
+Both databases have `--n_records` news and share `--overlap` of their urls.
+
+```sh
+python -m benchmark.merge --n_records 2000000
+```
+'''
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import time
+
+import news.db
+
+METHODS = ['list', 'set', 'attach']
+
+COLUMNS = (
+    'article, category, company, datetime, raw_xml, reporter, title, url'
+)
+
+
+def parse_argument():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--n_records',
+        type=int,
+        default=1000000,
+        help='Specify number of news in each database.',
+    )
+    parser.add_argument(
+        '--n_list_records',
+        type=int,
+        default=20000,
+        help='Specify number of news in each database for `list` method.',
+    )
+    parser.add_argument(
+        '--overlap',
+        type=float,
+        default=0.2,
+        help='Specify ratio of source urls which are in target.',
+    )
+    parser.add_argument(
+        '--article_size',
+        type=int,
+        default=500,
+        help='Specify number of characters in each article.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Specify random seed.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+def generate_db(
+    path: str,
+    first_idx: int,
+    n_records: int,
+    article_size: int,
+    pool: str,
+):
+    conn = sqlite3.connect(path)
+    news.db.util.set_profile(conn=conn, profile='bulk-import')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+
+    def generate_rows():
+        for idx in range(first_idx, first_idx + n_records):
+            start = random.randrange(len(pool) - article_size)
+            article = pool[start:start + article_size]
+            yield (
+                article,
+                None,
+                f'company{idx % 11}',
+                f'2021-{idx % 12 + 1:02d}-01T00:00:00.000000Z',
+                None,
+                None,
+                article[:30],
+                f'https://example.com/news/{idx}',
+            )
+
+    cur.executemany(
+        f'INSERT INTO news({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        generate_rows(),
+    )
+    conn.commit()
+    conn.close()
+
+
+def merge_list(src_path: str, dest_path: str) -> int:
+    src_conn = sqlite3.connect(src_path)
+    dataset = list(src_conn.execute(f'SELECT {COLUMNS} FROM news'))
+    src_conn.close()
+
+    conn = sqlite3.connect(dest_path)
+    db_url = list(map(lambda x: x[0], conn.execute('SELECT url FROM news')))
+    data = [row for row in dataset if row[-1] not in db_url]
+    conn.executemany(
+        f'INSERT INTO news({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        data,
+    )
+    conn.commit()
+    conn.close()
+    return len(data)
+
+
+def merge_set(src_path: str, dest_path: str) -> int:
+    conn = sqlite3.connect(dest_path)
+    news.db.util.set_profile(conn=conn, profile='bulk-import')
+    db_url = set(map(lambda x: x[0], conn.execute('SELECT url FROM news')))
+
+    src_conn = sqlite3.connect(src_path)
+    before = conn.total_changes
+    conn.executemany(
+        f'INSERT INTO news({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        (
+            row
+            for row in src_conn.execute(f'SELECT {COLUMNS} FROM news')
+            if row[-1] not in db_url
+        ),
+    )
+    conn.commit()
+    n_merged = conn.total_changes - before
+    src_conn.close()
+    conn.close()
+    return n_merged
+
+
+def merge_attach(src_path: str, dest_path: str) -> int:
+    conn = sqlite3.connect(dest_path)
+    news.db.util.set_profile(conn=conn, profile='bulk-import')
+    n_merged = 0
+    for _, _, n_merged in news.db.merge.merge_records(
+        cur=conn.cursor(),
+        src_path=src_path,
+    ):
+        pass
+    conn.close()
+    return n_merged
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+    random.seed(args.seed)
+
+    pool = ''.join(
+        chr(random.randint(0x4E00, 0x9FFF))
+        for _ in range(args.article_size * 20)
+    )
+
+    bench_dir = news.db.util.get_path('benchmark/merge')
+    os.makedirs(bench_dir, exist_ok=True)
+
+    print(f'{"method":<8}{"records":>10}{"merged":>10}{"seconds":>10}'
+          f'{"records/s":>12}')
+    for method in METHODS:
+        n_records = args.n_records
+        if method == 'list':
+            n_records = min(n_records, args.n_list_records)
+
+        src_path = os.path.join(bench_dir, f'src_{n_records}.db')
+        template_path = os.path.join(bench_dir, f'dest_{n_records}.db')
+        if not os.path.exists(src_path):
+            generate_db(
+                path=template_path,
+                first_idx=0,
+                n_records=n_records,
+                article_size=args.article_size,
+                pool=pool,
+            )
+            generate_db(
+                path=src_path,
+                first_idx=int(n_records * (1 - args.overlap)),
+                n_records=n_records,
+                article_size=args.article_size,
+                pool=pool,
+            )
+
+        # Merge into a fresh copy of target each time.
+        dest_path = os.path.join(bench_dir, 'dest.db')
+        shutil.copyfile(template_path, dest_path)
+
+        start = time.perf_counter()
+        n_merged = {
+            'list': merge_list,
+            'set': merge_set,
+            'attach': merge_attach,
+        }[method](src_path=src_path, dest_path=dest_path)
+        elapsed = time.perf_counter() - start
+
+        print(f'{method:<8}{n_records:>10}{n_merged:>10}{elapsed:>10.2f}'
+              f'{n_records / elapsed:>12.1f}')
+
+    shutil.rmtree(bench_dir)
@@ -0,0 +1,718 @@
+r'''
+Local stand-in for all news websites crawled by `news.crawlers`.
+
+Requests sent to `http://{host}:{port}/{url}` are answered as if `url` were
+requested from the real website, so setting `news.crawlers.util.BASE_URL`
+redirects all crawlers to this server. Pages are either replayed from a
+response cache recorded by `news.crawlers.cache` or generated.
+
+Generated websites publish `news_per_day` news per day (per category, for
+websites crawled by category) since `EPOCH` until `now`. Each news is
+missing (404) with probability `miss_ratio`, decided by url so that the same
+url always has the same status. Banned (403) and too many requests (429)
+responses are injected independently for each request. Pages carry an
+`ETag` and conditional requests of unchanged pages are answered by `304`.
+
+```sh
+python -m benchmark.mock_site --port 8000 --latency 0.05
+```
+'''
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import news.crawlers
+
+# News released before `EPOCH` do not exist.
+EPOCH = datetime(2021, 1, 1)
+# Number of items in each listing page.
+LIST_SIZE = {
+    'epochtimes': 20,
+    'ltn': 20,
+    'ntdtv': 30,
+    'tvbs': 100,
+    'udn': 20,
+}
+# First article id of websites whose news are identified by id.
+FIRST_IDX = {
+    'ettoday': 1,
+    'setn': 1,
+    'storm': 21016,
+    'tvbs': 1,
+}
+HTML = 'text/html; charset=utf-8'
+JSON = 'application/json; charset=utf-8'
+
+# `(status_code, content_type, body)`.
+Page = Tuple[int, str, str]
+NOT_FOUND: Page = (404, HTML, '<html><body>Not found.</body></html>')
+
+
+def random_text(rng: random.Random, n_chars: int) -> str:
+    sentences = []
+    length = 0
+    while length < n_chars:
+        sentence = ''.join(
+            chr(rng.randint(0x4E00, 0x9FA5))
+            for _ in range(rng.randint(10, 30))
+        ) + '。'
+        sentences.append(sentence)
+        length += len(sentence)
+    return ''.join(sentences)
+
+
+def split_paragraphs(text: str, n_paragraphs: int) -> List[str]:
+    sentences = text.split('。')[:-1]
+    size = max(1, math.ceil(len(sentences) / n_paragraphs))
+    return [
+        '。'.join(sentences[idx:idx + size]) + '。'
+        for idx in range(0, len(sentences), size)
+    ]
+
+
+class MockSite:
+    r'''
+    Generate responses of all websites. `now` is naive local time (UTC+8) of
+    websites.
+    '''
+
+    def __init__(
+        self,
+        now: datetime,
+        news_per_day: int = 100,
+        miss_ratio: float = 0.1,
+        ban_ratio: float = 0.0,
+        throttle_ratio: float = 0.0,
+        page_size: int = 30000,
+        seed: int = 42,
+        cache: news.crawlers.cache.ResponseCache = None,
+    ):
+        self.now = now
+        self.news_per_day = news_per_day
+        self.interval = timedelta(days=1) / news_per_day
+        self.miss_ratio = miss_ratio
+        self.ban_ratio = ban_ratio
+        self.throttle_ratio = throttle_ratio
+        self.page_size = page_size
+        self.seed = seed
+        self.cache = cache
+
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        # Number of requests of each status code.
+        self.stats: Dict[int, int] = {}
+
+        self.routes: List[Tuple[re.Pattern, Callable[..., Page]]] = [
+            (re.compile(p), f) for p, f in [
+                (r'https://www\.cna\.com\.tw/news/aipl/(\d{8})(\d{4})\.aspx',
+                 self.cna),
+                (r'https://www\.chinatimes\.com/realtimenews/'
+                 r'(\d{8})(\d{6})-(\d+)',
+                 self.chinatimes),
+                (r'https://www\.ftvnews\.com\.tw/news/detail/'
+                 r'(\d{4})([0-9a-c])(\d{2})([A-Z])(\d{4}|\d{2}M1)',
+                 self.ftv),
+                (r'https://star\.ettoday\.net/news/(\d+)', self.ettoday),
+                (r'https://www\.setn\.com/News\.aspx\?NewsID=(\d+)',
+                 self.setn),
+                (r'https://www\.storm\.mg/article/(\d+)', self.storm),
+                (r'https://news\.tvbs\.com\.tw/news/LoadMoreOverview\?'
+                 r'.*cate=(\w+)&newsid=(\d+)',
+                 self.tvbs_list),
+                (r'https://news\.tvbs\.com\.tw/(\w+)/(\d+)', self.tvbs),
+                (r'https://news\.ltn\.com\.tw/ajax/breakingnews/(\w+)/(\d+)',
+                 self.ltn_list),
+                (r'https://news\.ltn\.com\.tw/news/(\w+)/breakingnews/(\d+)',
+                 self.ltn),
+                (r'https://udn\.com/api/more\?page=(\d+)&channelId=(\d+)',
+                 self.udn_list),
+                (r'https://udn\.com/news/story/(\d+)/(\d+)', self.udn),
+                (r'https://www\.ntdtv\.com/b5/prog(\d+)/(\d+)',
+                 self.ntdtv_list),
+                (r'https://www\.ntdtv\.com/b5/\d+/\d+/\d+/a(\d+)\.html',
+                 self.ntdtv),
+                (r'https://www\.epochtimes\.com/b5/(\w+)_(\d+)\.htm',
+                 self.epochtimes_list),
+                (r'https://www\.epochtimes\.com/b5/\d+/\d+/\d+/n(\d+)\.htm',
+                 self.epochtimes),
+            ]
+        ]
+
+    def get(self, url: str) -> Page:
+        with self.lock:
+            error = self.rng.random()
+        if error < self.ban_ratio:
+            page = (403, HTML, '<html><body>Forbidden.</body></html>')
+        elif error < self.ban_ratio + self.throttle_ratio:
+            page = (429, HTML, '<html><body>Too many requests.</body></html>')
+        else:
+            page = self.get_page(url=url)
+
+        with self.lock:
+            self.stats[page[0]] = self.stats.get(page[0], 0) + 1
+        return page
+
+    def get_page(self, url: str) -> Page:
+        if self.cache is not None:
+            response = self.cache.load(url=url)
+            if response is not None:
+                return (
+                    response.status_code,
+                    response.headers.get('Content-Type', HTML),
+                    response.text,
+                )
+
+        for pattern, route in self.routes:
+            match = pattern.match(url)
+            if match:
+                return route(url, *match.groups())
+        return NOT_FOUND
+
+    # Release time of news.
+
+    def get_datetime(self, idx: int) -> datetime:
+        return EPOCH + idx * self.interval
+
+    def get_latest_idx(self) -> int:
+        return (self.now - EPOCH) // self.interval
+
+    def is_live(self, url: str, release: datetime) -> bool:
+        if not EPOCH <= release <= self.now:
+            return False
+        return random.Random(f'{self.seed}:{url}').random() >= self.miss_ratio
+
+    def get_article(self, url: str, n_paragraphs: int = 5) -> List[str]:
+        rng = random.Random(f'{self.seed}:{url}:article')
+        return split_paragraphs(
+            random_text(rng=rng, n_chars=rng.randint(300, 1500)),
+            n_paragraphs=n_paragraphs,
+        )
+
+    def get_title(self, url: str) -> str:
+        rng = random.Random(f'{self.seed}:{url}:title')
+        return random_text(rng=rng, n_chars=15)[:20]
+
+    def pad(self, body: str) -> str:
+        r'''
+        Add head with styles and scripts, and navigation links, so that size
+        of `body` is about `page_size`. Head takes about a quarter of page
+        like real websites.
+        '''
+        rules = []
+        length = 0
+        idx = 0
+        while length < self.page_size // 8:
+            rule = (
+                f'.mock-{idx} {{ margin: {idx % 16}px; color: #{idx:06x}; }}'
+            )
+            rules.append(rule)
+            length += len(rule)
+            idx += 1
+        statements = []
+        length = 0
+        idx = 0
+        while length < self.page_size // 8:
+            # Markup in scripts is not part of page.
+            statement = f'var ad{idx} = "<div class=\\"ad\\">{idx}</div>";'
+            statements.append(statement)
+            length += len(statement)
+            idx += 1
+        head = (
+            '<head><meta charset="utf-8"><title>新聞</title>'
+            f'<style>{"".join(rules)}</style>'
+            f'<script>{"".join(statements)}</script></head>'
+        )
+
+        links = []
+        length = len(head) + len(body)
+        idx = 0
+        while length < self.page_size:
+            link = f'<li><a href="/nav/{idx}">導覽連結{idx}</a></li>'
+            links.append(link)
+            length += len(link)
+            idx += 1
+        return (
+            f'<html>{head}<body>'
+            f'<nav class="mock-nav"><ul>{"".join(links)}</ul></nav>'
+            f'{body}</body></html>'
+        )
+
+    def html(self, body: str) -> Page:
+        return (200, HTML, self.pad(body))
+
+    # Websites which probe sequential ids of each day.
+
+    def get_daily_release(
+        self,
+        date_str: str,
+        idx: int,
+    ) -> Optional[datetime]:
+        if idx >= self.news_per_day:
+            return None
+        return datetime.strptime(date_str, '%Y%m%d') + idx * self.interval
+
+    def cna(self, url: str, date_str: str, idx: str) -> Page:
+        release = self.get_daily_release(date_str=date_str, idx=int(idx))
+        if release is None or not self.is_live(url=url, release=release):
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            '<div class="breadcrumb"><a>首頁</a><a>政治</a></div>'
+            '<div class="centralContent">'
+            f'<h1><span>{self.get_title(url)}</span></h1>'
+            f'<div class="paragraph"><p>(中央社記者王小明台北電)</p>'
+            f'{paragraphs}</div></div>'
+        )
+
+    def chinatimes(
+        self,
+        url: str,
+        date_str: str,
+        idx: str,
+        api: str,
+    ) -> Page:
+        release = self.get_daily_release(date_str=date_str, idx=int(idx))
+        if release is None or not self.is_live(url=url, release=release):
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            '<nav class="breadcrumb-wrapper"><ol><li><a><span>政治</span>'
+            '</a></li></ol></nav>'
+            '<header class="article-header">'
+            f'<h1 class="article-title">{self.get_title(url)}</h1>'
+            f'<time datetime="{release.strftime("%Y-%m-%d %H:%M")}"></time>'
+            '</header>'
+            '<div class="author"><a>王小明</a></div>'
+            f'<div class="article-body">{paragraphs}</div>'
+        )
+
+    def ftv(
+        self,
+        url: str,
+        year: str,
+        month: str,
+        day: str,
+        api: str,
+        idx: str,
+    ) -> Page:
+        date_str = f'{year}{int(month, 16):02d}{day}'
+        release = self.get_daily_release(
+            date_str=date_str,
+            idx=int(idx[:2] if idx.endswith('M1') else idx),
+        )
+        if release is None or not self.is_live(url=url, release=release):
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            '<div class="col-article">'
+            f'<h1 class="text-center">{self.get_title(url)}</h1></div>'
+            f'<div id="newscontent">{paragraphs}'
+            '<p>(民視新聞/王小明 台北報導)</p></div>'
+        )
+
+    # Websites which crawl by article id.
+
+    def get_id_release(self, company: str, idx: str) -> datetime:
+        return self.get_datetime(int(idx) - FIRST_IDX[company])
+
+    def ettoday(self, url: str, idx: str) -> Page:
+        release = self.get_id_release(company='ettoday', idx=idx)
+        if not self.is_live(url=url, release=release):
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            '<div class="part_breadcrumb"><div><a><span>政治</span></a>'
+            '</div></div>'
+            f'<h1 class="title">{self.get_title(url)}</h1>'
+            f'<time datetime="{release.isoformat()}+08:00">'
+            f'{release.strftime("%Y-%m-%d %H:%M")}</time>'
+            f'<div class="story"><p>記者王小明／台北報導</p>{paragraphs}</div>'
+        )
+
+    def setn(self, url: str, idx: str) -> Page:
+        release = self.get_id_release(company='setn', idx=idx)
+        if not self.is_live(url=url, release=release):
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            '<input type="hidden" id="pageGroupID" value="6">'
+            f'<h1 class="news-title-3">{self.get_title(url)}</h1>'
+            f'<time class="page-date">'
+            f'{release.strftime("%Y/%m/%d %H:%M:%S")}</time>'
+            f'<div id="Content1"><p>記者王小明／台北報導</p>{paragraphs}</div>'
+        )
+
+    def storm(self, url: str, idx: str) -> Page:
+        release = self.get_id_release(company='storm', idx=idx)
+        if not self.is_live(url=url, release=release):
+            # Storm responses 200 for missing news.
+            return self.html('<div>找不到頁面</div>')
+        paragraphs = ''.join(
+            f'<p aid="{i}">{p}</p>'
+            for i, p in enumerate(self.get_article(url))
+        )
+        return self.html(
+            '<div id="title_tags_wrapper"><a>政治</a><a>國際</a></div>'
+            f'<h1 id="article_title">{self.get_title(url)}</h1>'
+            '<div id="author_block"><span class="info_author">王小明</span>'
+            f'<span id="info_time">{release.strftime("%Y-%m-%d %H:%M")}'
+            '</span></div>'
+            '<div id="article_inner_wrapper"><article><div id="CMS_wrapper">'
+            f'{paragraphs}</div></article></div>'
+        )
+
+    # Websites which crawl by listing.
+
+    def get_list(
+        self,
+        url_format: str,
+        offset: int,
+        size: int,
+    ) -> List[Tuple[int, str]]:
+        r'''
+        Live `(idx, url)` of listing from `offset`-th latest news.
+        '''
+        items = []
+        latest_idx = self.get_latest_idx()
+        for idx in range(latest_idx - offset, latest_idx - offset - size, -1):
+            if idx < 0:
+                break
+            url = url_format.format(
+                idx=idx,
+                release=self.get_datetime(idx),
+            )
+            if self.is_live(url=url, release=self.get_datetime(idx)):
+                items.append((idx, url))
+        return items
+
+    def get_max_page(self, company: str) -> int:
+        return math.ceil((self.get_latest_idx() + 1) / LIST_SIZE[company])
+
+    def tvbs_list(self, url: str, category: str, newsid: str) -> Page:
+        # Ids of all categories are interleaved.
+        categories = list(news.crawlers.tvbs.CATEGORIES.keys())
+        if category not in categories:
+            return NOT_FOUND
+        offset = categories.index(category)
+
+        ids = []
+        idx = int(newsid) - 1
+        while idx >= FIRST_IDX['tvbs'] and len(ids) < LIST_SIZE['tvbs']:
+            if (idx - FIRST_IDX['tvbs']) % len(categories) == offset:
+                release = self.get_id_release(company='tvbs', idx=str(idx))
+                if self.is_live(
+                    url=f'https://news.tvbs.com.tw/{category}/{idx}',
+                    release=release,
+                ):
+                    ids.append(idx)
+            idx -= 1
+
+        return (200, JSON, json.dumps({
+            'newsid': str(ids[-1]) if ids else '',
+            'news_id_list': ''.join(f",'{idx}'" for idx in ids),
+        }))
+
+    def tvbs(self, url: str, category: str, idx: str) -> Page:
+        release = self.get_id_release(company='tvbs', idx=idx)
+        if not self.is_live(url=url, release=release):
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            f'<meta name="pubdate" content="{release.isoformat()}">'
+            f'<div class="title_box"><h1 class="title">{self.get_title(url)}'
+            '</h1></div>'
+            '<div class="author_box"><div class="author"><a>王小明</a></div>'
+            '</div>'
+            f'<div id="news_detail_div"><html><body>{paragraphs}</body></html>'
+            '</div>'
+        )
+
+    def ltn_list(self, url: str, api: str, page: str) -> Page:
+        items = self.get_list(
+            url_format=f'https://news.ltn.com.tw/news/{api}/breakingnews/'
+            '{idx}',
+            offset=(int(page) - 1) * LIST_SIZE['ltn'],
+            size=LIST_SIZE['ltn'],
+        )
+        data = [{'url': item_url} for _, item_url in items]
+        # Inconsistent api format.
+        if page != '1':
+            data = {str(idx): item for idx, item in enumerate(data)}
+        return (200, JSON, json.dumps({'data': data}))
+
+    def ltn(self, url: str, api: str, idx: str) -> Page:
+        release = self.get_datetime(int(idx))
+        if not self.is_live(url=url, release=release):
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            '<div class="breadcrumbs"><a>首頁</a><a>政治</a></div>'
+            f'<div class="whitecon"><h1>{self.get_title(url)}</h1></div>'
+            '<div itemprop="articleBody"><div class="text boxTitle boxText">'
+            f'<span class="time"> {release.strftime("%Y/%m/%d %H:%M")}'
+            f'</span><p>〔記者王小明／台北報導〕</p>{paragraphs}</div></div>'
+        )
+
+    def udn_list(self, url: str, page: str, channel_id: str) -> Page:
+        items = self.get_list(
+            url_format=f'/news/story/{channel_id}/{{idx}}'
+            '?from=udn-catelistnews',
+            offset=int(page) * LIST_SIZE['udn'],
+            size=LIST_SIZE['udn'],
+        )
+        return (200, JSON, json.dumps({'lists': [
+            {
+                'time': {
+                    'date': self.get_datetime(idx).strftime('%Y-%m-%d %H:%M'),
+                },
+                'titleLink': item_url,
+            }
+            for idx, item_url in items
+        ]}))
+
+    def udn(self, url: str, channel_id: str, idx: str) -> Page:
+        release = self.get_datetime(int(idx))
+        if release > self.now:
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            '<nav class="article-content__breadcrumb">'
+            '<a class="breadcrumb-items">首頁</a>'
+            '<a class="breadcrumb-items">要聞</a>'
+            '<a class="breadcrumb-items">政治</a></nav>'
+            f'<h1 class="article-content__title">{self.get_title(url)}</h1>'
+            '<section class="authors">'
+            '<time class="article-content__time">'
+            f'{release.strftime("%Y-%m-%d %H:%M")}</time>'
+            '<span class="article-content__author"><a>王小明</a></span>'
+            '</section>'
+            f'<section class="article-content__editor">{paragraphs}</section>'
+        )
+
+    def get_pagination(self, company: str) -> str:
+        max_page = self.get_max_page(company=company)
+        return (
+            '<div class="pagination">'
+            '<a class="page-numbers">1</a>'
+            f'<a class="page-numbers">{max_page:,}</a>'
+            '<a class="page-numbers">下一頁</a></div>'
+        )
+
+    def ntdtv_list(self, url: str, api: str, page: str) -> Page:
+        items = self.get_list(
+            url_format='https://www.ntdtv.com/b5/{release:%Y}/'
+            '{release:%m}/{release:%d}/a{idx}.html',
+            offset=(int(page) - 1) * LIST_SIZE['ntdtv'],
+            size=LIST_SIZE['ntdtv'],
+        )
+        posts = ''.join(
+            f'<div class="one_post"><div class="title">'
+            f'<a href="{item_url}">新聞</a></div></div>'
+            for _, item_url in items
+        )
+        return self.html(
+            '<div class="post_list"><div class="list_wrapper">'
+            f'{posts}</div></div>{self.get_pagination(company="ntdtv")}'
+        )
+
+    def ntdtv(self, url: str, idx: str) -> Page:
+        if not self.is_live(url=url, release=self.get_datetime(int(idx))):
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            '<div id="breadcrumb"><a>首頁</a><a>國際</a></div>'
+            f'<div class="article_title"><h1>{self.get_title(url)}</h1></div>'
+            f'<div itemprop="articleBody" class="post_content">{paragraphs}'
+            '<p>(記者王小明綜合報導/責任編輯:李四)</p></div>'
+        )
+
+    def epochtimes_list(self, url: str, api: str, page: str) -> Page:
+        # Listing starts from page 2.
+        items = self.get_list(
+            url_format='https://www.epochtimes.com/b5/{release:%y}/'
+            '{release.month}/{release.day}/n{idx}.htm',
+            offset=(int(page) - 2) * LIST_SIZE['epochtimes'],
+            size=LIST_SIZE['epochtimes'],
+        )
+        posts = ''.join(
+            f'<div class="one_post"><div class="text"><div class="title">'
+            f'<a href="{item_url}">新聞</a></div></div></div>'
+            for _, item_url in items
+        )
+        return self.html(
+            f'<div class="post_list left_col">{posts}</div>'
+            f'{self.get_pagination(company="epochtimes")}'
+        )
+
+    def epochtimes(self, url: str, idx: str) -> Page:
+        if not self.is_live(url=url, release=self.get_datetime(int(idx))):
+            return NOT_FOUND
+        paragraphs = ''.join(f'<p>{p}</p>' for p in self.get_article(url))
+        return self.html(
+            '<div id="breadcrumb"><a>首頁</a><a>國際</a></div>'
+            f'<h1 class="title">{self.get_title(url)}</h1>'
+            f'<div id="artbody"><p>【大紀元訊】(大紀元記者王小明報導)</p>'
+            f'{paragraphs}</div>'
+        )
+
+
+def get_server(
+    site: MockSite,
+    host: str = '127.0.0.1',
+    port: int = 0,
+    latency: float = 0.0,
+) -> ThreadingHTTPServer:
+    r'''
+    HTTP server of `site`. Each response is delayed by `latency` seconds.
+    Use port `0` to pick a free port.
+    '''
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+
+            status_code, content_type, body = site.get(url=self.path[1:])
+            data = body.encode('utf-8')
+
+            # Support conditional requests.
+            etag = f'"{hashlib.sha1(data).hexdigest()}"'
+            if (
+                status_code == 200
+                and self.headers.get('If-None-Match') == etag
+            ):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+            # Compress like real websites do.
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+                data = compressor.compress(data) + compressor.flush()
+                is_gzip = True
+            else:
+                is_gzip = False
+
+            self.send_response(status_code)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            if status_code == 200:
+                self.send_header('ETag', etag)
+            if is_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            return
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def parse_argument():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8000,
+        help='Specify port of server.',
+    )
+    parser.add_argument(
+        '--now',
+        type=str,
+        default=None,
+        help='Specify current time of websites in UTC+8. Default now.',
+    )
+    parser.add_argument(
+        '--news_per_day',
+        type=int,
+        default=100,
+        help='Specify number of news per day (per category).',
+    )
+    parser.add_argument(
+        '--miss_ratio',
+        type=float,
+        default=0.1,
+        help='Specify ratio of missing (404) news.',
+    )
+    parser.add_argument(
+        '--ban_ratio',
+        type=float,
+        default=0.0,
+        help='Specify ratio of banned (403) responses.',
+    )
+    parser.add_argument(
+        '--throttle_ratio',
+        type=float,
+        default=0.0,
+        help='Specify ratio of too many requests (429) responses.',
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='Specify seconds to delay each response.',
+    )
+    parser.add_argument(
+        '--page_size',
+        type=int,
+        default=30000,
+        help='Specify number of characters in each generated html.',
+    )
+    parser.add_argument(
+        '--cache_db',
+        type=str,
+        default=None,
+        help='Replay responses recorded in cache database first.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Specify random seed.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    if args.now:
+        now = datetime.fromisoformat(args.now)
+    else:
+        now = datetime.now(timezone(timedelta(hours=8))).replace(tzinfo=None)
+
+    cache = None
+    if args.cache_db:
+        cache = news.crawlers.cache.ResponseCache(
+            db_name=args.cache_db,
+            mode='replay',
+        )
+
+    site = MockSite(
+        now=now,
+        news_per_day=args.news_per_day,
+        miss_ratio=args.miss_ratio,
+        ban_ratio=args.ban_ratio,
+        throttle_ratio=args.throttle_ratio,
+        page_size=args.page_size,
+        seed=args.seed,
+        cache=cache,
+    )
+    server = get_server(site=site, port=args.port, latency=args.latency)
+    print(f'Serving on http://127.0.0.1:{server.server_address[1]}')
+    server.serve_forever()
@@ -0,0 +1,532 @@
+r'''
+Throughput, time of each phase and peak memory of
+`news.preprocess.{company}.parse` on a corpus of news pages of each company.
+
+Pages are generated by `benchmark.mock_site`, or read from `raw_xml` of
+crawled databases with `--db_names`. Phases are timed by wrapping functions
+used by parsers, which slows parsing down, so throughput is measured in a
+separate pass without wrapping:
+
+- `tree`: building `BeautifulSoup`.
+- `select`: CSS selectors and finding tags, including fields collected by
+  `news.preprocess.extract.Extractor`.
+- `regex`: `re` functions and compiled patterns of parser modules.
+- `nfkc`: `unicodedata.normalize`.
+- `other`: the rest, e.g. getting text of tags and parsing datetime.
+
+Results are saved by `--save_path` and compared with `--baseline_path`.
+Digests of corpus and parsed news are saved as well, so that comparing on
+a different corpus or changing output of parsers is reported. Exit status
+is 1 if any company is slower than baseline by more than `--tolerance` or
+its output changed.
+
+```sh
+python -m benchmark.parser --n_pages 100 --save_path parser_baseline.json
+python -m benchmark.parser --n_pages 100 --baseline_path parser_baseline.json
+python -m benchmark.parser --db_names raw/news.db --companies cna udn
+# Partial parsing against building tree of whole pages.
+python -m benchmark.parser --db_names raw/news.db --save_path full.json
+python -m benchmark.parser --db_names raw/news.db --partial_parse \
+    --baseline_path full.json
+```
+'''
+import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import re
+import sys
+import time
+import tracemalloc
+import unicodedata
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Sequence
+
+import bs4
+
+import news.crawlers
+import news.db
+import news.preprocess
+from benchmark.mock_site import EPOCH, FIRST_IDX, MockSite
+from news.db.schema import News
+
+COMPANIES = [
+    'chinatimes', 'cna', 'epochtimes', 'ettoday', 'ftv', 'ltn', 'ntdtv',
+    'setn', 'storm', 'tvbs', 'udn',
+]
+PHASES = ['tree', 'select', 'regex', 'nfkc', 'other']
+# Urls of generated news, where `idx` is the id of news and `release` is the
+# release date.
+URL_FORMATS = {
+    'chinatimes': 'https://www.chinatimes.com/realtimenews/'
+    '{release:%Y%m%d}{idx:06d}-260407',
+    'cna': 'https://www.cna.com.tw/news/aipl/{release:%Y%m%d}{idx:04d}.aspx',
+    'epochtimes': 'https://www.epochtimes.com/b5/{release:%y}/'
+    '{release.month}/{release.day}/n{idx}.htm',
+    'ettoday': 'https://star.ettoday.net/news/{idx}',
+    'ftv': 'https://www.ftvnews.com.tw/news/detail/'
+    '{release:%Y}{release.month:x}{release:%d}W{idx:04d}',
+    'ltn': 'https://news.ltn.com.tw/news/politics/breakingnews/{idx}',
+    'ntdtv': 'https://www.ntdtv.com/b5/{release:%Y}/{release:%m}/'
+    '{release:%d}/a{idx}.html',
+    'setn': 'https://www.setn.com/News.aspx?NewsID={idx}',
+    'storm': 'https://www.storm.mg/article/{idx}',
+    'tvbs': 'https://news.tvbs.com.tw/politics/{idx}',
+    'udn': 'https://udn.com/news/story/6656/{idx}',
+}
+
+
+def parse_argument():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--companies',
+        nargs='+',
+        choices=COMPANIES,
+        type=str,
+        default=COMPANIES,
+        help='Select parsers.',
+    )
+    parser.add_argument(
+        '--n_pages',
+        type=int,
+        default=50,
+        help='Specify number of pages of each company.',
+    )
+    parser.add_argument(
+        '--db_names',
+        nargs='+',
+        type=str,
+        default=None,
+        help='Assign crawled databases to read pages from. Pages are '
+        'generated if not given.',
+    )
+    parser.add_argument(
+        '--page_size',
+        type=int,
+        default=30000,
+        help='Specify number of characters in each generated page.',
+    )
+    parser.add_argument(
+        '--n_repeats',
+        type=int,
+        default=3,
+        help='Specify number of passes, where the fastest one is reported.',
+    )
+    parser.add_argument(
+        '--partial_parse',
+        action='store_true',
+        help='Select whether build tree of regions declared by parsers '
+        'instead of whole pages.',
+    )
+    parser.add_argument(
+        '--save_path',
+        type=str,
+        default=None,
+        help='Assign JSON file to save results as baseline.',
+    )
+    parser.add_argument(
+        '--baseline_path',
+        type=str,
+        default=None,
+        help='Assign JSON file of baseline to compare with.',
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.1,
+        help='Specify ratio of throughput below baseline treated as '
+        'regression.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Specify random seed.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+def generate_pages(
+    company: str,
+    n_pages: int,
+    page_size: int,
+    seed: int,
+) -> List[News]:
+    r'''
+    Pages of `n_pages` news released in the first day of mock website of
+    `company`.
+    '''
+    site = MockSite(
+        now=EPOCH + timedelta(days=1),
+        news_per_day=n_pages,
+        miss_ratio=0.0,
+        page_size=page_size,
+        seed=seed,
+    )
+    pages = []
+    for idx in range(n_pages):
+        url = URL_FORMATS[company].format(
+            idx=idx + FIRST_IDX.get(company, 0),
+            release=EPOCH,
+        )
+        status_code, _, body = site.get_page(url=url)
+        if status_code == 200:
+            pages.append(News(raw_xml=body, url=url))
+    return pages
+
+
+def load_pages(
+    db_names: Sequence[str],
+    companies: Sequence[str],
+    n_pages: int,
+) -> Dict[str, List[News]]:
+    r'''
+    The first `n_pages` pages of each company in `db_names`. Company is told
+    by url since `news.company` is the name shown by website.
+    '''
+    pages = {company: [] for company in companies}
+    for db_name in db_names:
+        for record in news.db.read.load_records(db_name=db_name):
+            company = news.crawlers.util.get_company(url=record.url)
+            if company in pages and len(pages[company]) < n_pages:
+                pages[company].append(
+                    News(raw_xml=record.raw_xml, url=record.url)
+                )
+    return pages
+
+
+def get_corpus_digest(pages: Sequence[News]) -> str:
+    h = hashlib.sha256()
+    for page in pages:
+        h.update(f'{page.url}\0{page.raw_xml}\0'.encode())
+    return h.hexdigest()
+
+
+class PhaseTimer:
+    r'''
+    Seconds spent in each phase. Calls made inside a timed call, e.g.
+    `find` calling `find_all`, are counted once as the outer phase.
+    '''
+
+    def __init__(self):
+        self.seconds = {phase: 0.0 for phase in PHASES}
+        self.active = False
+
+    def wrap(self, phase: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if self.active:
+                return func(*args, **kwargs)
+            self.active = True
+            begin = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.seconds[phase] += time.perf_counter() - begin
+                self.active = False
+        return timed
+
+
+class TimedPattern:
+    r'''
+    Compiled pattern whose methods are timed as `regex`.
+    '''
+
+    def __init__(self, pattern: re.Pattern, timer: PhaseTimer):
+        self.pattern = pattern
+        self.timer = timer
+
+    def __getattr__(self, name: str):
+        value = getattr(self.pattern, name)
+        if callable(value):
+            return self.timer.wrap('regex', value)
+        return value
+
+
+class TimedModule:
+    r'''
+    Module whose functions `names` are timed as `phase`. Compiled patterns
+    returned by `re.compile` are timed as well.
+    '''
+
+    def __init__(
+        self,
+        module,
+        timer: PhaseTimer,
+        phase: str,
+        names: Sequence[str],
+    ):
+        self.module = module
+        self.timed = {
+            name: timer.wrap(phase, getattr(module, name))
+            for name in names
+        }
+        if module is re:
+            self.timed['compile'] = (
+                lambda *args, **kwargs:
+                TimedPattern(re.compile(*args, **kwargs), timer)
+            )
+
+    def __getattr__(self, name: str):
+        if name in self.timed:
+            return self.timed[name]
+        return getattr(self.module, name)
+
+
+@contextlib.contextmanager
+def instrument(timer: PhaseTimer, companies: Sequence[str]):
+    r'''
+    Time phases of parsers of `companies` by `timer`. Tree building and
+    selectors are wrapped in `bs4`, while `re`, `unicodedata` and compiled
+    patterns are wrapped in each parser module. Everything is restored on
+    exit.
+    '''
+    patches = [
+        (bs4.BeautifulSoup, '__init__', 'tree'),
+        (news.preprocess.extract.Extractor, 'extract', 'select'),
+    ]
+    for name in ['select', 'select_one', 'find', 'find_all']:
+        patches.append((bs4.element.Tag, name, 'select'))
+
+    originals = []
+    for owner, name, phase in patches:
+        originals.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, timer.wrap(phase, getattr(owner, name)))
+
+    for company in companies:
+        module = getattr(news.preprocess, company)
+        for name, value in list(vars(module).items()):
+            if value is re:
+                value = TimedModule(
+                    module=re,
+                    timer=timer,
+                    phase='regex',
+                    names=['sub', 'subn', 'match', 'search', 'fullmatch',
+                           'findall', 'finditer', 'split'],
+                )
+            elif value is unicodedata:
+                value = TimedModule(
+                    module=unicodedata,
+                    timer=timer,
+                    phase='nfkc',
+                    names=['normalize'],
+                )
+            elif isinstance(value, re.Pattern):
+                value = TimedPattern(pattern=value, timer=timer)
+            elif (
+                isinstance(value, list)
+                and value
+                and all(isinstance(v, re.Pattern) for v in value)
+            ):
+                value = [TimedPattern(pattern=v, timer=timer) for v in value]
+            else:
+                continue
+            originals.append((module, name, getattr(module, name)))
+            setattr(module, name, value)
+
+    try:
+        yield timer
+    finally:
+        for owner, name, value in reversed(originals):
+            setattr(owner, name, value)
+
+
+def parse_pages(parse: Callable[[News], News], pages: Sequence[News]) -> List:
+    r'''
+    Parsed fields of each page, or error message if parsing failed.
+    '''
+    outputs = []
+    for page in pages:
+        try:
+            parsed_news = parse(ori_news=page)
+            outputs.append([
+                parsed_news.article,
+                parsed_news.category,
+                parsed_news.company,
+                parsed_news.datetime,
+                parsed_news.reporter,
+                parsed_news.title,
+            ])
+        except Exception as err:
+            outputs.append(str(err))
+    return outputs
+
+
+def benchmark(
+    company: str,
+    pages: Sequence[News],
+    n_repeats: int,
+) -> Dict[str, Any]:
+    parse = getattr(news.preprocess, company).parse
+
+    # Warm up caches of selectors and patterns.
+    outputs = parse_pages(parse=parse, pages=pages[:1])
+
+    seconds = float('inf')
+    for _ in range(n_repeats):
+        begin = time.perf_counter()
+        outputs = parse_pages(parse=parse, pages=pages)
+        seconds = min(seconds, time.perf_counter() - begin)
+
+    timer = PhaseTimer()
+    with instrument(timer=timer, companies=[company]):
+        begin = time.perf_counter()
+        parse_pages(parse=parse, pages=pages)
+        instrumented_seconds = time.perf_counter() - begin
+    timer.seconds['other'] = instrumented_seconds - sum(timer.seconds.values())
+
+    # Peak memory of parsing one page, excluding the page itself.
+    peak_bytes = 0
+    tracemalloc.start()
+    for page in pages:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        parse_pages(parse=parse, pages=[page])
+        peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    n_pages = max(len(pages), 1)
+    return {
+        'n_pages': len(pages),
+        'n_failed': sum(isinstance(output, str) for output in outputs),
+        'n_chars': sum(len(page.raw_xml) for page in pages),
+        'seconds': seconds,
+        'pages_per_sec': len(pages) / max(seconds, 1e-9),
+        # Milliseconds per page, scaled so that phases sum up to wall time
+        # without wrapping.
+        'phase_ms': {
+            phase: 1000 * seconds * value
+            / max(instrumented_seconds, 1e-9) / n_pages
+            for phase, value in timer.seconds.items()
+        },
+        'peak_bytes': peak_bytes,
+        'corpus_digest': get_corpus_digest(pages),
+        'output_digest': hashlib.sha256(
+            json.dumps(outputs, ensure_ascii=False).encode()
+        ).hexdigest(),
+    }
+
+
+def format_results(results: Dict[str, Dict[str, Any]]) -> str:
+    lines = [
+        f'{"company":<12}{"pages":>7}{"failed":>8}{"kchars":>8}'
+        f'{"pages/s":>9}' + ''.join(f'{phase + " ms":>10}' for phase in PHASES)
+        + f'{"peak MiB":>10}'
+    ]
+    for company, result in results.items():
+        n_pages = max(result['n_pages'], 1)
+        lines.append(
+            f'{company:<12}{result["n_pages"]:>7}{result["n_failed"]:>8}'
+            f'{result["n_chars"] / n_pages / 1000:>8.1f}'
+            f'{result["pages_per_sec"]:>9.1f}'
+            + ''.join(
+                f'{result["phase_ms"][phase]:>10.3f}' for phase in PHASES
+            )
+            + f'{result["peak_bytes"] / 1024 ** 2:>10.2f}'
+        )
+    return '\n'.join(lines)
+
+
+def get_change(value: float, baseline: float) -> str:
+    if baseline == 0:
+        return '-'
+    return f'{value / baseline - 1:+.1%}'
+
+
+def compare_results(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> bool:
+    r'''
+    Print changes of throughput, time of each phase and peak memory against
+    `baseline`. Return whether any company regressed.
+    '''
+    print(
+        f'{"company":<12}{"pages/s":>18}{"change":>9}'
+        + ''.join(f'{phase:>9}' for phase in PHASES)
+        + f'{"peak":>9}  status'
+    )
+    regressed = False
+    for company, result in results.items():
+        if company not in baseline:
+            print(f'{company:<12}{"no baseline":>18}')
+            continue
+
+        base = baseline[company]
+        status = []
+        if result['corpus_digest'] != base['corpus_digest']:
+            status.append('different corpus')
+        elif result['output_digest'] != base['output_digest']:
+            status.append('output changed')
+            regressed = True
+        if result['pages_per_sec'] < base['pages_per_sec'] * (1 - tolerance):
+            status.append('slower')
+            regressed = True
+
+        lines = (
+            f'{company:<12}'
+            f'{base["pages_per_sec"]:>8.1f} ->{result["pages_per_sec"]:>7.1f}'
+            f'{get_change(result["pages_per_sec"], base["pages_per_sec"]):>9}'
+            + ''.join(
+                f'{get_change(result["phase_ms"][p], base["phase_ms"][p]):>9}'
+                for p in PHASES
+            )
+            + f'{get_change(result["peak_bytes"], base["peak_bytes"]):>9}'
+            f'  {", ".join(status) or "ok"}'
+        )
+        print(lines)
+    return regressed
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    news.preprocess.extract.PARTIAL = args.partial_parse
+
+    if args.db_names:
+        corpus = load_pages(
+            db_names=args.db_names,
+            companies=args.companies,
+            n_pages=args.n_pages,
+        )
+    else:
+        corpus = {
+            company: generate_pages(
+                company=company,
+                n_pages=args.n_pages,
+                page_size=args.page_size,
+                seed=args.seed,
+            )
+            for company in args.companies
+        }
+
+    results = {}
+    for company, pages in corpus.items():
+        if not pages:
+            print(f'No page of {company}.')
+            continue
+        results[company] = benchmark(
+            company=company,
+            pages=pages,
+            n_repeats=args.n_repeats,
+        )
+    print(format_results(results))
+
+    if args.save_path:
+        with open(args.save_path, 'w', encoding='utf8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline_path:
+        with open(args.baseline_path, 'r', encoding='utf8') as f:
+            baseline = json.load(f)
+        print()
+        if compare_results(
+            results=results,
+            baseline=baseline,
+            tolerance=args.tolerance,
+        ):
+            sys.exit(1)
@@ -0,0 +1,163 @@
+r'''
+Throughput and peak memory of writing preprocessed news into `news_table`.
+
+- `former`: algorithm of the former `news.preprocess.preprocess.save_in_db`,
+  which converts the whole dataset to lists and inserts it with one
+  `executemany`.
+- `batched`: `news.db.preprocessed.write_records` maintaining indexes.
+- `deferred`: `news.db.preprocessed.write_records` building indexes after
+  writing.
+
+Records are generated lazily, so peak memory is taken by each method.
+The former table had no index, which is kept by other methods.
+
+```sh
+python -m benchmark.preprocessed --n_records 1000000
+```
+'''
+import argparse
+import os
+import random
+import sqlite3
+import time
+import tracemalloc
+from typing import Dict, Iterator
+
+import news.db
+
+METHODS = ['former', 'batched', 'deferred']
+
+
+def parse_argument():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--n_records',
+        type=int,
+        default=500000,
+        help='Specify number of written news.',
+    )
+    parser.add_argument(
+        '--article_size',
+        type=int,
+        default=500,
+        help='Specify number of characters in each article.',
+    )
+    parser.add_argument(
+        '--batch_size',
+        type=int,
+        default=news.db.preprocessed.BATCH_SIZE,
+        help='Specify number of records per transaction.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Specify random seed.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+def generate_records(
+    n_records: int,
+    article_size: int,
+    pool: str,
+) -> Iterator[Dict]:
+    for idx in range(n_records):
+        start = random.randrange(len(pool) - article_size)
+        article = pool[start:start + article_size]
+        yield {
+            'id': idx + 1,
+            'url': f'https://example.com/news/{idx}',
+            'time': '2021-06-01T00:00:00.000000Z',
+            'company': f'company{idx % 11}',
+            'label': None,
+            'reporter': None,
+            'title': article[:30],
+            'article': article,
+        }
+
+
+def write_former(cur: sqlite3.Cursor, records: Iterator[Dict], **kwargs):
+    data = [list(i.values()) for i in records]
+    for i in data:
+        i.append(None)
+    cur.executemany(
+        '''
+        INSERT INTO news_table(id, url, time, company, label, reporter,
+                               title, article, raw_xml)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''',
+        tuple(data),
+    )
+    cur.connection.commit()
+
+
+def write_batched(
+    cur: sqlite3.Cursor,
+    records: Iterator[Dict],
+    batch_size: int,
+    defer_index: bool = False,
+):
+    for _ in news.db.preprocessed.write_records(
+        cur=cur,
+        records=records,
+        batch_size=batch_size,
+        defer_index=defer_index,
+    ):
+        pass
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    random.seed(args.seed)
+    pool = ''.join(
+        chr(random.randint(0x4E00, 0x9FFF))
+        for _ in range(args.article_size * 20)
+    )
+
+    db_path = news.db.util.get_path('benchmark/preprocessed.db')
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+    print(f'{"method":<10}{"records/s":>12}{"peak MiB":>10}')
+    for method in METHODS:
+        # Time without tracing memory, which slows down allocation.
+        for trace_memory in [False, True]:
+            if os.path.exists(db_path):
+                os.remove(db_path)
+            conn = sqlite3.connect(db_path)
+            news.db.util.set_profile(conn=conn, profile='bulk-import')
+            cur = conn.cursor()
+            news.db.preprocessed.create_table(cur=cur)
+
+            random.seed(args.seed)
+            records = generate_records(
+                n_records=args.n_records,
+                article_size=args.article_size,
+                pool=pool,
+            )
+
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            {
+                'former': write_former,
+                'batched': write_batched,
+                'deferred': lambda **kwargs: write_batched(
+                    defer_index=True,
+                    **kwargs,
+                ),
+            }[method](cur=cur, records=records, batch_size=args.batch_size)
+            if trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            else:
+                elapsed = time.perf_counter() - start
+            conn.close()
+
+        print(f'{method:<10}{args.n_records / elapsed:>12.1f}'
+              f'{peak / 1024 ** 2:>10.1f}')
+
+    os.remove(db_path)
@@ -0,0 +1,164 @@
+r'''
+Requests and recall of `news.crawlers.probe` on simulated days, compared
+with exhaustive probing (recall is 1 by definition) and fixed fail count.
+Fixed fail count is also run with the largest limit learned policy may use,
+which crosses long gaps as well.
+
+Each simulated day publishes a random number of articles. Ids between
+articles are missing with geometric gaps, and some gaps are long (deleted
+or unpublished articles).
+
+```sh
+python -m benchmark.probe --n_days 365
+```
+'''
+import argparse
+import random
+import sqlite3
+from typing import List, Set
+
+import news.crawlers
+from news.crawlers.probe import Prober
+
+
+def parse_argument():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--n_days',
+        type=int,
+        default=180,
+        help='Specify number of simulated days.',
+    )
+    parser.add_argument(
+        '--max_idx',
+        type=int,
+        default=10000,
+        help='Specify size of id range of each day.',
+    )
+    parser.add_argument(
+        '--fail_limit',
+        type=int,
+        default=100,
+        help='Specify fixed consecutive fail count.',
+    )
+    parser.add_argument(
+        '--mean_news',
+        type=int,
+        default=300,
+        help='Specify average number of news per day.',
+    )
+    parser.add_argument(
+        '--mean_gap',
+        type=float,
+        default=2.0,
+        help='Specify average number of missing ids between news.',
+    )
+    parser.add_argument(
+        '--long_gap_ratio',
+        type=float,
+        default=0.01,
+        help='Specify ratio of gaps which are long.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Specify random seed.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+def generate_day(
+    max_idx: int,
+    mean_news: int,
+    mean_gap: float,
+    long_gap_ratio: float,
+) -> Set[int]:
+    n_news = max(1, int(random.gauss(mean_news, mean_news / 5)))
+    hit_idx = set()
+    idx = -1
+    for _ in range(n_news):
+        if random.random() < long_gap_ratio:
+            gap = random.randint(50, 200)
+        else:
+            gap = int(random.expovariate(1 / mean_gap)) if mean_gap else 0
+        idx += gap + 1
+        if idx >= max_idx:
+            break
+        hit_idx.add(idx)
+    return hit_idx
+
+
+def run(prober: Prober, max_idx: int, hit_idx: Set[int]):
+    for idx in range(max_idx):
+        if prober.is_done(idx=idx):
+            break
+        prober.update(idx=idx, is_hit=idx in hit_idx)
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+    random.seed(args.seed)
+
+    days: List[Set[int]] = [
+        generate_day(
+            max_idx=args.max_idx,
+            mean_news=args.mean_news,
+            mean_gap=args.mean_gap,
+            long_gap_ratio=args.long_gap_ratio,
+        )
+        for _ in range(args.n_days)
+    ]
+    n_news = sum(map(len, days))
+
+    conn = sqlite3.connect(':memory:')
+    cur = conn.cursor()
+    news.crawlers.probe.create_table(cur=cur)
+
+    max_fail_limit = args.fail_limit * news.crawlers.probe.MAX_FAIL_FACTOR
+    result = {
+        'exhaustive': [args.max_idx * args.n_days, n_news],
+        'fixed': [0, 0],
+        f'fixed x{news.crawlers.probe.MAX_FAIL_FACTOR}': [0, 0],
+        'adaptive': [0, 0],
+    }
+    for day, hit_idx in enumerate(days):
+        date = f'{day:08d}'
+
+        for name, fail_limit in [
+            ('fixed', args.fail_limit),
+            (f'fixed x{news.crawlers.probe.MAX_FAIL_FACTOR}', max_fail_limit),
+        ]:
+            prober = Prober(
+                company='benchmark',
+                category='',
+                date=date,
+                fail_limit=fail_limit,
+            )
+            run(prober=prober, max_idx=args.max_idx, hit_idx=hit_idx)
+            result[name][0] += prober.n_probes
+            result[name][1] += len(prober.hit_idx)
+
+        prober = news.crawlers.probe.get_prober(
+            cur=cur,
+            company='benchmark',
+            category='',
+            date=date,
+            default_fail_limit=args.fail_limit,
+        )
+        run(prober=prober, max_idx=args.max_idx, hit_idx=hit_idx)
+        news.crawlers.probe.save_prober(cur=cur, prober=prober)
+        result['adaptive'][0] += prober.n_probes
+        result['adaptive'][1] += len(prober.hit_idx)
+
+    print(f'days: {args.n_days}, news: {n_news}')
+    for name, (n_requests, n_found) in result.items():
+        print(
+            f'{name:<12}requests: {n_requests:>9}  '
+            f'wasted: {n_requests - n_found:>9}  '
+            f'recall: {n_found / max(n_news, 1):.4f}'
+        )
+
+    conn.close()
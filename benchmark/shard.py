@@ -0,0 +1,163 @@
+r'''
+Insert throughput and range query latency of one database versus shards of
+company and month (`news.db.shard`).
+
+Both layouts store the same generated news of `--n_companies` companies over
+12 months. Queries select one company in one month through
+`news.db.read.query_records`, which reads only the relevant shard.
+
+```sh
+python -m benchmark.shard --n_records 200000
+```
+'''
+import argparse
+import os
+import random
+import shutil
+import time
+from typing import List
+
+import news.db
+from news.db.schema import News
+
+
+def parse_argument():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--n_records',
+        type=int,
+        default=100000,
+        help='Specify number of generated news.',
+    )
+    parser.add_argument(
+        '--n_companies',
+        type=int,
+        default=11,
+        help='Specify number of companies.',
+    )
+    parser.add_argument(
+        '--raw_xml_size',
+        type=int,
+        default=5000,
+        help='Specify number of characters in each `raw_xml`.',
+    )
+    parser.add_argument(
+        '--batch_size',
+        type=int,
+        default=1000,
+        help='Specify number of records per commit.',
+    )
+    parser.add_argument(
+        '--n_queries',
+        type=int,
+        default=20,
+        help='Specify number of range queries.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Specify random seed.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+def generate_batch(
+    first_idx: int,
+    batch_size: int,
+    n_companies: int,
+    n_records: int,
+    raw_xml_size: int,
+    pool: str,
+) -> List[News]:
+    # News are crawled in order of release time, so each batch falls in one
+    # or two months.
+    news_list = []
+    for idx in range(first_idx, first_idx + batch_size):
+        start = random.randrange(len(pool) - raw_xml_size)
+        raw_xml = pool[start:start + raw_xml_size]
+        news_list.append(News(
+            article=raw_xml[:raw_xml_size // 20],
+            company=f'company{idx % n_companies}',
+            datetime=(
+                f'2021-{idx * 12 // n_records + 1:02d}-'
+                f'{idx % 28 + 1:02d}T00:00:00.000000Z'
+            ),
+            raw_xml=raw_xml,
+            title=raw_xml[:30],
+            url=f'https://example.com/news/{idx}',
+        ))
+    return news_list
+
+
+def remove_db(db_name: str):
+    db_path = news.db.util.get_path(db_name)
+    for suffix in ['', '-wal', '-shm']:
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    shard_dir = f'{os.path.splitext(db_path)[0]}.shards'
+    if os.path.exists(shard_dir):
+        shutil.rmtree(shard_dir)
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+    random.seed(args.seed)
+
+    pool = ''.join(
+        chr(random.randint(0x4E00, 0x9FFF))
+        for _ in range(args.raw_xml_size * 4)
+    )
+    queries = [
+        (
+            f'company{random.randrange(args.n_companies)}',
+            random.randint(1, 12),
+        )
+        for _ in range(args.n_queries)
+    ]
+
+    print(f'{"layout":<10}{"insert records/s":>18}{"query ms":>10}')
+    for layout in ['single', 'sharded']:
+        db_name = f'benchmark/shard_{layout}.db'
+        remove_db(db_name=db_name)
+
+        conn = news.db.util.get_conn(db_name=db_name, profile='crawl-writer')
+        cur = conn.cursor()
+        news.db.create.create_table(cur=cur)
+        if layout == 'sharded':
+            news.db.shard.create_shard_table(cur=cur)
+
+        elapsed = 0.0
+        for first_idx in range(0, args.n_records, args.batch_size):
+            news_list = generate_batch(
+                first_idx=first_idx,
+                batch_size=min(args.batch_size, args.n_records - first_idx),
+                n_companies=args.n_companies,
+                n_records=args.n_records,
+                raw_xml_size=args.raw_xml_size,
+                pool=pool,
+            )
+            # Exclude data generation time.
+            start = time.perf_counter()
+            news.db.write.write_new_records(cur=cur, news_list=news_list)
+            conn.commit()
+            elapsed += time.perf_counter() - start
+        conn.close()
+        insert_speed = args.n_records / elapsed
+
+        # Open database for each query like `news.db.read.load_records`.
+        start = time.perf_counter()
+        for company, month in queries:
+            records = news.db.read.load_records(
+                db_name=db_name,
+                company=company,
+                past_datetime=f'2021-{month:02d}-01T00:00:00.000000Z',
+                current_datetime=f'2021-{month:02d}-28T23:59:59.999999Z',
+            )
+            assert records
+        query_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        print(f'{layout:<10}{insert_speed:>18.1f}{query_ms:>10.1f}')
+        remove_db(db_name=db_name)
@@ -1,17 +1,29 @@
-from news.crawlers import (chinatimes, cna, epochtimes, ettoday, ftv,
-                           ltn, ntdtv, setn, storm, tvbs, udn, util)
+from news.crawlers import (cache, chinatimes, cna, daemon, epochtimes,
+                           ettoday, frontier, ftv, id_search, listing, ltn,
+                           metrics, ntdtv, parallel, probe, seen, setn, storm,
+                           tvbs, udn, util, work_queue)
 
 __all__ = [
+    cache,
     chinatimes,
     cna,
+    daemon,
     epochtimes,
     ettoday,
+    frontier,
     ftv,
+    id_search,
+    listing,
     ltn,
+    metrics,
     ntdtv,
+    parallel,
+    probe,
+    seen,
     setn,
     storm,
     tvbs,
     udn,
     util,
+    work_queue,
 ]
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+from typing import Final, List, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import news.db
+
+# `off`: always request, never cache.
+# `write`: always request and store responses (write through).
+# `read`: use cached responses, request and store on cache miss.
+# `replay`: only use cached responses, cache miss is treated as failure.
+MODES: Final[List[str]] = ['off', 'write', 'read', 'replay']
+# Only responses of these status codes are stored. Missing news (ETtoday uses
+# 410 instead of 404) stay missing, while bans, throttling and server errors
+# are temporary and must be requested again instead of replayed.
+STATUS_CODES: Final[List[int]] = [200, 404, 410]
+
+
+class ResponseCache:
+    r'''
+    Raw HTTP responses stored in SQLite. Responses are keyed by requested url
+    and bodies are compressed and keyed by their SHA-256, so identical pages
+    are stored once. Safe to share between crawler threads.
+    '''
+
+    def __init__(self, db_name: str, mode: str = 'read'):
+        if mode not in MODES:
+            raise ValueError(f'`mode` must be one of {MODES}.')
+
+        self.mode = mode
+        self.lock = threading.Lock()
+
+        db_path = news.db.util.get_path(db_name)
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Crawler threads share the same connection under `lock`.
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        news.db.util.set_profile(conn=self.conn, profile='crawl-writer')
+
+        cur = self.conn.cursor()
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS response (
+                url TEXT PRIMARY KEY,
+                final_url TEXT,
+                status_code INTEGER,
+                headers TEXT,
+                encoding TEXT,
+                body_hash TEXT,
+                fetched_at TEXT
+            );
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS body (
+                hash TEXT PRIMARY KEY,
+                data BLOB
+            );
+        """)
+        self.conn.commit()
+
+    def load(self, url: str) -> Optional[requests.Response]:
+        with self.lock:
+            rows = list(self.conn.execute(
+                '''
+                SELECT final_url, status_code, headers, encoding, data
+                FROM response JOIN body ON response.body_hash = body.hash
+                WHERE url = ?
+                ''',
+                [url],
+            ))
+        if not rows:
+            return None
+
+        final_url, status_code, headers, encoding, data = rows[0]
+        response = requests.Response()
+        response.url = final_url
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = encoding
+        response._content = zlib.decompress(data)
+        response._content_consumed = True
+        return response
+
+    def store(self, url: str, response: requests.Response):
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR IGNORE INTO body(hash, data) VALUES (?, ?)',
+                [body_hash, zlib.compress(response.content)],
+            )
+            self.conn.execute(
+                '''
+                INSERT OR REPLACE INTO response(
+                    url, final_url, status_code, headers, encoding, body_hash,
+                    fetched_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''',
+                [
+                    url,
+                    response.url,
+                    response.status_code,
+                    json.dumps(dict(response.headers)),
+                    response.encoding,
+                    body_hash,
+                    datetime.now(timezone.utc).strftime(
+                        '%Y-%m-%dT%H:%M:%S.%fZ'
+                    ),
+                ],
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# Cache used by `news.crawlers.util.get`. `None` means caching is off.
+CACHE: Optional[ResponseCache] = None
+
+
+def set_cache(db_name: str = None, mode: str = 'read'):
+    r'''
+    Use response cache stored in `data/{db_name}` for all crawlers. Turn
+    caching off if `db_name` is `None` or `mode == 'off'`.
+    '''
+    global CACHE
+
+    if CACHE is not None:
+        CACHE.close()
+        CACHE = None
+
+    if db_name is not None and mode != 'off':
+        CACHE = ResponseCache(db_name=db_name, mode=mode)
@@ -1,13 +1,12 @@
-from collections import Counter
 from datetime import datetime, timedelta
 from typing import List
 
 import dateutil.parser
-import requests
 from tqdm import tqdm
 
 import news.crawlers
 import news.db
+from news.crawlers.probe import Prober
 from news.db.schema import News
 
 CONTINUE_FAIL_COUNT = 500
@@ -20,15 +19,25 @@ def get_news_list(
     past_datetime: datetime,
     *,
     debug: bool = False,
+    prober: Prober = None,
 ) -> List[News]:
     news_list: List[News] = []
-    logger = Counter()
+    # Counts of errors are cumulative, so only errors of this call are shown.
+    errors = news.crawlers.metrics.get_errors(company='chinatimes')
 
     date = current_datetime
 
-    fail_count = 0
     date_str = date.strftime('%Y%m%d')
 
+    # Stop after fixed number of consecutive failures by default.
+    if prober is None:
+        prober = Prober(
+            company='chinatimes',
+            category=category,
+            date=date_str,
+            fail_limit=CONTINUE_FAIL_COUNT,
+        )
+
     # Only show progress bar in debug mode.
     iter_range = range(100000)
     if debug:
@@ -36,16 +45,12 @@ def get_news_list(
 
     for i in iter_range:
         # No more news to crawl.
-        if fail_count >= CONTINUE_FAIL_COUNT:
+        if prober.is_done(idx=i):
             break
 
         url = f'https://www.chinatimes.com/realtimenews/{date_str}{i:06d}-{api}?chdtv'
         try:
-            response = requests.get(
-                url,
-                timeout=news.crawlers.util.REQUEST_TIMEOUT,
-            )
-            response.close()
+            response = news.crawlers.util.get(url=url)
 
             # Raise exception if status code is not 200.
             news.crawlers.util.check_status_code(
@@ -53,24 +58,32 @@ def get_news_list(
                 response=response
             )
 
-            # If `status_code == 200`, reset `fail_count`.
-            fail_count = 0
-
             parsed_news = news.preprocess.chinatimes.parse(ori_news=News(
                 raw_xml=response.text,
                 url=url,
             ))
 
+            # If `status_code == 200` and successfully parsed, reset fail
+            # count.
+            prober.update(idx=i, is_hit=True)
+
             news_list.append(parsed_news)
         except Exception as err:
-            fail_count += 1
+            prober.update(idx=i, is_hit=False)
 
             if err.args:
-                logger.update([err.args[0]])
+                news.crawlers.metrics.record_error(
+                    company='chinatimes',
+                    message=err.args[0],
+                )
 
     # Only show error stats in debug mode.
     if debug:
-        for k, v in logger.items():
+        errors = news.crawlers.metrics.get_errors(
+            company='chinatimes',
+            since=errors,
+        )
+        for k, v in errors.items():
             print(f'{k}: {v}')
 
     return news_list
@@ -117,34 +130,39 @@ def main(
     past_datetime: datetime,
     *,
     debug: bool = False,
+    n_workers: int = 1,
 ):
 
     if past_datetime > current_datetime:
         raise ValueError('Must have `past_datetime <= current_datetime`.')
 
     # Get database connection.
-    conn = news.db.util.get_conn(db_name=f'raw/{db_name}')
-    cur = conn.cursor()
-    news.db.create.create_table(cur=cur)
-
-    for category, api in CATEGORIES.items():
-        date = current_datetime
-        # Commit database once a day.
-        while date >= past_datetime:
-            news.db.write.write_new_records(
-                cur=cur,
-                news_list=get_news_list(
-                    api=api,
-                    category=category,
-                    current_datetime=date,
-                    debug=debug,
-                    past_datetime=date - timedelta(days=1),
-                ),
-            )
-            # Go back 1 day.
-            date = date - timedelta(days=1)
-
-            conn.commit()
+    conn = news.db.util.get_conn(
+        db_name=f'raw/{db_name}',
+        profile='crawl-writer',
+    )
+
+    # Commit database once a day for each category.
+    news.crawlers.parallel.crawl_units(
+        conn=conn,
+        company='chinatimes',
+        units=news.crawlers.parallel.get_units(
+            categories=list(CATEGORIES.keys()),
+            current_datetime=current_datetime,
+            past_datetime=past_datetime,
+        ),
+        get_news_list=lambda category, date, prober: get_news_list(
+            api=CATEGORIES[category],
+            category=category,
+            current_datetime=date,
+            debug=debug and n_workers == 1,
+            past_datetime=date - timedelta(days=1),
+            prober=prober,
+        ),
+        default_fail_limit=CONTINUE_FAIL_COUNT,
+        n_workers=n_workers,
+        debug=debug,
+    )
 
     # Close database connection.
     conn.close()
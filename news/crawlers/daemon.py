@@ -0,0 +1,173 @@
+import inspect
+import time
+import traceback
+from concurrent.futures import (FIRST_COMPLETED, Future, ThreadPoolExecutor,
+                                wait)
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+import news.crawlers
+
+# Default settings of each crawler in daemon config.
+DEFAULT_CONFIG: Dict[str, Any] = {
+    # Database under `data/raw`, default `{crawler_name}.db`.
+    'db_name': None,
+    # Minutes between starts of consecutive runs.
+    'interval_mins': 60,
+    # Each run crawls news released within last `window_hours`.
+    'window_hours': 24,
+    # Maximum number of requests per second, no limit if `None`.
+    'max_requests_per_sec': None,
+    'n_workers': 1,
+}
+
+
+@dataclass
+class Job:
+    r'''
+    Crawler `func` (`main` of crawler module) which runs every `interval`.
+    '''
+    name: str
+    func: Callable[..., None]
+    db_name: str
+    interval: timedelta
+    window: timedelta
+    n_workers: int = 1
+    next_run_at: float = 0.0
+    n_runs: int = 0
+    n_failures: int = 0
+
+
+def get_jobs(
+    config: Dict[str, Dict[str, Any]],
+    crawler_dict: Dict[str, Callable[..., None]],
+) -> List[Job]:
+    r'''
+    Create jobs from `config`, which maps crawler name to its settings in
+    `DEFAULT_CONFIG`. Rate limits are applied to `news.crawlers.util`.
+    Crawlers which only crawl explicit id ranges, e.g. TVBS, are rejected
+    since each run crawls a time window.
+    '''
+    jobs = []
+    for name, crawler_config in config.items():
+        if name not in crawler_dict:
+            raise ValueError(f'`{name}` must be one of {list(crawler_dict)}.')
+        params = inspect.signature(crawler_dict[name]).parameters
+        if 'first_idx' in params and 'past_datetime' not in params:
+            raise ValueError(
+                f'`{name}` needs explicit `first_idx` and `latest_idx`, '
+                'which is not supported in daemon mode.'
+            )
+        unknown_keys = set(crawler_config) - set(DEFAULT_CONFIG)
+        if unknown_keys:
+            raise ValueError(
+                f'Unknown settings {sorted(unknown_keys)} of `{name}`.'
+            )
+
+        crawler_config = {**DEFAULT_CONFIG, **crawler_config}
+        if crawler_config['max_requests_per_sec'] is not None:
+            news.crawlers.util.MAX_REQUESTS_PER_SEC[name] = float(
+                crawler_config['max_requests_per_sec']
+            )
+
+        jobs.append(Job(
+            name=name,
+            func=crawler_dict[name],
+            db_name=crawler_config['db_name'] or f'{name}.db',
+            interval=timedelta(minutes=crawler_config['interval_mins']),
+            window=timedelta(hours=crawler_config['window_hours']),
+            n_workers=crawler_config['n_workers'],
+        ))
+    return jobs
+
+
+def run_job(job: Job, *, debug: bool = False) -> None:
+    current_datetime = datetime.now(timezone.utc)
+    params = {
+        'current_datetime': current_datetime,
+        'db_name': job.db_name,
+        'debug': debug,
+        'first_idx': -1,
+        'latest_idx': -1,
+        'n_workers': job.n_workers,
+        'past_datetime': current_datetime - job.window,
+    }
+    job.func(**dict(
+        (k, v) for k, v in params.items()
+        if k in job.func.__code__.co_varnames
+    ))
+
+
+def run_daemon(
+    jobs: List[Job],
+    max_runs: int = None,
+    *,
+    debug: bool = False,
+) -> None:
+    r'''
+    Run all `jobs` in one process, each in its own thread so that a crawler
+    cooling down after banned does not block others. A job starts again
+    `interval` after its previous start, or right after it finishes if it
+    takes longer. Failed runs are reported and retried at next run.
+
+    Stop after each job runs `max_runs` times, or run forever if `None`.
+    '''
+    running: Dict[Future, Job] = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, len(jobs)))
+
+    try:
+        while True:
+            now = time.monotonic()
+            # Jobs which are not running and have runs left.
+            waiting = [
+                job for job in jobs
+                if job not in running.values()
+                and (max_runs is None or job.n_runs < max_runs)
+            ]
+            for job in waiting:
+                if job.next_run_at <= now:
+                    job.next_run_at = now + job.interval.total_seconds()
+                    running[executor.submit(run_job, job, debug=debug)] = job
+            waiting = [job for job in waiting if job not in running.values()]
+
+            if not running and not waiting:
+                break
+
+            # Wake up when a job finishes or the next job is due.
+            timeout = None
+            if waiting:
+                timeout = max(
+                    0.0,
+                    min(job.next_run_at for job in waiting) - now,
+                )
+            if not running:
+                time.sleep(timeout)
+                continue
+            done, _ = wait(
+                running,
+                timeout=timeout,
+                return_when=FIRST_COMPLETED,
+            )
+
+            for future in done:
+                job = running.pop(future)
+                job.n_runs += 1
+                try:
+                    future.result()
+                except Exception:
+                    job.n_failures += 1
+                    print(f'{job.name} failed:')
+                    traceback.print_exc()
+
+                if debug:
+                    print(
+                        f'{job.name} finished run {job.n_runs} '
+                        f'({job.n_failures} failed), next run in '
+                        f'{max(0.0, job.next_run_at - time.monotonic()):.0f}s'
+                    )
+    finally:
+        # `cancel_futures` of `shutdown` needs Python 3.9.
+        for future in running:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,205 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import news.crawlers
+import news.db
+from news.db.schema import News
+
+# Status of each unit. Units which are not `done` are crawled again when
+# crawler restarts.
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+STATUSES = [PENDING, RUNNING, DONE, FAILED]
+# Time spans are still receiving news until this long after they end, e.g.
+# news released late or days of websites in other time zones.
+SETTLE_WINDOW = timedelta(hours=12)
+
+
+def create_table(cur: sqlite3.Cursor):
+    # `unit` is crawler specific, e.g. `category/date` or `first-last` ids.
+    # `n_news` is number of news crawled by the last successful attempt.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_frontier (
+            crawler TEXT,
+            unit TEXT,
+            status TEXT,
+            attempts INTEGER DEFAULT 0,
+            n_news INTEGER,
+            last_error TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            PRIMARY KEY (crawler, unit)
+        );
+    """)
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def get_time_range_name(
+    current_datetime: datetime,
+    past_datetime: datetime,
+) -> str:
+    return (
+        f'{past_datetime.strftime("%Y%m%dT%H%M%S")}-'
+        f'{current_datetime.strftime("%Y%m%dT%H%M%S")}'
+    )
+
+
+def is_final(end: datetime) -> bool:
+    r'''
+    Whether time span ending at `end` is over by `SETTLE_WINDOW` now, so that
+    its units will not get new news. Naive `end` is local time.
+    '''
+    return end + SETTLE_WINDOW <= datetime.now(end.tzinfo)
+
+
+def get_n_news(cur: sqlite3.Cursor, crawler: str, unit: str) -> Optional[int]:
+    r'''
+    Return number of news crawled in `unit` if it is done, or `None`.
+    '''
+    rows = list(cur.execute(
+        '''
+        SELECT n_news FROM crawl_frontier
+        WHERE crawler = ? AND unit = ? AND status = ?
+        ''',
+        [crawler, unit, DONE],
+    ))
+    if not rows:
+        return None
+    return rows[0][0]
+
+
+def start_unit(cur: sqlite3.Cursor, crawler: str, unit: str):
+    cur.execute(
+        '''
+        INSERT INTO crawl_frontier(
+            crawler, unit, status, attempts, created_at, updated_at
+        )
+        VALUES (?, ?, ?, 1, ?, ?)
+        ON CONFLICT (crawler, unit) DO UPDATE SET
+            status = excluded.status,
+            attempts = attempts + 1,
+            updated_at = excluded.updated_at
+        ''',
+        [crawler, unit, RUNNING, now(), now()],
+    )
+
+
+def finish_unit(
+    cur: sqlite3.Cursor,
+    crawler: str,
+    unit: str,
+    n_news: int,
+    is_final: bool = True,
+):
+    r'''
+    Mark `unit` as done. Units which may still get new news, e.g. today, are
+    marked as pending with `is_final=False`, so they are crawled again. See
+    `is_final`.
+    '''
+    cur.execute(
+        '''
+        UPDATE crawl_frontier
+        SET status = ?, n_news = ?, last_error = NULL, updated_at = ?
+        WHERE crawler = ? AND unit = ?
+        ''',
+        [DONE if is_final else PENDING, n_news, now(), crawler, unit],
+    )
+
+
+def fail_unit(cur: sqlite3.Cursor, crawler: str, unit: str, error: str):
+    cur.execute(
+        '''
+        UPDATE crawl_frontier
+        SET status = ?, last_error = ?, updated_at = ?
+        WHERE crawler = ? AND unit = ?
+        ''',
+        [FAILED, error, now(), crawler, unit],
+    )
+
+
+def reset_units(
+    cur: sqlite3.Cursor,
+    crawler: str,
+    status: str = FAILED,
+    unit_pattern: str = '%',
+) -> int:
+    r'''
+    Mark units with `status` whose name matches SQL LIKE `unit_pattern` as
+    pending, so that they are crawled again. Return number of reset units.
+    '''
+    cur.execute(
+        '''
+        UPDATE crawl_frontier
+        SET status = ?, updated_at = ?
+        WHERE crawler = ? AND status = ? AND unit LIKE ?
+        ''',
+        [PENDING, now(), crawler, status, unit_pattern],
+    )
+    return cur.rowcount
+
+
+def get_summary(cur: sqlite3.Cursor) -> Dict[str, Dict[str, int]]:
+    r'''
+    Number of units of each crawler in each status.
+    '''
+    summary: Dict[str, Dict[str, int]] = {}
+    for crawler, status, count in cur.execute('''
+        SELECT crawler, status, COUNT(*) FROM crawl_frontier
+        GROUP BY crawler, status
+    '''):
+        summary.setdefault(crawler, {})[status] = count
+    return summary
+
+
+def run_unit(
+    conn: sqlite3.Connection,
+    crawler: str,
+    unit: str,
+    get_news_list: Callable[[], List[News]],
+    is_final: bool = True,
+) -> int:
+    r'''
+    Crawl `unit` with `get_news_list` unless it is done already. News and
+    status of `unit` are committed in the same transaction, so a unit is
+    either done with all its news written or crawled again on restart.
+    Failure is recorded before the error is raised again. Units which may
+    still get new news are crawled again by later runs with `is_final=False`,
+    see `finish_unit`.
+
+    Return number of news crawled in `unit`.
+    '''
+    cur = conn.cursor()
+    create_table(cur=cur)
+
+    n_news = get_n_news(cur=cur, crawler=crawler, unit=unit)
+    if n_news is not None:
+        return n_news
+
+    start_unit(cur=cur, crawler=crawler, unit=unit)
+    conn.commit()
+
+    try:
+        news_list = get_news_list()
+    except Exception as err:
+        fail_unit(cur=cur, crawler=crawler, unit=unit, error=repr(err))
+        conn.commit()
+        raise
+
+    news.db.write.write_new_records(cur=cur, news_list=news_list)
+    finish_unit(
+        cur=cur,
+        crawler=crawler,
+        unit=unit,
+        n_news=len(news_list),
+        is_final=is_final,
+    )
+    conn.commit()
+    news.crawlers.seen.add_urls(urls=[n.url for n in news_list])
+
+    return len(news_list)
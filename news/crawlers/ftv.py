@@ -1,13 +1,12 @@
-from collections import Counter
 from datetime import datetime, timedelta
 from typing import List
 
 import dateutil.parser
-import requests
 from tqdm import tqdm
 
 import news.crawlers
 import news.db
+from news.crawlers.probe import Prober
 from news.db.schema import News
 
 CONTINUE_FAIL_COUNT = 100
@@ -35,16 +34,26 @@ def get_news_list(
     past_datetime: datetime,
     *,
     debug: bool = False,
+    prober: Prober = None,
 ) -> List[News]:
     news_list: List[News] = []
-    logger = Counter()
+    # Counts of errors are cumulative, so only errors of this call are shown.
+    errors = news.crawlers.metrics.get_errors(company='ftv')
 
     date = current_datetime
 
-    fail_count = 0
     date_str = \
         f'{date.strftime("%Y")}{int(date.strftime("%m")):x}{date.strftime("%d")}'
 
+    # Stop after fixed number of consecutive failures by default.
+    if prober is None:
+        prober = Prober(
+            company='ftv',
+            category=api,
+            date=date.strftime('%Y%m%d'),
+            fail_limit=CONTINUE_FAIL_COUNT,
+        )
+
     if api == 'W':
         iter_range = range(10000)
     else:
@@ -56,7 +65,7 @@ def get_news_list(
 
     for i in iter_range:
         # No more news to crawl.
-        if fail_count >= CONTINUE_FAIL_COUNT:
+        if prober.is_done(idx=i):
             break
 
         if api == 'W':
@@ -65,11 +74,7 @@ def get_news_list(
             url = f'https://www.ftvnews.com.tw/news/detail/{date_str}{api}{i:02}M1'
 
         try:
-            response = requests.get(
-                url,
-                timeout=news.crawlers.util.REQUEST_TIMEOUT,
-            )
-            response.close()
+            response = news.crawlers.util.get(url=url)
 
             # Raise exception if status code is not 200.
             news.crawlers.util.check_status_code(
@@ -83,22 +88,29 @@ def get_news_list(
             ))
 
             # If `status_code == 200` and successfully parsed (only happend when
-            # such news is not missing), reset `fail_count`.
-            fail_count = 0
+            # such news is not missing), reset fail count.
+            prober.update(idx=i, is_hit=True)
 
             news_datetime = dateutil.parser.isoparse(parsed_news.datetime)
 
             news_list.append(parsed_news)
         except Exception as err:
-            fail_count += 1
+            prober.update(idx=i, is_hit=False)
 
             if err.args:
-                logger.update([err.args[0]])
+                news.crawlers.metrics.record_error(
+                    company='ftv',
+                    message=err.args[0],
+                )
             continue
 
     # Only show error stats in debug mode.
     if debug:
-        for k, v in logger.items():
+        errors = news.crawlers.metrics.get_errors(
+            company='ftv',
+            since=errors,
+        )
+        for k, v in errors.items():
             print(f'{k}: {v}')
 
     return news_list
@@ -110,34 +122,38 @@ def main(
     past_datetime: datetime,
     *,
     debug: bool = False,
+    n_workers: int = 1,
 ):
     if past_datetime > current_datetime:
         raise ValueError('Must have `past_datetime <= current_datetime`.')
 
     # Get database connection.
-    conn = news.db.util.get_conn(db_name=f'raw/{db_name}')
-    cur = conn.cursor()
-    news.db.create.create_table(cur=cur)
-
-    for api, category in CATEGORIES.items():
-        date = current_datetime
-        # Commit database once a day.
-        while date >= past_datetime:
-            news.db.write.write_new_records(
-                cur=cur,
-                news_list=get_news_list(
-                    category=category,
-                    current_datetime=date,
-                    api=api,
-                    debug=debug,
-                    past_datetime=date - timedelta(days=1),
-                ),
-            )
-
-            # Go back 1 day.
-            date = date - timedelta(days=1)
-
-            conn.commit()
+    conn = news.db.util.get_conn(
+        db_name=f'raw/{db_name}',
+        profile='crawl-writer',
+    )
+
+    # Commit database once a day for each category.
+    news.crawlers.parallel.crawl_units(
+        conn=conn,
+        company='ftv',
+        units=news.crawlers.parallel.get_units(
+            categories=list(CATEGORIES.keys()),
+            current_datetime=current_datetime,
+            past_datetime=past_datetime,
+        ),
+        get_news_list=lambda api, date, prober: get_news_list(
+            category=CATEGORIES[api],
+            current_datetime=date,
+            api=api,
+            debug=debug and n_workers == 1,
+            past_datetime=date - timedelta(days=1),
+            prober=prober,
+        ),
+        default_fail_limit=CONTINUE_FAIL_COUNT,
+        n_workers=n_workers,
+        debug=debug,
+    )
 
     # Close database connection.
     conn.close()
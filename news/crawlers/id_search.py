@@ -0,0 +1,174 @@
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+import dateutil.parser
+
+from news.db.schema import News
+
+# Article ids are sparse. An id is treated as dead only when this many
+# consecutive ids starting from it are all dead.
+GAP_WINDOW = 20
+# Longest range of dead ids skipped when looking for the first live id.
+MAX_GAP = 100000
+
+
+def probe(
+    get_news: Callable[[int], News],
+    idx: int,
+    window: int = GAP_WINDOW,
+    *,
+    debug: bool = False,
+) -> Optional[Tuple[int, News]]:
+    r'''
+    Return the first live id in `[idx, idx + window)` and its news, or `None`
+    if all ids are dead. `get_news` must raise when id is dead.
+    '''
+    for cur_idx in range(idx, idx + window):
+        try:
+            return cur_idx, get_news(cur_idx)
+        except Exception as err:
+            if debug and err.args:
+                print(f'{cur_idx}: {err.args[0]}')
+    return None
+
+
+def probe_forward(
+    get_news: Callable[[int], News],
+    idx: int,
+    end_idx: int,
+    window: int = GAP_WINDOW,
+    *,
+    debug: bool = False,
+) -> Optional[Tuple[int, News]]:
+    r'''
+    Find a live id in `[idx, end_idx)` by probing windows at doubling offsets,
+    so that long dead ranges cost `O(window * log(end_idx - idx))` requests.
+    Ids skipped between windows are treated as dead.
+    '''
+    offset = 0
+    while idx + offset < end_idx:
+        hit = probe(
+            get_news=get_news,
+            idx=idx + offset,
+            window=min(window, end_idx - idx - offset),
+            debug=debug,
+        )
+        if hit is not None:
+            return hit
+        offset = max(window, 2 * offset)
+    return None
+
+
+def find_latest_idx(
+    get_news: Callable[[int], News],
+    first_idx: int,
+    *,
+    debug: bool = False,
+    window: int = GAP_WINDOW,
+) -> int:
+    r'''
+    Find the largest live id which is not smaller than `first_idx`.
+
+    Exponential search doubles the step from the last live id until a dead
+    window is found, then binary search narrows the range between the last
+    live id and the dead window. Cost is `O(window * log(latest_idx))`
+    requests. Return `first_idx - 1` if there is no live id.
+    '''
+    hit = probe_forward(
+        get_news=get_news,
+        idx=first_idx,
+        end_idx=first_idx + MAX_GAP,
+        window=window,
+        debug=debug,
+    )
+    if hit is None:
+        return first_idx - 1
+
+    # Exponential search. `live_idx` is live and `dead_idx` starts a dead
+    # window.
+    live_idx = hit[0]
+    step = 1
+    while True:
+        hit = probe(
+            get_news=get_news,
+            idx=live_idx + step,
+            window=window,
+            debug=debug,
+        )
+        if hit is None:
+            dead_idx = live_idx + step
+            break
+        live_idx = hit[0]
+        step *= 2
+
+    # Binary search.
+    while dead_idx - live_idx > 1:
+        mid_idx = (live_idx + dead_idx) // 2
+        hit = probe(
+            get_news=get_news,
+            idx=mid_idx,
+            window=min(window, dead_idx - mid_idx),
+            debug=debug,
+        )
+        if hit is None:
+            dead_idx = mid_idx
+        else:
+            live_idx = hit[0]
+
+    if debug:
+        print(f'latest idx: {live_idx}')
+
+    return live_idx
+
+
+def find_idx_by_datetime(
+    get_news: Callable[[int], News],
+    target_datetime: datetime,
+    first_idx: int,
+    latest_idx: int,
+    *,
+    debug: bool = False,
+    window: int = GAP_WINDOW,
+) -> int:
+    r'''
+    Find the smallest live id in `[first_idx, latest_idx]` whose news is
+    released not earlier than `target_datetime`, assuming ids increase with
+    release time. Return `latest_idx + 1` if there is no such id.
+    '''
+
+    def get_dated_news(idx: int) -> News:
+        parsed_news = get_news(idx)
+        # Raise when datetime is missing, so that it is treated as dead.
+        dateutil.parser.isoparse(parsed_news.datetime)
+        return parsed_news
+
+    # Answer is in `[lo_idx, hi_idx]`, where `hi_idx == latest_idx + 1` means
+    # not found.
+    lo_idx = first_idx
+    hi_idx = latest_idx + 1
+    while lo_idx < hi_idx:
+        mid_idx = (lo_idx + hi_idx) // 2
+
+        hit = probe_forward(
+            get_news=get_dated_news,
+            idx=mid_idx,
+            end_idx=hi_idx,
+            window=window,
+            debug=debug,
+        )
+
+        # Ids in `[mid_idx, live_idx)` are treated as dead.
+        if hit is None:
+            hi_idx = mid_idx
+            continue
+
+        live_idx, parsed_news = hit
+        if dateutil.parser.isoparse(parsed_news.datetime) >= target_datetime:
+            hi_idx = mid_idx
+        else:
+            lo_idx = live_idx + 1
+
+    if debug:
+        print(f'first idx after {target_datetime}: {lo_idx}')
+
+    return lo_idx
@@ -0,0 +1,147 @@
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+from requests import Response
+
+import news.crawlers
+import news.db
+
+
+class ListingState:
+    r'''
+    Validators (`ETag`, `Last-Modified`) and content hash of listing pages
+    crawled before, stored in table `listing` of `data/{db_name}`. Safe to
+    share between crawler threads.
+    '''
+
+    def __init__(self, db_name: str):
+        self.lock = threading.Lock()
+        # Crawler threads share the same connection under `lock`.
+        self.conn = sqlite3.connect(
+            news.db.util.get_path(db_name),
+            check_same_thread=False,
+        )
+        news.db.util.set_profile(conn=self.conn, profile='crawl-writer')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS listing (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                updated_at TEXT
+            );
+        """)
+        self.conn.commit()
+
+    def load(self, url: str) -> Optional[tuple]:
+        r'''
+        Return `(etag, last_modified, content_hash)` of `url` if crawled.
+        '''
+        with self.lock:
+            rows = list(self.conn.execute(
+                '''
+                SELECT etag, last_modified, content_hash FROM listing
+                WHERE url = ?
+                ''',
+                [url],
+            ))
+        if not rows:
+            return None
+        return rows[0]
+
+    def store(self, url: str, response: Response):
+        with self.lock:
+            self.conn.execute(
+                '''
+                INSERT OR REPLACE INTO listing(
+                    url, etag, last_modified, content_hash, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?)
+                ''',
+                [
+                    url,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    get_content_hash(response=response),
+                    datetime.now(timezone.utc).strftime(
+                        '%Y-%m-%dT%H:%M:%S.%fZ'
+                    ),
+                ],
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def get_content_hash(response: Response) -> str:
+    return hashlib.sha256(response.content).hexdigest()
+
+
+# Listing state used by listing based crawlers. `None` means every listing is
+# crawled.
+STATE: Optional[ListingState] = None
+
+
+def set_listing_state(db_name: str = None):
+    r'''
+    Crawl incrementally with listing state stored in `data/{db_name}`:
+    unchanged listing pages are skipped and paging stops at the first crawled
+    news. Turn off if `db_name` is `None`.
+    '''
+    global STATE
+
+    if STATE is not None:
+        STATE.close()
+        STATE = None
+
+    if db_name is not None:
+        STATE = ListingState(db_name=db_name)
+
+
+def is_incremental() -> bool:
+    return STATE is not None
+
+
+def get(url: str) -> Optional[Response]:
+    r'''
+    Send conditional GET request to listing page `url`. Return `None` if the
+    page is not modified since it is saved by `save`, either by `304` or by
+    identical content.
+    '''
+    if STATE is None:
+        return news.crawlers.util.get(url=url)
+
+    state = STATE.load(url=url)
+    if state is None:
+        return news.crawlers.util.get(url=url)
+
+    etag, last_modified, content_hash = state
+    headers = {}
+    if etag is not None:
+        headers['If-None-Match'] = etag
+    if last_modified is not None:
+        headers['If-Modified-Since'] = last_modified
+
+    response = news.crawlers.util.get(url=url, headers=headers)
+    if response.status_code == 304:
+        return None
+    if (
+        response.status_code == 200
+        and get_content_hash(response=response) == content_hash
+    ):
+        return None
+    return response
+
+
+def save(url: str, response: Response):
+    r'''
+    Mark listing page `url` as crawled. Call after all news in the page are
+    crawled, so pages of failed runs are crawled again.
+    '''
+    if STATE is not None and response.status_code == 200:
+        STATE.store(url=url, response=response)
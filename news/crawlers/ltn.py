@@ -1,7 +1,6 @@
-from collections import Counter
+from datetime import datetime, timedelta, timezone
 from typing import List
 
-import requests
 from tqdm import tqdm
 
 import news.crawlers
@@ -19,7 +18,8 @@ def get_news_list(
     debug: bool = False,
 ) -> List[News]:
     news_list: List[News] = []
-    logger = Counter()
+    # Counts of errors are cumulative, so only errors of this call are shown.
+    errors = news.crawlers.metrics.get_errors(company='ltn')
 
     # Only show progress bar in debug mode.
     iter_range = range(FIRST_PAGE, MAX_PAGE)
@@ -27,42 +27,48 @@ def get_news_list(
         iter_range = tqdm(iter_range, desc='Crawling loop.')
 
     # Crawling loop.
+    stop_paging = False
     for page in iter_range:
+        if stop_paging:
+            break
 
         page_url = f'https://news.ltn.com.tw/ajax/breakingnews/{api}/{page}'
 
         try:
-            response = requests.get(
-                page_url,
-                timeout=news.crawlers.util.REQUEST_TIMEOUT,
-            )
-            response.close()
+            page_response = news.crawlers.listing.get(url=page_url)
+
+            # Skip listing page which is not changed since last crawl.
+            if page_response is None:
+                raise Exception('Listing not changed.')
 
             # Raise exception if status code is not 200.
             news.crawlers.util.check_status_code(
                 company='ltn',
-                response=response
+                response=page_response
             )
 
             # If `status_code == 200`, parse links in this page.
-            api_json = response.json()['data']
+            api_json = page_response.json()['data']
             # Inconsistent api format.
             if page != 1:
                 api_json = api_json.values()
         except Exception as err:
             if err.args:
-                logger.update([err.args[0]])
+                news.crawlers.metrics.record_error(
+                    company='ltn',
+                    message=err.args[0],
+                )
             continue
 
         for news_dict in api_json:
             try:
                 news_url = news_dict['url']
 
-                response = requests.get(
-                    news_url,
-                    timeout=news.crawlers.util.REQUEST_TIMEOUT,
-                )
-                response.close()
+                # Skip request if news is already crawled.
+                if news.crawlers.seen.is_seen(url=news_url):
+                    raise Exception('News already crawled.')
+
+                response = news.crawlers.util.get(url=news_url)
 
                 # Raise exception if status code is not 200.
                 news.crawlers.util.check_status_code(
@@ -79,11 +85,30 @@ def get_news_list(
                 news_list.append(parsed_news)
             except Exception as err:
                 if err.args:
-                    logger.update([err.args[0]])
+                    news.crawlers.metrics.record_error(
+                        company='ltn',
+                        message=err.args[0],
+                    )
+
+                    # Stop paging at the first crawled news.
+                    if (
+                        err.args[0] == 'News already crawled.'
+                        and news.crawlers.listing.is_incremental()
+                    ):
+                        stop_paging = True
+                        break
+
+        # Only save listing page whose news are all visited.
+        if not stop_paging:
+            news.crawlers.listing.save(url=page_url, response=page_response)
 
     # Only show error stats in debug mode.
     if debug:
-        for k, v in logger.items():
+        errors = news.crawlers.metrics.get_errors(
+            company='ltn',
+            since=errors,
+        )
+        for k, v in errors.items():
             print(f'{k}: {v}')
 
     return news_list
@@ -106,21 +131,37 @@ def main(
 ):
 
     # Get database connection.
-    conn = news.db.util.get_conn(db_name=f'raw/{db_name}')
+    conn = news.db.util.get_conn(
+        db_name=f'raw/{db_name}',
+        profile='crawl-writer',
+    )
     cur = conn.cursor()
     news.db.create.create_table(cur=cur)
 
+    # Only latest news are listed, so units are keyed by date of crawling.
+    # News are still released today, so units of today are crawled again by
+    # later runs until the day is over by `SETTLE_WINDOW`. Incremental crawls
+    # are cheap, so they run whenever invoked.
+    date_format = '%Y%m%d'
+    if news.crawlers.listing.is_incremental():
+        date_format = '%Y%m%dT%H%M%S'
+    now = datetime.now(timezone.utc)
+    date_str = now.strftime(date_format)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
     for category, api in CATEGORIES.items():
-        news.db.write.write_new_records(
-            cur=cur,
-            news_list=get_news_list(
+        news.crawlers.frontier.run_unit(
+            conn=conn,
+            crawler='ltn',
+            unit=f'{category}/{date_str}',
+            get_news_list=lambda: get_news_list(
                 api=api,
                 category=category,
                 debug=debug,
             ),
+            is_final=news.crawlers.frontier.is_final(
+                end=today + timedelta(days=1),
+            ),
         )
 
-        conn.commit()
-
     # Close database connection.
     conn.close()
@@ -0,0 +1,315 @@
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Final, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from requests import Response
+
+import news.crawlers.util
+
+# Upper bounds (in seconds) of buckets of request latency histogram.
+LATENCY_BUCKETS: Final[List[float]] = [
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+]
+DESCRIPTIONS: Final[Dict[str, str]] = {
+    'crawler_requests_total': 'Number of HTTP requests by status code.',
+    'crawler_response_bytes_total': 'Number of bytes of response bodies.',
+    'crawler_request_seconds': 'Latency of HTTP requests.',
+    'crawler_cache_hits_total': 'Number of responses loaded from cache.',
+    'crawler_bans_total': 'Number of times getting banned.',
+    'crawler_errors_total': 'Number of failed news by error message.',
+}
+# Keep number of distinct error labels small.
+MAX_ERROR_LENGTH = 100
+# Parts of error messages which differ by news, e.g. urls and ids in
+# `requests` errors like `Max retries exceeded with url: /news/123`.
+ERROR_PATTERNS = [
+    (re.compile(r'\S+://\S+'), '<url>'),
+    (re.compile(r'url: \S+'), 'url: <url>'),
+    (re.compile(r'0x[0-9a-fA-F]+'), '<n>'),
+    (re.compile(r'\d+'), '<n>'),
+]
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Metrics:
+    r'''
+    Counters and latency histograms labelled by company and endpoint. Each
+    update is a dictionary update under one lock, so metrics are cheap enough
+    to be always on. Safe to share between crawler threads.
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        # Count of each bucket, then sum and count of observed values.
+        self.histograms: Dict[str, Dict[Labels, List[float]]] = {}
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1.0):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            counter = self.counters.setdefault(name, {})
+            counter[key] = counter.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: Dict[str, str], value: float):
+        key = tuple(sorted(labels.items()))
+        idx = bisect.bisect_left(LATENCY_BUCKETS, value)
+        with self.lock:
+            histogram = self.histograms.setdefault(name, {})
+            if key not in histogram:
+                histogram[key] = [0.0] * (len(LATENCY_BUCKETS) + 3)
+            values = histogram[key]
+            # The last bucket is `+Inf`.
+            values[idx] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    def get_counter(self, name: str) -> Dict[Labels, float]:
+        with self.lock:
+            return dict(self.counters.get(name, {}))
+
+    def to_dict(self) -> Dict:
+        r'''
+        Snapshot of all metrics, where buckets of histograms are cumulative
+        like Prometheus.
+        '''
+        with self.lock:
+            counters = {
+                name: [
+                    {'labels': dict(key), 'value': value}
+                    for key, value in counter.items()
+                ]
+                for name, counter in self.counters.items()
+            }
+            histograms = {
+                name: [
+                    {
+                        'labels': dict(key),
+                        'buckets': dict(zip(
+                            [*map(str, LATENCY_BUCKETS), '+Inf'],
+                            cumulate(values[:-2]),
+                        )),
+                        'sum': values[-2],
+                        'count': values[-1],
+                    }
+                    for key, values in histogram.items()
+                ]
+                for name, histogram in self.histograms.items()
+            }
+        return {'counters': counters, 'histograms': histograms}
+
+    def to_prometheus(self) -> str:
+        r'''
+        Metrics in Prometheus text format, e.g. for textfile collector of
+        node exporter.
+        '''
+        snapshot = self.to_dict()
+        lines = []
+        for name, samples in sorted(snapshot['counters'].items()):
+            lines.append(f'# HELP {name} {DESCRIPTIONS.get(name, name)}')
+            lines.append(f'# TYPE {name} counter')
+            for sample in samples:
+                lines.append(
+                    f'{name}{format_labels(sample["labels"])} '
+                    f'{format_value(sample["value"])}'
+                )
+        for name, samples in sorted(snapshot['histograms'].items()):
+            lines.append(f'# HELP {name} {DESCRIPTIONS.get(name, name)}')
+            lines.append(f'# TYPE {name} histogram')
+            for sample in samples:
+                for le, count in sample['buckets'].items():
+                    labels = format_labels({**sample['labels'], 'le': le})
+                    lines.append(
+                        f'{name}_bucket{labels} {format_value(count)}'
+                    )
+                labels = format_labels(sample['labels'])
+                lines.append(
+                    f'{name}_sum{labels} {format_value(sample["sum"])}'
+                )
+                lines.append(
+                    f'{name}_count{labels} {format_value(sample["count"])}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+def cumulate(values: List[float]) -> List[float]:
+    total = 0.0
+    result = []
+    for value in values:
+        total += value
+        result.append(total)
+    return result
+
+
+def format_value(value: float) -> str:
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"')
+        value = value.replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class Exporter:
+    r'''
+    Write metrics as Prometheus text file to `prometheus_path` and append JSON
+    snapshot to `snapshot_path` every `interval_secs` in background, and once
+    more when closed.
+    '''
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        prometheus_path: str = None,
+        snapshot_path: str = None,
+        interval_secs: float = 60.0,
+    ):
+        self.metrics = metrics
+        self.prometheus_path = prometheus_path
+        self.snapshot_path = snapshot_path
+        self.interval_secs = interval_secs
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval_secs):
+            self.export()
+
+    def export(self):
+        if self.prometheus_path:
+            # Scrapers never read half written file.
+            with open(f'{self.prometheus_path}.tmp', 'w') as f:
+                f.write(self.metrics.to_prometheus())
+            os.replace(f'{self.prometheus_path}.tmp', self.prometheus_path)
+        if self.snapshot_path:
+            with open(self.snapshot_path, 'a', encoding='utf8') as f:
+                f.write(json.dumps(
+                    {'time': time.time(), **self.metrics.to_dict()},
+                    ensure_ascii=False,
+                ) + '\n')
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.export()
+
+
+# Metrics of all crawlers in the process.
+METRICS = Metrics()
+EXPORTER: Optional[Exporter] = None
+
+
+def set_exporter(
+    prometheus_path: str = None,
+    snapshot_path: str = None,
+    interval_secs: float = 60.0,
+) -> Optional[Exporter]:
+    r'''
+    Export `METRICS` periodically. Previous exporter is closed, and nothing is
+    exported if neither path is given.
+    '''
+    global EXPORTER
+    if EXPORTER is not None:
+        EXPORTER.close()
+        EXPORTER = None
+    if prometheus_path or snapshot_path:
+        EXPORTER = Exporter(
+            metrics=METRICS,
+            prometheus_path=prometheus_path,
+            snapshot_path=snapshot_path,
+            interval_secs=interval_secs,
+        )
+    return EXPORTER
+
+
+def get_endpoint(url: str) -> str:
+    r'''
+    First path segment of `url`, e.g. `news` of
+    `https://www.cna.com.tw/news/aipl/202106150001.aspx`. Numbers are
+    replaced so that endpoints are few.
+    '''
+    segment = urlparse(url).path.strip('/').split('/', 1)[0]
+    return re.sub(r'\d+', ':id', segment) or '/'
+
+
+def get_labels(url: str) -> Dict[str, str]:
+    return {
+        'company': news.crawlers.util.get_company(url=url) or 'unknown',
+        'endpoint': get_endpoint(url=url),
+    }
+
+
+def record_request(
+    url: str,
+    response: Optional[Response],
+    seconds: float,
+) -> None:
+    r'''
+    Record request to `url`. `response` is `None` if request failed.
+    '''
+    labels = get_labels(url=url)
+    status = 'error' if response is None else str(response.status_code)
+    METRICS.inc('crawler_requests_total', {**labels, 'status': status})
+    METRICS.observe('crawler_request_seconds', labels, seconds)
+    if response is not None:
+        METRICS.inc(
+            'crawler_response_bytes_total',
+            labels,
+            len(response.content or b''),
+        )
+
+
+def record_cache_hit(url: str) -> None:
+    METRICS.inc('crawler_cache_hits_total', get_labels(url=url))
+
+
+def record_ban(company: str) -> None:
+    METRICS.inc('crawler_bans_total', {'company': company})
+
+
+def record_error(company: str, message) -> None:
+    r'''
+    Record news which failed with `message`, e.g. `err.args[0]`. Urls and
+    numbers in messages are replaced, so that each kind of error is one
+    label.
+    '''
+    message = str(message)
+    for pattern, repl in ERROR_PATTERNS:
+        message = pattern.sub(repl, message)
+    message = message[:MAX_ERROR_LENGTH]
+    METRICS.inc('crawler_errors_total', {'company': company, 'error': message})
+
+
+def get_errors(
+    company: str,
+    since: Dict[str, int] = None,
+) -> Dict[str, int]:
+    r'''
+    Number of failed news of `company` by error message. Counters are
+    cumulative for the process, so counts of earlier call `since` are
+    subtracted if given.
+    '''
+    since = since or {}
+    errors = {}
+    for key, value in METRICS.get_counter('crawler_errors_total').items():
+        key = dict(key)
+        if key['company'] != company:
+            continue
+        count = int(value) - since.get(key['error'], 0)
+        if count:
+            errors[key['error']] = count
+    return errors
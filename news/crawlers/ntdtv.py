@@ -1,11 +1,9 @@
 import re
-from collections import Counter
-from datetime import datetime
-from typing import List, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 
 import dateutil
 import dateutil.parser
-import requests
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 
@@ -20,6 +18,21 @@ URL_PATTERN = re.compile(
 )
 
 
+def get_url_datetime(url: str) -> Optional[datetime]:
+    r'''
+    Release date in news `url`, or `None` if `url` has no date.
+    '''
+    match = URL_PATTERN.match(url)
+    if not match:
+        return None
+    return datetime(
+        int(match.group(1)),
+        int(match.group(2)),
+        int(match.group(3)),
+        tzinfo=timezone.utc,
+    )
+
+
 def find_page_range(
     category: str,
     current_datetime: datetime,
@@ -31,11 +44,7 @@ def find_page_range(
     # Get max page of this category.
     try:
         url = f'https://www.ntdtv.com/b5/prog{api}/1'
-        response = requests.get(
-            url,
-            timeout=news.crawlers.util.REQUEST_TIMEOUT,
-        )
-        response.close()
+        response = news.crawlers.util.get(url=url)
 
         # Raise exception if status code is not 200.
         news.crawlers.util.check_status_code(
@@ -61,11 +70,7 @@ def find_page_range(
         page_url = f'https://www.ntdtv.com/b5/prog{api}/{page}'
 
         try:
-            response = requests.get(
-                page_url,
-                timeout=news.crawlers.util.REQUEST_TIMEOUT,
-            )
-            response.close()
+            response = news.crawlers.util.get(url=page_url)
 
             # Raise exception if status code is not 200.
             news.crawlers.util.check_status_code(
@@ -126,9 +131,14 @@ def get_news_list(
     page_range: List[int],
     *,
     debug: bool = False,
-) -> List[News]:
+) -> Tuple[List[News], bool]:
+    r'''
+    News listed in `page_range` and whether paging reached `past_datetime`,
+    or the first crawled news when crawling incrementally.
+    '''
     news_list: List[News] = []
-    logger = Counter()
+    # Counts of errors are cumulative, so only errors of this call are shown.
+    errors = news.crawlers.metrics.get_errors(company='ntdtv')
 
     iter_range = range(page_range[0], page_range[1])
     # Only show progress bar in debug mode.
@@ -144,37 +154,51 @@ def get_news_list(
         page_url = f'https://www.ntdtv.com/b5/prog{api}/{page}'
 
         try:
-            response = requests.get(
-                page_url,
-                timeout=news.crawlers.util.REQUEST_TIMEOUT,
-            )
-            response.close()
+            page_response = news.crawlers.listing.get(url=page_url)
+
+            # Skip listing page which is not changed since last crawl.
+            if page_response is None:
+                raise Exception('Listing not changed.')
 
             # Raise exception if status code is not 200.
             news.crawlers.util.check_status_code(
                 company='ntdtv',
-                response=response
+                response=page_response
             )
 
             # If `status_code == 200`, parse links in this page.
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(page_response.text, 'html.parser')
             a_tags = soup.select(
                 'div.post_list > div.list_wrapper > div.one_post div.title > a'
             )
         except Exception as err:
             if err.args:
-                logger.update([err.args[0]])
+                news.crawlers.metrics.record_error(
+                    company='ntdtv',
+                    message=err.args[0],
+                )
             continue
 
         for a_tag in a_tags:
             try:
                 news_url = a_tag['href']
 
-                response = requests.get(
-                    news_url,
-                    timeout=news.crawlers.util.REQUEST_TIMEOUT,
-                )
-                response.close()
+                # Stop crawling loop by release date in url, so that news
+                # skipped by seen filter end paging as well. Date in url is
+                # local date, which ends before the end of the same UTC day.
+                url_datetime = get_url_datetime(url=news_url)
+                if (
+                    url_datetime is not None
+                    and url_datetime + timedelta(days=1) <= past_datetime
+                ):
+                    is_datetime_valid = False
+                    break
+
+                # Skip request if news is already crawled.
+                if news.crawlers.seen.is_seen(url=news_url):
+                    raise Exception('News already crawled.')
+
+                response = news.crawlers.util.get(url=news_url)
 
                 # Raise exception if status code is not 200.
                 news.crawlers.util.check_status_code(
@@ -200,14 +224,33 @@ def get_news_list(
                 news_list.append(parsed_news)
             except Exception as err:
                 if err.args:
-                    logger.update([err.args[0]])
+                    news.crawlers.metrics.record_error(
+                        company='ntdtv',
+                        message=err.args[0],
+                    )
+
+                    # Stop paging at the first crawled news.
+                    if (
+                        err.args[0] == 'News already crawled.'
+                        and news.crawlers.listing.is_incremental()
+                    ):
+                        is_datetime_valid = False
+                        break
+
+        # Only save listing page whose news are all visited.
+        if is_datetime_valid:
+            news.crawlers.listing.save(url=page_url, response=page_response)
 
     # Only show error stats in debug mode.
     if debug:
-        for k, v in logger.items():
+        errors = news.crawlers.metrics.get_errors(
+            company='ntdtv',
+            since=errors,
+        )
+        for k, v in errors.items():
             print(f'{k}: {v}')
 
-    return news_list
+    return news_list, not is_datetime_valid
 
 
 CATEGORIES = {
@@ -234,10 +277,41 @@ def main(
         raise ValueError('Must have `past_datetime <= current_datetime`.')
 
     # Get database connection.
-    conn = news.db.util.get_conn(db_name=f'raw/{db_name}')
+    conn = news.db.util.get_conn(
+        db_name=f'raw/{db_name}',
+        profile='crawl-writer',
+    )
     cur = conn.cursor()
     news.db.create.create_table(cur=cur)
 
+    # Pages shift when news are released, so units done in previous runs are
+    # skipped only when both `current_datetime` and `past_datetime` are the
+    # same.
+    time_range = news.crawlers.frontier.get_time_range_name(
+        current_datetime=current_datetime,
+        past_datetime=past_datetime,
+    )
+
+    # Whether the last crawled unit reached `past_datetime`. Units done in
+    # previous runs are not crawled, so it stays `False` for them.
+    is_end = False
+
+    def crawl_unit(
+        category: str,
+        api: str,
+        page_range: List[int],
+    ) -> List[News]:
+        nonlocal is_end
+        news_list, is_end = get_news_list(
+            category=category,
+            current_datetime=current_datetime,
+            debug=debug,
+            api=api,
+            past_datetime=past_datetime,
+            page_range=page_range,
+        )
+        return news_list
+
     for category, api in CATEGORIES.items():
         # Find page range that consistent with specified time range.
         start_page, max_page = find_page_range(
@@ -257,23 +331,24 @@ def main(
                 page,
                 min(page + PAGE_INTERVAL, max_page),
             ]
-            news_list = get_news_list(
-                category=category,
-                current_datetime=current_datetime,
-                debug=debug,
-                api=api,
-                past_datetime=past_datetime,
-                page_range=page_range,
+            is_end = False
+            news.crawlers.frontier.run_unit(
+                conn=conn,
+                crawler='ntdtv',
+                unit=(
+                    f'{time_range}/{category}/'
+                    f'{page_range[0]}-{page_range[1]}'
+                ),
+                get_news_list=lambda: crawl_unit(
+                    category=category,
+                    api=api,
+                    page_range=page_range,
+                ),
             )
-            # When news violate `past_datetime` break for loop.
-            if not news_list:
+            # When news violate `past_datetime` break for loop. Units whose
+            # news are all crawled before do not stop paging.
+            if is_end:
                 break
-            news.db.write.write_new_records(
-                cur=cur,
-                news_list=news_list,
-            )
-
-            conn.commit()
 
     # Close database connection.
     conn.close()
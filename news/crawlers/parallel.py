@@ -0,0 +1,153 @@
+import sqlite3
+from concurrent.futures import (FIRST_COMPLETED, Future, ThreadPoolExecutor,
+                                wait)
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import news.crawlers
+import news.db
+from news.crawlers.probe import Prober
+from news.db.schema import News
+
+# `(category, date)` crawled as a whole and committed once.
+Unit = Tuple[str, datetime]
+
+
+def get_units(
+    categories: Sequence[str],
+    current_datetime: datetime,
+    past_datetime: datetime,
+) -> List[Unit]:
+    r'''
+    Split crawling range into units, category by category and from latest day
+    to oldest day, which is the order of sequential crawling.
+    '''
+    units = []
+    for category in categories:
+        date = current_datetime
+        while date >= past_datetime:
+            units.append((category, date))
+            date = date - timedelta(days=1)
+    return units
+
+
+def get_unit_name(unit: Unit) -> str:
+    return f'{unit[0]}/{unit[1].strftime("%Y%m%d")}'
+
+
+def crawl_units(
+    conn: sqlite3.Connection,
+    company: str,
+    units: Sequence[Unit],
+    get_news_list: Callable[[str, datetime, Prober], List[News]],
+    default_fail_limit: int,
+    n_workers: int = 1,
+    *,
+    debug: bool = False,
+) -> int:
+    r'''
+    Crawl `units` with `n_workers` threads. Only the calling thread touches
+    database: it learns prober of each unit, writes news of finished units and
+    commits once per unit. At most `n_workers` units are in flight, so later
+    units learn probing limits from finished ones.
+
+    Units done in previous runs are skipped by `news.crawlers.frontier`, except
+    units of days not over yet. A failed unit is recorded and its error is
+    raised after running units are finished.
+
+    `get_news_list(category, date, prober)` runs in worker threads. Return
+    number of crawled news.
+    '''
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.crawlers.frontier.create_table(cur=cur)
+    news.crawlers.probe.create_table(cur=cur)
+
+    # Units of days which are not over yet are crawled again in later runs.
+    def is_final(unit: Unit) -> bool:
+        day = unit[1].replace(hour=0, minute=0, second=0, microsecond=0)
+        return news.crawlers.frontier.is_final(end=day + timedelta(days=1))
+
+    # Resume from previous runs.
+    pending = [
+        unit for unit in reversed(units)
+        if news.crawlers.frontier.get_n_news(
+            cur=cur,
+            crawler=company,
+            unit=get_unit_name(unit),
+        ) is None
+    ]
+    n_units = len(pending)
+    error: Exception = None
+    n_done = 0
+    n_news = 0
+    running: Dict[Future, Tuple[Unit, Prober]] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, n_workers)) as executor:
+        while pending or running:
+            # Stop submitting new units after failure.
+            while not error and pending and len(running) < max(1, n_workers):
+                category, date = unit = pending.pop()
+                news.crawlers.frontier.start_unit(
+                    cur=cur,
+                    crawler=company,
+                    unit=get_unit_name(unit),
+                )
+                # Learn when to stop probing from previous days.
+                prober = news.crawlers.probe.get_prober(
+                    cur=cur,
+                    company=company,
+                    category=category,
+                    date=date.strftime('%Y%m%d'),
+                    default_fail_limit=default_fail_limit,
+                )
+                conn.commit()
+                future = executor.submit(get_news_list, category, date, prober)
+                running[future] = (unit, prober)
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                unit, prober = running.pop(future)
+                try:
+                    news_list = future.result()
+                except Exception as err:
+                    news.crawlers.frontier.fail_unit(
+                        cur=cur,
+                        crawler=company,
+                        unit=get_unit_name(unit),
+                        error=repr(err),
+                    )
+                    conn.commit()
+                    error = err
+                    continue
+
+                news.db.write.write_new_records(cur=cur, news_list=news_list)
+                news.crawlers.probe.save_prober(cur=cur, prober=prober)
+                news.crawlers.frontier.finish_unit(
+                    cur=cur,
+                    crawler=company,
+                    unit=get_unit_name(unit),
+                    n_news=len(news_list),
+                    is_final=is_final(unit),
+                )
+                conn.commit()
+                news.crawlers.seen.add_urls(urls=[n.url for n in news_list])
+
+                n_done += 1
+                n_news += len(news_list)
+
+                # Only show progress of each unit in debug mode.
+                if debug:
+                    print(
+                        f'[{n_done}/{n_units}] {company} {unit[0]} '
+                        f'{unit[1].strftime("%Y-%m-%d")}: '
+                        f'{len(news_list)} news in {prober.n_probes} probes'
+                    )
+
+    if error is not None:
+        raise error
+
+    return n_news
@@ -0,0 +1,193 @@
+import json
+import math
+import sqlite3
+import zlib
+from typing import List, Sequence
+
+# Number of most recent days used to learn probing policy.
+HISTORY_DAYS = 60
+# Use default policy until this many days are recorded.
+MIN_HISTORY_DAYS = 7
+# Learned limits are the longest gap seen in history times `GAP_MARGIN`,
+# within `[MIN_FAIL_COUNT, MAX_FAIL_FACTOR * default fail count]`.
+GAP_MARGIN = 1.5
+MIN_FAIL_COUNT = 10
+MAX_FAIL_FACTOR = 4
+# Ids above `IDX_QUANTILE` of daily max id, i.e. the expected max id of a
+# day, are the tail of a day. Only gaps seen in the tail decide when to stop
+# there, so probing stops shortly after the last news of most days.
+IDX_QUANTILE = 0.5
+# Learned limits stop probing before longer gaps, which are then never
+# recorded. One of every `EXPLORE_INTERVAL` days probes with the largest
+# limit, `MAX_FAIL_FACTOR * default fail count`, so limits grow again.
+EXPLORE_INTERVAL = 10
+
+
+class Prober:
+    r'''
+    Decide when to stop probing sequential ids of one (category, day) unit.
+
+    Probing stops after `fail_limit` consecutive misses. Beyond `dense_idx`,
+    the expected max id of a day, the smaller `tail_fail_limit` is used
+    instead.
+    '''
+
+    def __init__(
+        self,
+        company: str,
+        category: str,
+        date: str,
+        fail_limit: int,
+        tail_fail_limit: int = None,
+        dense_idx: int = None,
+    ):
+        self.company = company
+        self.category = category
+        self.date = date
+        self.fail_limit = fail_limit
+        self.tail_fail_limit = tail_fail_limit or fail_limit
+        self.dense_idx = dense_idx
+
+        self.fail_count = 0
+        self.hit_idx: List[int] = []
+        self.n_probes = 0
+
+    def is_done(self, idx: int) -> bool:
+        if self.dense_idx is not None and idx > self.dense_idx:
+            return self.fail_count >= self.tail_fail_limit
+        return self.fail_count >= self.fail_limit
+
+    def update(self, idx: int, is_hit: bool):
+        self.n_probes += 1
+        if is_hit:
+            self.fail_count = 0
+            self.hit_idx.append(idx)
+        else:
+            self.fail_count += 1
+
+
+def create_table(cur: sqlite3.Cursor):
+    # `hit_idx` is JSON list of ids which have news.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS probe_stats (
+            company TEXT,
+            category TEXT,
+            date TEXT,
+            first_idx INTEGER,
+            hit_idx TEXT,
+            n_probes INTEGER,
+            PRIMARY KEY (company, category, date)
+        );
+    """)
+
+
+def get_gaps(first_idx: int, hit_idx: Sequence[int]) -> List[int]:
+    r'''
+    Number of consecutive missing ids before each hit, counted from
+    `first_idx`.
+    '''
+    gaps = []
+    prev_idx = first_idx - 1
+    for idx in sorted(hit_idx):
+        gaps.append(idx - prev_idx - 1)
+        prev_idx = idx
+    return gaps
+
+
+def quantile(values: Sequence[int], q: float) -> int:
+    values = sorted(values)
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+def is_explore_day(date: str) -> bool:
+    r'''
+    Whether to probe with the largest limit on `date`. Days are chosen by
+    hash of date, so that every run of the same day agrees.
+    '''
+    return zlib.crc32(date.encode()) % EXPLORE_INTERVAL == 0
+
+
+def get_prober(
+    cur: sqlite3.Cursor,
+    company: str,
+    category: str,
+    date: str,
+    default_fail_limit: int,
+) -> Prober:
+    r'''
+    Learn probing policy from recorded history of `(company, category)`.
+    '''
+    history = list(cur.execute(
+        '''
+        SELECT first_idx, hit_idx FROM probe_stats
+        WHERE company = ? AND category = ? AND date != ?
+        ORDER BY date DESC
+        LIMIT ?
+        ''',
+        [company, category, date, HISTORY_DAYS],
+    ))
+
+    # Record long gaps until enough history is recorded, and on explore days.
+    if len(history) < MIN_HISTORY_DAYS or is_explore_day(date=date):
+        return Prober(
+            company=company,
+            category=category,
+            date=date,
+            fail_limit=default_fail_limit * MAX_FAIL_FACTOR,
+        )
+
+    gaps = []
+    tail_gaps = []
+    max_idx = []
+    days = []
+    for first_idx, hit_idx in history:
+        hit_idx = sorted(json.loads(hit_idx))
+        days.append((hit_idx, get_gaps(first_idx=first_idx, hit_idx=hit_idx)))
+        max_idx.append(max(hit_idx, default=first_idx))
+
+    # Expected max id of a day. Gaps before news beyond it are tail gaps.
+    expected_idx = quantile(max_idx, IDX_QUANTILE)
+    for hit_idx, day_gaps in days:
+        gaps.extend(day_gaps)
+        tail_gaps.extend(
+            gap for idx, gap in zip(hit_idx, day_gaps) if idx > expected_idx
+        )
+
+    def get_limit(gaps: Sequence[int], upper: int) -> int:
+        # Probe only the minimum if no gap is seen.
+        limit = math.ceil(max(gaps, default=0) * GAP_MARGIN) + 1
+        return min(max(limit, MIN_FAIL_COUNT), upper)
+
+    # Long gaps within usual ids are deleted news, keep probing across them.
+    fail_limit = get_limit(
+        gaps=gaps,
+        upper=default_fail_limit * MAX_FAIL_FACTOR,
+    )
+    return Prober(
+        company=company,
+        category=category,
+        date=date,
+        fail_limit=fail_limit,
+        # Beyond expected max id, most probes are wasted after the last news.
+        tail_fail_limit=get_limit(gaps=tail_gaps, upper=fail_limit),
+        dense_idx=expected_idx,
+    )
+
+
+def save_prober(cur: sqlite3.Cursor, prober: Prober, first_idx: int = 0):
+    cur.execute(
+        '''
+        INSERT OR REPLACE INTO probe_stats(
+            company, category, date, first_idx, hit_idx, n_probes
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''',
+        [
+            prober.company,
+            prober.category,
+            prober.date,
+            first_idx,
+            json.dumps(prober.hit_idx),
+            prober.n_probes,
+        ],
+    )
@@ -0,0 +1,180 @@
+import hashlib
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+from typing import Iterable, List, Optional, Sequence
+
+import news.db
+
+# Bloom filter file starts with number of bits and number of hash functions.
+HEADER_FORMAT = '<QQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+# Default filter takes about 18 MiB.
+DEFAULT_CAPACITY = 10_000_000
+DEFAULT_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    r'''
+    Bloom filter of urls stored in a memory mapped file, so that crawler
+    processes sharing the same file see urls added by each other. Concurrent
+    additions may rarely lose a bit, which only causes a false negative, i.e.
+    one more request.
+    '''
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ):
+        # Whether filter is created instead of loaded from `path`.
+        self.is_new = not os.path.exists(path)
+        if self.is_new:
+            n_bits = math.ceil(
+                -capacity * math.log(error_rate) / math.log(2) ** 2
+            )
+            n_hashes = max(1, round(n_bits / capacity * math.log(2)))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as bloom_file:
+                bloom_file.write(struct.pack(HEADER_FORMAT, n_bits, n_hashes))
+                bloom_file.truncate(HEADER_SIZE + (n_bits + 7) // 8)
+
+        with open(path, 'r+b') as bloom_file:
+            self.mm = mmap.mmap(bloom_file.fileno(), 0)
+        self.n_bits, self.n_hashes = struct.unpack_from(
+            HEADER_FORMAT,
+            self.mm,
+        )
+
+    def get_positions(self, url: str) -> List[int]:
+        # Double hashing with two 64 bits hashes.
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+
+    def add(self, url: str):
+        for pos in self.get_positions(url):
+            idx = HEADER_SIZE + pos // 8
+            self.mm[idx] = self.mm[idx] | (1 << (pos % 8))
+
+    def __contains__(self, url: str) -> bool:
+        return all(
+            self.mm[HEADER_SIZE + pos // 8] & (1 << (pos % 8))
+            for pos in self.get_positions(url)
+        )
+
+    def close(self):
+        self.mm.close()
+
+
+class SeenSet:
+    r'''
+    Urls already stored in any of `db_names`. Bloom filter answers most
+    lookups without touching databases, and positives are confirmed by exact
+    lookup in databases. Safe to share between crawler threads.
+    '''
+
+    def __init__(
+        self,
+        bloom_name: str,
+        db_names: Sequence[str],
+        capacity: int = DEFAULT_CAPACITY,
+    ):
+        self.bloom = BloomFilter(
+            path=news.db.util.get_path(bloom_name),
+            capacity=capacity,
+        )
+        self.lock = threading.Lock()
+        self.conns: List[sqlite3.Connection] = []
+        for db_name in db_names:
+            conn = sqlite3.connect(
+                news.db.util.get_path(db_name),
+                check_same_thread=False,
+            )
+            news.db.create.create_table(cur=conn.cursor())
+            conn.commit()
+            news.db.util.set_profile(conn=conn, profile='read-only-scan')
+            self.conns.append(conn)
+
+    def populate(self) -> int:
+        r'''
+        Add all urls in databases. Return number of added urls.
+        '''
+        n_urls = 0
+        for conn in self.conns:
+            # Urls of sharded database are kept in `news_shard`.
+            table = 'news'
+            if news.db.shard.has_shard_table(cur=conn.cursor()):
+                table = 'news_shard'
+            for (url,) in conn.execute(f'SELECT url FROM {table}'):
+                self.bloom.add(url)
+                n_urls += 1
+        return n_urls
+
+    def add(self, urls: Iterable[str]):
+        with self.lock:
+            for url in urls:
+                self.bloom.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        with self.lock:
+            if url not in self.bloom:
+                return False
+            for conn in self.conns:
+                if news.db.write.get_existed_url(
+                    cur=conn.cursor(),
+                    urls=[url],
+                ):
+                    return True
+            return False
+
+    def close(self):
+        with self.lock:
+            self.bloom.close()
+            for conn in self.conns:
+                conn.close()
+
+
+# Seen set used by crawlers. `None` means every url is requested.
+SEEN: Optional[SeenSet] = None
+
+
+def set_seen(
+    bloom_name: str = None,
+    db_names: Sequence[str] = (),
+    *,
+    populate: bool = False,
+) -> int:
+    r'''
+    Skip requesting news stored in `data/{db_names}` for all crawlers. Bloom
+    filter is stored in `data/{bloom_name}` and shared by processes using the
+    same name. Urls in databases are added when filter is created or
+    `populate` is set. Turn off if `bloom_name` is `None`. Return number of
+    added urls.
+    '''
+    global SEEN
+
+    if SEEN is not None:
+        SEEN.close()
+        SEEN = None
+
+    if bloom_name is None:
+        return 0
+
+    SEEN = SeenSet(bloom_name=bloom_name, db_names=db_names)
+    if populate or SEEN.bloom.is_new:
+        return SEEN.populate()
+    return 0
+
+
+def is_seen(url: str) -> bool:
+    return SEEN is not None and url in SEEN
+
+
+def add_urls(urls: Iterable[str]):
+    if SEEN is not None:
+        SEEN.add(urls)
@@ -1,15 +1,33 @@
-from collections import Counter
+from datetime import datetime
 from typing import List
 
-import requests
 from tqdm import tqdm
 
 import news.crawlers
 from news.db.schema import News
 
+# Smallest available article id.
+FIRST_IDX = 1
 RECORD_PER_COMMIT = 1000
 
 
+def get_news(idx: int) -> News:
+    url = f'https://www.setn.com/News.aspx?NewsID={idx}'
+
+    response = news.crawlers.util.get(url=url)
+
+    # Raise exception if status code is not 200.
+    news.crawlers.util.check_status_code(
+        company='setn',
+        response=response
+    )
+
+    return news.preprocess.setn.parse(ori_news=News(
+        raw_xml=response.text,
+        url=url,
+    ))
+
+
 def get_news_list(
     first_idx: int,
     latest_idx: int,
@@ -17,7 +35,8 @@ def get_news_list(
     debug: bool = True,
 ) -> List[News]:
     news_list: List[News] = []
-    logger = Counter()
+    # Counts of errors are cumulative, so only errors of this call are shown.
+    errors = news.crawlers.metrics.get_errors(company='setn')
 
     iter_range = range(first_idx, latest_idx)
     # Only show progress bar in debug mode.
@@ -25,34 +44,22 @@ def get_news_list(
         iter_range = tqdm(iter_range)
 
     for idx in iter_range:
-        url = f'https://www.setn.com/News.aspx?NewsID={idx}'
-
         try:
-            response = requests.get(
-                url,
-                timeout=news.crawlers.util.REQUEST_TIMEOUT,
-            )
-            response.close()
-
-            # Raise exception if status code is not 200.
-            news.crawlers.util.check_status_code(
-                company='setn',
-                response=response
-            )
-
-            parsed_news = news.preprocess.setn.parse(ori_news=News(
-                raw_xml=response.text,
-                url=url,
-            ))
-
-            news_list.append(parsed_news)
+            news_list.append(get_news(idx=idx))
         except Exception as err:
             if err.args:
-                logger.update([err.args[0]])
+                news.crawlers.metrics.record_error(
+                    company='setn',
+                    message=err.args[0],
+                )
 
     # Only show error stats in debug mode.
     if debug:
-        for k, v in logger.items():
+        errors = news.crawlers.metrics.get_errors(
+            company='setn',
+            since=errors,
+        )
+        for k, v in errors.items():
             print(f'{k}: {v}')
 
     return news_list
@@ -62,6 +69,7 @@ def main(
     db_name: str,
     first_idx: int,
     latest_idx: int,
+    past_datetime: datetime,
     *,
     debug: bool = False,
 ):
@@ -70,30 +78,52 @@ def main(
             'Must have `first_idx <= latest_idx` or `latest_idx == -1`'
         )
 
+    # Find the current maximum article id.
+    if latest_idx == -1:
+        latest_idx = news.crawlers.id_search.find_latest_idx(
+            get_news=get_news,
+            first_idx=max(first_idx, FIRST_IDX),
+            debug=debug,
+        )
+
+    # Find the first article id released after `past_datetime`.
+    if first_idx == -1:
+        first_idx = news.crawlers.id_search.find_idx_by_datetime(
+            get_news=get_news,
+            target_datetime=past_datetime,
+            first_idx=FIRST_IDX,
+            latest_idx=latest_idx,
+            debug=debug,
+        )
+
     # Get database connection.
-    conn = news.db.util.get_conn(db_name=f'raw/{db_name}')
+    conn = news.db.util.get_conn(
+        db_name=f'raw/{db_name}',
+        profile='crawl-writer',
+    )
     cur = conn.cursor()
     news.db.create.create_table(cur=cur)
 
-    while first_idx <= latest_idx or latest_idx == -1:
+    while first_idx <= latest_idx:
         cur_latest_idx = first_idx + RECORD_PER_COMMIT
-        if latest_idx != -1:
-            cur_latest_idx = min(cur_latest_idx, latest_idx)
-
-        news_list = get_news_list(
-            debug=debug,
-            first_idx=first_idx,
-            latest_idx=cur_latest_idx,
+        cur_latest_idx = min(cur_latest_idx, latest_idx)
+
+        # Make range inclusive.
+        if cur_latest_idx == latest_idx:
+            cur_latest_idx += 1
+
+        # Range may contain only dead ids. Skip ranges done in previous runs.
+        news.crawlers.frontier.run_unit(
+            conn=conn,
+            crawler='setn',
+            unit=f'{first_idx}-{cur_latest_idx}',
+            get_news_list=lambda: get_news_list(
+                debug=debug,
+                first_idx=first_idx,
+                latest_idx=cur_latest_idx,
+            ),
         )
 
-        if not news_list:
-            # No more news to crawl.
-            break
-
-        news.db.write.write_new_records(cur=cur, news_list=news_list)
-
-        conn.commit()
-
         first_idx += RECORD_PER_COMMIT
 
     # Close database connection.
@@ -1,8 +1,6 @@
 import re
-from collections import Counter
 from typing import List
 
-import requests
 from tqdm import tqdm
 
 import news.crawlers
@@ -36,7 +34,8 @@ def get_news_list(
     debug: bool = True,
 ) -> List[News]:
     news_list: List[News] = []
-    logger = Counter()
+    # Counts of errors are cumulative, so only errors of this call are shown.
+    errors = news.crawlers.metrics.get_errors(company='tvbs')
 
     # Only show progress bar in debug mode.
     iter_range = range(latest_idx, first_idx, -1)
@@ -48,11 +47,7 @@ def get_news_list(
     for idx in iter_range:
         url = f'https://news.tvbs.com.tw/news/LoadMoreOverview?limit=100&offset=0&cateid={category_id}&cate={category}&newsid={idx}'
         try:
-            response = requests.get(
-                url,
-                timeout=news.crawlers.util.REQUEST_TIMEOUT,
-            )
-            response.close()
+            response = news.crawlers.util.get(url=url)
 
             # Raise exception if status code is not 200.
             news.crawlers.util.check_status_code(
@@ -67,7 +62,10 @@ def get_news_list(
                 break
         except Exception as err:
             if err.args:
-                logger.update([err.args[0]])
+                news.crawlers.metrics.record_error(
+                    company='tvbs',
+                    message=err.args[0],
+                )
 
     # No news were found.
     if not data_obj or not data_obj['newsid'] or not data_obj['news_id_list']:
@@ -96,11 +94,7 @@ def get_news_list(
         url = f'https://news.tvbs.com.tw/news/LoadMoreOverview?limit=100&offset=0&cateid={category_id}&cate={category}&newsid={next_idx}'
 
         try:
-            response = requests.get(
-                url,
-                timeout=news.crawlers.util.REQUEST_TIMEOUT,
-            )
-            response.close()
+            response = news.crawlers.util.get(url=url)
 
             # Raise exception if status code is not 200.
             news.crawlers.util.check_status_code(
@@ -136,7 +130,10 @@ def get_news_list(
             news_idx_list.extend(list(next_news_idx_list))
         except Exception as err:
             if err.args:
-                logger.update([err.args[0]])
+                news.crawlers.metrics.record_error(
+                    company='tvbs',
+                    message=err.args[0],
+                )
 
         if debug:
             iter_range.update()
@@ -152,11 +149,11 @@ def get_news_list(
         url = f'https://news.tvbs.com.tw/{category}/{idx}'
 
         try:
-            response = requests.get(
-                url,
-                timeout=news.crawlers.util.REQUEST_TIMEOUT,
-            )
-            response.close()
+            # Skip request if news is already crawled.
+            if news.crawlers.seen.is_seen(url=url):
+                raise Exception('News already crawled.')
+
+            response = news.crawlers.util.get(url=url)
 
             # Raise exception if status code is not 200.
             news.crawlers.util.check_status_code(
@@ -172,11 +169,18 @@ def get_news_list(
             news_list.append(parsed_news)
         except Exception as err:
             if err.args:
-                logger.update([err.args[0]])
+                news.crawlers.metrics.record_error(
+                    company='tvbs',
+                    message=err.args[0],
+                )
 
     # Only show error stats in debug mode.
     if debug:
-        for k, v in logger.items():
+        errors = news.crawlers.metrics.get_errors(
+            company='tvbs',
+            since=errors,
+        )
+        for k, v in errors.items():
             print(f'{k}: {v}')
 
     return news_list
@@ -189,11 +193,16 @@ def main(
     *,
     debug: bool = False,
 ):
+    if first_idx == -1 or latest_idx == -1:
+        raise ValueError('Must specify both `first_idx` and `latest_idx`.')
     if first_idx > latest_idx:
         raise ValueError('Must have `first_idx <= latest_idx`.')
 
     # Get database connection.
-    conn = news.db.util.get_conn(db_name=f'raw/{db_name}')
+    conn = news.db.util.get_conn(
+        db_name=f'raw/{db_name}',
+        profile='crawl-writer',
+    )
     cur = conn.cursor()
     news.db.create.create_table(cur=cur)
 
@@ -205,20 +214,25 @@ def main(
         if cur_first_idx == first_idx:
             cur_first_idx -= 1
 
-        news_list = []
-
-        for category, category_id in CATEGORIES.items():
-            news_list.extend(get_news_list(
-                category=category,
-                category_id=category_id,
-                debug=debug,
-                first_idx=cur_first_idx,
-                latest_idx=latest_idx,
-            ))
-
-        news.db.write.write_new_records(cur=cur, news_list=news_list)
-
-        conn.commit()
+        def get_all_news_list() -> List[News]:
+            news_list = []
+            for category, category_id in CATEGORIES.items():
+                news_list.extend(get_news_list(
+                    category=category,
+                    category_id=category_id,
+                    debug=debug,
+                    first_idx=cur_first_idx,
+                    latest_idx=latest_idx,
+                ))
+            return news_list
+
+        # Skip ranges done in previous runs.
+        news.crawlers.frontier.run_unit(
+            conn=conn,
+            crawler='tvbs',
+            unit=f'{cur_first_idx}-{latest_idx}',
+            get_news_list=get_all_news_list,
+        )
 
         latest_idx -= RECORD_PER_COMMIT
 
@@ -1,9 +1,7 @@
-from collections import Counter
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Tuple
 
 import dateutil.parser
-import requests
 from tqdm import tqdm
 
 import news.crawlers
@@ -21,9 +19,16 @@ def get_news_list(
     page_range: List[int],
     *,
     debug: bool = False,
-) -> List[News]:
+) -> Tuple[List[News], bool]:
+    r'''
+    News listed in `page_range` of all channels and whether paging of every
+    channel reached `past_datetime` (or the first crawled news when crawling
+    incrementally) or the end of its listing.
+    '''
     news_list: List[News] = []
-    logger = Counter()
+    # Counts of errors are cumulative, so only errors of this call are shown.
+    errors = news.crawlers.metrics.get_errors(company='udn')
+    n_ended = 0
 
     for channelId in [1, 2]:
         # Only show progress bar in debug mode.
@@ -32,30 +37,43 @@ def get_news_list(
             iter_range = tqdm(iter_range)
 
         time_constraint_violated = False
+        is_listing_end = False
         for page in iter_range:
             if time_constraint_violated:
                 break
 
-            url = f'https://udn.com/api/more?page={page}&channelId={channelId}&type=cate_latest_news&totalRecNo=100'
+            page_url = (
+                f'https://udn.com/api/more?page={page}&channelId={channelId}'
+                '&type=cate_latest_news&totalRecNo=100'
+            )
             try:
-                response = requests.get(
-                    url,
-                    timeout=news.crawlers.util.REQUEST_TIMEOUT,
-                )
-                response.close()
+                page_response = news.crawlers.listing.get(url=page_url)
+
+                # Skip listing page which is not changed since last crawl.
+                if page_response is None:
+                    news.crawlers.metrics.record_error(
+                        company='udn',
+                        message='Listing not changed.',
+                    )
+                    continue
 
                 # Raise exception if status code is not 200.
                 news.crawlers.util.check_status_code(
                     company='udn',
-                    response=response
+                    response=page_response
                 )
             except Exception as err:
                 if err.args:
-                    logger.update([err.args[0]])
+                    news.crawlers.metrics.record_error(
+                        company='udn',
+                        message=err.args[0],
+                    )
+                is_listing_end = True
                 break
 
-            data_lists = response.json()
+            data_lists = page_response.json()
             if 'lists' not in data_lists or not data_lists['lists']:
+                is_listing_end = True
                 break
 
             for data_obj in data_lists['lists']:
@@ -73,11 +91,11 @@ def get_news_list(
                     url = data_obj["titleLink"].split("?")[0]
                     url = f'https://udn.com{url}'
 
-                    response = requests.get(
-                        url,
-                        timeout=news.crawlers.util.REQUEST_TIMEOUT,
-                    )
-                    response.close()
+                    # Skip request if news is already crawled.
+                    if news.crawlers.seen.is_seen(url=url):
+                        raise Exception('News already crawled.')
+
+                    response = news.crawlers.util.get(url=url)
 
                     # Raise exception if status code is not 200.
                     news.crawlers.util.check_status_code(
@@ -91,18 +109,43 @@ def get_news_list(
                     news_list.append(parsed_news)
                 except Exception as err:
                     if err.args:
-                        logger.update([err.args[0]])
+                        news.crawlers.metrics.record_error(
+                            company='udn',
+                            message=err.args[0],
+                        )
 
                         if err.args[0] == 'Time constraint violated.':
                             time_constraint_violated = True
                             break
 
+                        # Stop paging at the first crawled news.
+                        if (
+                            err.args[0] == 'News already crawled.'
+                            and news.crawlers.listing.is_incremental()
+                        ):
+                            time_constraint_violated = True
+                            break
+
+            # Only save listing page whose news are all visited.
+            if not time_constraint_violated:
+                news.crawlers.listing.save(
+                    url=page_url,
+                    response=page_response,
+                )
+
+        if time_constraint_violated or is_listing_end:
+            n_ended += 1
+
     # Only show error stats in debug mode.
     if debug:
-        for k, v in logger.items():
+        errors = news.crawlers.metrics.get_errors(
+            company='udn',
+            since=errors,
+        )
+        for k, v in errors.items():
             print(f'{k}: {v}')
 
-    return news_list
+    return news_list, n_ended == 2
 
 
 def main(
@@ -116,31 +159,52 @@ def main(
         raise ValueError('Must have `past_datetime <= current_datetime`.')
 
     # Get database connection.
-    conn = news.db.util.get_conn(db_name=f'raw/{db_name}')
+    conn = news.db.util.get_conn(
+        db_name=f'raw/{db_name}',
+        profile='crawl-writer',
+    )
     cur = conn.cursor()
     news.db.create.create_table(cur=cur)
 
+    # Pages shift when news are released, so units done in previous runs are
+    # skipped only when both `current_datetime` and `past_datetime` are the
+    # same.
+    time_range = news.crawlers.frontier.get_time_range_name(
+        current_datetime=current_datetime,
+        past_datetime=past_datetime,
+    )
+
+    # Whether the last crawled unit reached `past_datetime`. Units done in
+    # previous runs are not crawled, so it stays `False` for them.
+    is_end = False
+
+    def crawl_unit(page_range: List[int]) -> List[News]:
+        nonlocal is_end
+        news_list, is_end = get_news_list(
+            current_datetime=current_datetime,
+            debug=debug,
+            page_range=page_range,
+            past_datetime=past_datetime,
+        )
+        return news_list
+
     # Commit database when crawling 10 pages.
     for page in range(0, MAX_PAGE, PAGE_INTERVAL):
         page_range = [
             page,
             min(page + PAGE_INTERVAL, MAX_PAGE),
         ]
-        news_list = get_news_list(
-            current_datetime=current_datetime,
-            debug=debug,
-            page_range=page_range,
-            past_datetime=past_datetime,
+        is_end = False
+        news.crawlers.frontier.run_unit(
+            conn=conn,
+            crawler='udn',
+            unit=f'{time_range}/{page_range[0]}-{page_range[1]}',
+            get_news_list=lambda: crawl_unit(page_range=page_range),
         )
-        # When news violate `past_datetime` break for loop.
-        if not news_list:
+        # When news violate `past_datetime` break for loop. Units whose news
+        # are all crawled before do not stop paging.
+        if is_end:
             break
-        news.db.write.write_new_records(
-            cur=cur,
-            news_list=news_list,
-        )
-
-        conn.commit()
 
     # Close database connection.
     conn.close()
@@ -1,7 +1,15 @@
 import random
+import threading
 import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
 
+import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
+
+import news.crawlers.cache
+import news.crawlers.metrics
 
 # Times (in seconds) to sleep for each request. Set to 0 if the website is not
 # blocking us. Note that LTN, SET, ftv, storm, TVBS use cloudfront services.
@@ -44,9 +52,37 @@ AFTER_BANNED_SLEEP_SECS = {
     'udn': 86400.0,
 }
 REQUEST_TIMEOUT = 60
+# Domain of each company. Requests to subdomains belong to the same company.
+DOMAINS = {
+    'chinatimes': 'chinatimes.com',
+    'cna': 'cna.com.tw',
+    'epochtimes': 'epochtimes.com',
+    'ettoday': 'ettoday.net',
+    'ftv': 'ftvnews.com.tw',
+    'ltn': 'ltn.com.tw',
+    'ntdtv': 'ntdtv.com',
+    'setn': 'setn.com',
+    'storm': 'storm.mg',
+    'tvbs': 'tvbs.com.tw',
+    'udn': 'udn.com',
+}
+# Maximum number of requests per second sent to each company, shared by all
+# crawler threads. Companies not listed are not limited.
+MAX_REQUESTS_PER_SEC: Dict[str, float] = {}
+# Earliest time (from `time.monotonic`) of next request to each company.
+NEXT_REQUEST_TIME: Dict[str, float] = {}
+RATE_LOCK = threading.Lock()
+# Connections are kept alive and shared by all crawlers in the process.
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+# Send requests to `{BASE_URL}/{url}` instead of `url` when set, e.g. local
+# mock server used by benchmarks.
+BASE_URL: str = None
 
 
 def after_banned_sleep(company: str) -> None:
+    news.crawlers.metrics.record_ban(company=company)
     secs = AFTER_BANNED_SLEEP_SECS[company]
     if secs != 0.0:
         rand_secs = random.gauss(mu=1, sigma=2)
@@ -54,6 +90,13 @@ def after_banned_sleep(company: str) -> None:
         while rand_secs < 0:
             rand_secs = random.gauss(mu=1, sigma=2)
         secs += rand_secs
+
+        # Other threads requesting the same company cool down as well.
+        with RATE_LOCK:
+            NEXT_REQUEST_TIME[company] = max(
+                NEXT_REQUEST_TIME.get(company, 0.0),
+                time.monotonic() + secs,
+            )
         time.sleep(secs)
 
 
@@ -68,6 +111,33 @@ def before_banned_sleep(company: str) -> None:
         time.sleep(secs)
 
 
+def get_company(url: str) -> Optional[str]:
+    host = urlparse(url).hostname or ''
+    for company, domain in DOMAINS.items():
+        if host == domain or host.endswith(f'.{domain}'):
+            return company
+    return None
+
+
+def wait_rate_limit(url: str) -> None:
+    r'''
+    Sleep until company of `url` is not cooling down after banned and request
+    to `url` is within `MAX_REQUESTS_PER_SEC` of its company.
+    '''
+    company = get_company(url=url)
+    if company is None:
+        return
+
+    with RATE_LOCK:
+        now = time.monotonic()
+        request_time = max(now, NEXT_REQUEST_TIME.get(company, now))
+        if company in MAX_REQUESTS_PER_SEC:
+            NEXT_REQUEST_TIME[company] = (
+                request_time + 1 / MAX_REQUESTS_PER_SEC[company]
+            )
+    time.sleep(request_time - now)
+
+
 def check_status_code(company: str, response: Response) -> None:
     # Got banned.
     if response.status_code == 403:
@@ -92,3 +162,56 @@ def check_status_code(company: str, response: Response) -> None:
 
     # Do nothing when status code 200.
     return
+
+
+def get(url: str, headers: Dict[str, str] = None) -> Response:
+    r'''
+    Send GET request to `url`. Responses are replayed from and stored into
+    `news.crawlers.cache.CACHE` according to its mode. Only responses of
+    `news.crawlers.cache.STATUS_CODES` are stored, e.g. not `304` responses
+    of conditional requests nor bans. Requests are recorded in
+    `news.crawlers.metrics.METRICS`.
+    '''
+    cache = news.crawlers.cache.CACHE
+
+    if cache is not None and cache.mode in ['read', 'replay']:
+        response = cache.load(url=url)
+        if response is not None:
+            news.crawlers.metrics.record_cache_hit(url=url)
+            return response
+        if cache.mode == 'replay':
+            raise Exception('Response not cached.')
+
+    wait_rate_limit(url=url)
+
+    request_url = url
+    if BASE_URL is not None:
+        request_url = f'{BASE_URL}/{url}'
+    start = time.perf_counter()
+    try:
+        response = SESSION.get(
+            request_url,
+            headers=headers,
+            timeout=REQUEST_TIMEOUT,
+        )
+    except Exception:
+        news.crawlers.metrics.record_request(
+            url=url,
+            response=None,
+            seconds=time.perf_counter() - start,
+        )
+        raise
+    response.close()
+    news.crawlers.metrics.record_request(
+        url=url,
+        response=response,
+        seconds=time.perf_counter() - start,
+    )
+
+    if (
+        cache is not None
+        and response.status_code in news.crawlers.cache.STATUS_CODES
+    ):
+        cache.store(url=url, response=response)
+
+    return response
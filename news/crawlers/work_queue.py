@@ -0,0 +1,436 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import xmlrpc.client
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from xmlrpc.server import SimpleXMLRPCServer
+
+import news.crawlers
+import news.db
+from news.crawlers.frontier import DONE, FAILED, PENDING, RUNNING
+
+# `(unit, params)` where `params` are passed to crawler `main`.
+Unit = Tuple[str, Dict[str, Any]]
+# Params holding datetime, sent as ISO 8601 strings.
+DATETIME_PARAMS = ['current_datetime', 'past_datetime']
+# Methods served to workers. Others, e.g. `put` and `reset`, are only called
+# on the node holding the queue database.
+WORKER_METHODS = ['lease', 'heartbeat', 'complete', 'fail']
+
+
+class WorkQueue:
+    r'''
+    Units of work shared by crawler workers, stored in SQLite. A worker leases
+    a unit for `lease_secs` and keeps it by heartbeat. Units whose lease
+    expires (e.g. worker died) are leased again, up to `max_attempts` times.
+
+    Methods only take and return plain values, so that the queue can be
+    served to workers on other nodes by `get_server`.
+    '''
+
+    def __init__(
+        self,
+        db_name: str,
+        lease_secs: float = 600.0,
+        max_attempts: int = 3,
+    ):
+        self.lease_secs = lease_secs
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+
+        db_path = news.db.util.get_path(db_name)
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Transactions are started explicitly, and wait for other processes
+        # sharing the same file.
+        self.conn = sqlite3.connect(
+            db_path,
+            timeout=60,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        news.db.util.set_profile(conn=self.conn, profile='crawl-writer')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS work_unit (
+                queue TEXT,
+                unit TEXT,
+                params TEXT,
+                status TEXT,
+                worker TEXT,
+                lease_expires_at REAL,
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (queue, unit)
+            );
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS work_unit_status_index
+            ON work_unit (queue, status);
+        """)
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.conn.cursor()
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    def put(self, queue: str, units: Sequence[Unit]) -> int:
+        r'''
+        Add `units` to `queue`. Existing units are kept as is. Return number
+        of added units.
+        '''
+        with self.transaction() as cur:
+            n_units = 0
+            for unit, params in units:
+                cur.execute(
+                    '''
+                    INSERT OR IGNORE INTO work_unit(
+                        queue, unit, params, status, updated_at
+                    )
+                    VALUES (?, ?, ?, ?, ?)
+                    ''',
+                    [
+                        queue,
+                        unit,
+                        json.dumps(params),
+                        PENDING,
+                        news.crawlers.frontier.now(),
+                    ],
+                )
+                n_units += cur.rowcount
+        return n_units
+
+    def lease(self, queue: str, worker: str) -> Optional[Dict[str, Any]]:
+        r'''
+        Lease a pending unit or a unit whose lease expired to `worker`.
+        Return `{'unit': ..., 'params': ..., 'attempts': ...}` or `None` if
+        no unit is available.
+        '''
+        with self.transaction() as cur:
+            now = time.time()
+            # Give up units which keep killing workers.
+            cur.execute(
+                '''
+                UPDATE work_unit
+                SET status = ?, last_error = 'Lease expired.', updated_at = ?
+                WHERE queue = ? AND status = ? AND lease_expires_at < ?
+                    AND attempts >= ?
+                ''',
+                [
+                    FAILED,
+                    news.crawlers.frontier.now(),
+                    queue,
+                    RUNNING,
+                    now,
+                    self.max_attempts,
+                ],
+            )
+            rows = list(cur.execute(
+                '''
+                SELECT unit, params, attempts FROM work_unit
+                WHERE queue = ? AND (
+                    status = ?
+                    OR (status = ? AND lease_expires_at < ?)
+                )
+                ORDER BY rowid
+                LIMIT 1
+                ''',
+                [queue, PENDING, RUNNING, now],
+            ))
+            if not rows:
+                return None
+
+            unit, params, attempts = rows[0]
+            cur.execute(
+                '''
+                UPDATE work_unit
+                SET status = ?, worker = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE queue = ? AND unit = ?
+                ''',
+                [
+                    RUNNING,
+                    worker,
+                    now + self.lease_secs,
+                    news.crawlers.frontier.now(),
+                    queue,
+                    unit,
+                ],
+            )
+        return {
+            'unit': unit,
+            'params': json.loads(params),
+            'attempts': attempts + 1,
+        }
+
+    def update_lease(
+        self,
+        queue: str,
+        unit: str,
+        worker: str,
+        status: str,
+        error: str = None,
+    ) -> bool:
+        r'''
+        Update `unit` leased by `worker`. Return `False` if the lease was
+        lost, e.g. expired and leased by another worker.
+        '''
+        lease_expires_at = None
+        if status == RUNNING:
+            lease_expires_at = time.time() + self.lease_secs
+
+        with self.transaction() as cur:
+            cur.execute(
+                '''
+                UPDATE work_unit
+                SET status = ?, lease_expires_at = ?, last_error = ?,
+                    updated_at = ?
+                WHERE queue = ? AND unit = ? AND worker = ? AND status = ?
+                ''',
+                [
+                    status,
+                    lease_expires_at,
+                    error,
+                    news.crawlers.frontier.now(),
+                    queue,
+                    unit,
+                    worker,
+                    RUNNING,
+                ],
+            )
+            return cur.rowcount == 1
+
+    def heartbeat(self, queue: str, unit: str, worker: str) -> bool:
+        return self.update_lease(
+            queue=queue,
+            unit=unit,
+            worker=worker,
+            status=RUNNING,
+        )
+
+    def complete(self, queue: str, unit: str, worker: str) -> bool:
+        return self.update_lease(
+            queue=queue,
+            unit=unit,
+            worker=worker,
+            status=DONE,
+        )
+
+    def fail(self, queue: str, unit: str, worker: str, error: str) -> bool:
+        r'''
+        Release failed `unit`. It is retried until it fails `max_attempts`
+        times.
+        '''
+        # Attempts are read in the same transaction, since the unit may be
+        # leased again by another worker once its lease expires.
+        with self.transaction() as cur:
+            cur.execute(
+                '''
+                UPDATE work_unit
+                SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                    lease_expires_at = NULL, last_error = ?, updated_at = ?
+                WHERE queue = ? AND unit = ? AND worker = ? AND status = ?
+                ''',
+                [
+                    self.max_attempts,
+                    FAILED,
+                    PENDING,
+                    error,
+                    news.crawlers.frontier.now(),
+                    queue,
+                    unit,
+                    worker,
+                    RUNNING,
+                ],
+            )
+            return cur.rowcount == 1
+
+    def reset(self, queue: str, status: str = FAILED) -> int:
+        r'''
+        Mark units with `status` as pending with attempts cleared. Return
+        number of reset units.
+        '''
+        with self.transaction() as cur:
+            cur.execute(
+                '''
+                UPDATE work_unit
+                SET status = ?, attempts = 0, updated_at = ?
+                WHERE queue = ? AND status = ?
+                ''',
+                [PENDING, news.crawlers.frontier.now(), queue, status],
+            )
+            return cur.rowcount
+
+    def get_summary(self) -> Dict[str, Dict[str, int]]:
+        r'''
+        Number of units of each queue in each status.
+        '''
+        summary: Dict[str, Dict[str, int]] = {}
+        with self.lock:
+            for queue, status, count in self.conn.execute('''
+                SELECT queue, status, COUNT(*) FROM work_unit
+                GROUP BY queue, status
+            '''):
+                summary.setdefault(queue, {})[status] = count
+        return summary
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def get_id_units(
+    first_idx: int,
+    latest_idx: int,
+    unit_size: int,
+) -> List[Unit]:
+    r'''
+    Split ids in `[first_idx, latest_idx]` into ranges of `unit_size` ids.
+    '''
+    units = []
+    for idx in range(first_idx, latest_idx + 1, unit_size):
+        last_idx = min(idx + unit_size - 1, latest_idx)
+        units.append((
+            f'{idx}-{last_idx}',
+            {'first_idx': idx, 'latest_idx': last_idx},
+        ))
+    return units
+
+
+def get_day_units(
+    current_datetime: datetime,
+    past_datetime: datetime,
+) -> List[Unit]:
+    r'''
+    Split time range into days, from latest day to oldest day.
+    '''
+    units = []
+    day = current_datetime.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day + timedelta(days=1) > past_datetime:
+        end = min(day + timedelta(days=1, microseconds=-1), current_datetime)
+        units.append((
+            day.strftime('%Y%m%d'),
+            {
+                'current_datetime': end.isoformat(),
+                'past_datetime': max(day, past_datetime).isoformat(),
+            },
+        ))
+        day -= timedelta(days=1)
+    return units
+
+
+def get_work_queue(broker: str):
+    r'''
+    Connect to work queue served at `broker` url (e.g. `http://host:8000`),
+    or open work queue stored in `data/{broker}`.
+    '''
+    if broker.startswith('http://') or broker.startswith('https://'):
+        return xmlrpc.client.ServerProxy(broker, allow_none=True)
+    return WorkQueue(db_name=broker)
+
+
+def get_server(
+    work_queue: WorkQueue,
+    host: str = '127.0.0.1',
+    port: int = 0,
+) -> SimpleXMLRPCServer:
+    r'''
+    XML-RPC server of `work_queue` for workers on other nodes. Requests are
+    handled one by one. Use port `0` to pick a free port.
+
+    Only `WORKER_METHODS` are served and requests are not authenticated, so
+    `host` should be an address of a private network.
+    '''
+    server = SimpleXMLRPCServer(
+        (host, port),
+        allow_none=True,
+        logRequests=False,
+    )
+    for name in WORKER_METHODS:
+        server.register_function(getattr(work_queue, name), name)
+    return server
+
+
+def run_worker(
+    broker: str,
+    queue: str,
+    worker: str,
+    func: Callable[..., None],
+    db_name: str,
+    heartbeat_secs: float = 60.0,
+    *,
+    debug: bool = False,
+) -> int:
+    r'''
+    Lease units of `queue` and crawl them with `func` (`main` of crawler
+    module) into `data/raw/{db_name}` until the queue is drained. Leases are
+    renewed by another thread every `heartbeat_secs`. Return number of
+    completed units.
+    '''
+    work_queue = get_work_queue(broker=broker)
+    n_units = 0
+
+    while True:
+        lease = work_queue.lease(queue, worker)
+        if lease is None:
+            break
+
+        # Proxies and connections are not shared between threads.
+        is_done = threading.Event()
+
+        def keep_lease(unit: str):
+            heartbeat_queue = get_work_queue(broker=broker)
+            while not is_done.wait(heartbeat_secs):
+                if not heartbeat_queue.heartbeat(queue, unit, worker):
+                    print(f'Lease of {queue} {unit} is lost.')
+                    break
+
+        heartbeat = threading.Thread(target=keep_lease, args=[lease['unit']])
+        heartbeat.start()
+
+        current_datetime = datetime.now(timezone.utc)
+        params = {
+            'current_datetime': current_datetime,
+            'db_name': db_name,
+            'debug': debug,
+            'first_idx': -1,
+            'latest_idx': -1,
+            'n_workers': 1,
+            'past_datetime': current_datetime - timedelta(days=1),
+        }
+        for k, v in lease['params'].items():
+            if k in DATETIME_PARAMS:
+                v = datetime.fromisoformat(v)
+            params[k] = v
+
+        try:
+            func(**dict(
+                (k, v) for k, v in params.items()
+                if k in func.__code__.co_varnames
+            ))
+        except Exception as err:
+            traceback.print_exc()
+            work_queue.fail(queue, lease['unit'], worker, repr(err))
+            continue
+        finally:
+            is_done.set()
+            heartbeat.join()
+
+        work_queue.complete(queue, lease['unit'], worker)
+        n_units += 1
+
+        # Only show progress in debug mode.
+        if debug:
+            print(f'{worker} finished {queue} {lease["unit"]}.')
+
+    return n_units
@@ -1,9 +1,16 @@
-from news.db import create, read, schema, util, write
+from news.db import (create, dedup, merge, parquet, preprocessed, read,
+                     schema, search, shard, util, write)
 
 __all__ = [
     create,
+    dedup,
+    merge,
+    parquet,
+    preprocessed,
     read,
     schema,
+    search,
+    shard,
     util,
     write,
 ]
@@ -15,3 +15,17 @@ def create_table(cur: sqlite3.Cursor):
             url TEXT
         );
     """)
+    create_index(cur=cur)
+
+
+def create_index(cur: sqlite3.Cursor):
+    # Datetime is stored as `%Y-%m-%dT%H:%M:%S.%fZ` in UTC, so string order is
+    # the same as time order.
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS news_company_datetime_index
+        ON news (company, datetime);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS news_url_index
+        ON news (url);
+    """)
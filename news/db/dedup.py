@@ -0,0 +1,202 @@
+import re
+import sqlite3
+import struct
+import zlib
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+# Number of characters in each shingle.
+SHINGLE_SIZE = 5
+# Text shorter than this is never treated as duplicated.
+MIN_TEXT_LENGTH = 50
+# Signature has `2 ** BIN_BITS` values, split into `BANDS` bands for LSH.
+# With 32 bands of 4 values, news pairs with jaccard similarity 0.6 become
+# candidates with probability 0.99, and pairs with 0.3 with probability 0.23.
+BIN_BITS = 7
+NUM_BINS = 2 ** BIN_BITS
+BANDS = 32
+ROWS = NUM_BINS // BANDS
+# Candidates with estimated jaccard similarity at least this are duplicates.
+THRESHOLD = 0.6
+
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+EMPTY_BIN = 2 ** 32
+BAND_FORMAT = f'<{ROWS}Q'
+
+
+def get_signature(text: str) -> Optional[Tuple[int, ...]]:
+    r'''
+    One permutation MinHash of character shingles. Each shingle is hashed
+    once and kept as the minimum of one of `NUM_BINS` bins, so the cost is
+    linear in text length instead of `NUM_BINS` times. Empty bins are filled
+    by rotation from the next non-empty bin.
+
+    Return `None` if `text` is too short.
+    '''
+    text = NON_WORD_PATTERN.sub('', text or '')
+    if len(text) < MIN_TEXT_LENGTH:
+        return None
+
+    # Fixed width encoding makes slicing shingles cheap.
+    data = memoryview(text.encode('utf-32-le'))
+    width = 4 * SHINGLE_SIZE
+    bins = [EMPTY_BIN] * NUM_BINS
+    for offset in range(0, len(data) - width + 4, 4):
+        hash_value = zlib.crc32(data[offset:offset + width])
+        idx = hash_value & (NUM_BINS - 1)
+        value = hash_value >> BIN_BITS
+        if value < bins[idx]:
+            bins[idx] = value
+
+    # Densification. Use values larger than any hash value so that filled
+    # bins only match filled bins.
+    signature = []
+    for idx in range(NUM_BINS):
+        distance = 0
+        while bins[(idx + distance) % NUM_BINS] == EMPTY_BIN:
+            distance += 1
+        signature.append(
+            bins[(idx + distance) % NUM_BINS] + distance * EMPTY_BIN
+        )
+    return tuple(signature)
+
+
+def get_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    r'''
+    Estimated jaccard similarity of two signatures.
+    '''
+    return sum(map(lambda pair: pair[0] == pair[1], zip(a, b))) / NUM_BINS
+
+
+def get_band_keys(signature: Sequence[int]) -> List[int]:
+    return [
+        (band << 32) | zlib.crc32(struct.pack(
+            BAND_FORMAT,
+            *signature[band * ROWS:(band + 1) * ROWS],
+        ))
+        for band in range(BANDS)
+    ]
+
+
+def has_dedup_table(cur: sqlite3.Cursor) -> bool:
+    return bool(list(cur.execute('''
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name = 'news_signature'
+    ''')))
+
+
+def create_dedup_table(cur: sqlite3.Cursor):
+    # `duplicate_of` is `id` of the earliest similar news, or NULL.
+    # `signature` is NULL when article is too short.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS news_signature (
+            news_id INTEGER PRIMARY KEY,
+            signature BLOB,
+            duplicate_of INTEGER
+        );
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS news_lsh (
+            key INTEGER,
+            news_id INTEGER
+        );
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS news_lsh_key_index
+        ON news_lsh (key);
+    """)
+
+
+def find_duplicate(
+    cur: sqlite3.Cursor,
+    signature: Optional[Sequence[int]],
+) -> Optional[int]:
+    r'''
+    Return `id` of indexed news similar to `signature`, or `None`.
+    '''
+    if signature is None:
+        return None
+
+    keys = get_band_keys(signature)
+    candidates = list(cur.execute(
+        f'''
+        SELECT news_id, signature, duplicate_of FROM news_signature
+        WHERE news_id IN (
+            SELECT news_id FROM news_lsh
+            WHERE key IN ({', '.join('?' * len(keys))})
+        )
+        ''',
+        keys,
+    ))
+
+    best_id = None
+    best_similarity = THRESHOLD
+    for news_id, candidate, duplicate_of in candidates:
+        similarity = get_similarity(signature, array('Q', candidate))
+        if similarity >= best_similarity:
+            best_id = duplicate_of if duplicate_of is not None else news_id
+            best_similarity = similarity
+    return best_id
+
+
+def add_signature(
+    cur: sqlite3.Cursor,
+    news_id: int,
+    signature: Optional[Sequence[int]],
+    duplicate_of: Optional[int],
+):
+    cur.execute(
+        '''
+        INSERT INTO news_signature(news_id, signature, duplicate_of)
+        VALUES (?, ?, ?)
+        ''',
+        [
+            news_id,
+            None if signature is None else array('Q', signature).tobytes(),
+            duplicate_of,
+        ],
+    )
+    # Only original news are needed as LSH candidates.
+    if signature is not None and duplicate_of is None:
+        cur.executemany(
+            'INSERT INTO news_lsh(key, news_id) VALUES (?, ?)',
+            [(key, news_id) for key in get_band_keys(signature)],
+        )
+
+
+def index_new_records(cur: sqlite3.Cursor) -> Tuple[int, int]:
+    r'''
+    Batch mode for existing databases. Sign news which are not signed yet in
+    `id` order. Return number of signed news and number of duplicates.
+    '''
+    max_id = list(cur.execute(
+        'SELECT MAX(news_id) FROM news_signature'
+    ))[0][0] or 0
+
+    n_news = 0
+    n_duplicates = 0
+    # Use another cursor since `cur` is used to insert.
+    for news_id, article in cur.connection.cursor().execute(
+        'SELECT id, article FROM news WHERE id > ? ORDER BY id',
+        [max_id],
+    ):
+        signature = get_signature(article)
+        duplicate_of = find_duplicate(cur=cur, signature=signature)
+        add_signature(
+            cur=cur,
+            news_id=news_id,
+            signature=signature,
+            duplicate_of=duplicate_of,
+        )
+
+        n_news += 1
+        if duplicate_of is not None:
+            n_duplicates += 1
+
+    return n_news, n_duplicates
+
+
+def get_duplicate_ids(cur: sqlite3.Cursor) -> List[int]:
+    return list(map(lambda row: row[0], cur.execute('''
+        SELECT news_id FROM news_signature WHERE duplicate_of IS NOT NULL
+    ''')))
@@ -0,0 +1,157 @@
+import sqlite3
+from typing import Iterator, List, Tuple
+
+import news.db
+
+# Number of source ids inserted by each statement. Each batch is committed,
+# so progress is reported and interrupted merge is resumed by running again.
+BATCH_SIZE = 100000
+
+# `ignore` keeps news already in target, `replace` keeps news of source.
+CONFLICTS = ['ignore', 'replace']
+
+
+def has_table(cur: sqlite3.Cursor, table: str, schema: str = 'main') -> bool:
+    return bool(list(cur.execute(
+        f'''
+        SELECT name FROM {schema}.sqlite_master
+        WHERE type = 'table' AND name = ?
+        ''',
+        [table],
+    )))
+
+
+def get_columns(
+    cur: sqlite3.Cursor,
+    table: str,
+    schema: str = 'main',
+) -> List[str]:
+    return [
+        name
+        for _, name, _, _, _, _ in cur.execute(
+            f'PRAGMA {schema}.table_info({table})'
+        )
+    ]
+
+
+def create_target_table(cur: sqlite3.Cursor, table: str):
+    r'''
+    Create `table` in target with the same schema as source, and index `url`
+    so that each url conflict is found with one index lookup.
+    '''
+    if table == 'news':
+        news.db.create.create_table(cur=cur)
+        return
+
+    if not has_table(cur=cur, table=table):
+        sql = list(cur.execute(
+            '''
+            SELECT sql FROM src.sqlite_master
+            WHERE type = 'table' AND name = ?
+            ''',
+            [table],
+        ))[0][0]
+        cur.execute(sql)
+    cur.execute(f'''
+        CREATE INDEX IF NOT EXISTS {table}_url_index ON {table} (url)
+    ''')
+
+
+def merge_records(
+    cur: sqlite3.Cursor,
+    src_path: str,
+    table: str = 'news',
+    *,
+    on_conflict: str = 'ignore',
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[Tuple[int, int, int]]:
+    r'''
+    Insert `table` of database at `src_path` into the same table of `cur` with
+    `INSERT ... SELECT`, so news are copied inside SQLite without loading
+    them in Python. News with the same url are merged once. Target ids are
+    reassigned in source id order.
+
+    Yield number of scanned source ids, number of source ids and number of
+    merged news after each committed batch.
+    '''
+    if on_conflict not in CONFLICTS:
+        raise ValueError(f'`on_conflict` must be one of {CONFLICTS}.')
+    if news.db.shard.has_shard_table(cur=cur):
+        raise ValueError('Merge shards of sharded database one by one.')
+    # Replaced news would be left in full text search and near duplicate
+    # indexes.
+    if on_conflict == 'replace' and (
+        news.db.search.has_fts_table(cur=cur)
+        or news.db.dedup.has_dedup_table(cur=cur)
+    ):
+        raise ValueError('Cannot replace news of indexed database.')
+
+    # Database cannot be attached or detached within transaction.
+    cur.connection.commit()
+    cur.execute('ATTACH DATABASE ? AS src', [src_path])
+    try:
+        if not has_table(cur=cur, table=table, schema='src'):
+            raise ValueError(f'table `{table}` does not exist in {src_path}.')
+        if has_table(cur=cur, table='news_shard', schema='src'):
+            raise ValueError('Merge shards of sharded database one by one.')
+
+        create_target_table(cur=cur, table=table)
+        cur.connection.commit()
+
+        # Ids are reassigned by target.
+        src_columns = set(get_columns(cur=cur, table=table, schema='src'))
+        columns = ', '.join(
+            column
+            for column in get_columns(cur=cur, table=table)
+            if column != 'id' and column in src_columns
+        )
+
+        # Keep the first news of each url in source, or the last one when
+        # replacing.
+        pick = 'MAX' if on_conflict == 'replace' else 'MIN'
+        batch_ids = f'''
+            SELECT {pick}(id) FROM src.{table}
+            WHERE id >= :first_id AND id < :end_id
+            GROUP BY url
+        '''
+        if on_conflict == 'replace':
+            delete_sql = f'''
+                DELETE FROM main.{table}
+                WHERE url IN (
+                    SELECT url FROM src.{table}
+                    WHERE id >= :first_id AND id < :end_id
+                )
+            '''
+        insert_sql = f'''
+            INSERT INTO main.{table} ({columns})
+            SELECT {columns} FROM src.{table} AS s
+            WHERE s.id IN ({batch_ids})
+        '''
+        if on_conflict == 'ignore':
+            insert_sql += f'''
+            AND NOT EXISTS (
+                SELECT 1 FROM main.{table} AS t WHERE t.url = s.url
+            )
+            '''
+        insert_sql += 'ORDER BY s.id'
+
+        min_id, max_id = list(cur.execute(
+            f'SELECT MIN(id), MAX(id) FROM src.{table}'
+        ))[0]
+        if min_id is None:
+            return
+        n_ids = max_id - min_id + 1
+
+        n_merged = 0
+        for first_id in range(min_id, max_id + 1, batch_size):
+            params = {'first_id': first_id, 'end_id': first_id + batch_size}
+            if on_conflict == 'replace':
+                cur.execute(delete_sql, params)
+            cur.execute(insert_sql, params)
+            n_merged += cur.rowcount
+            cur.connection.commit()
+            n_scanned = min(first_id + batch_size, max_id + 1) - min_id
+            yield n_scanned, n_ids, n_merged
+    finally:
+        cur.connection.commit()
+        cur.execute('DETACH DATABASE src')
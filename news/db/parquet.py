@@ -0,0 +1,179 @@
+import os
+import sqlite3
+from typing import Dict, Iterator, List, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+import news.db
+
+# Number of rows fetched from SQLite and written as one record batch.
+BATCH_SIZE = 10000
+
+# Columns which store news release time in each table.
+DATETIME_COLUMNS = {
+    'news': 'datetime',
+    'news_table': 'time',
+}
+
+# Low cardinality columns which are stored with dictionary encoding.
+CATEGORICAL_COLUMNS = {
+    'news': ['category'],
+    'news_table': ['label'],
+}
+
+# Files are partitioned by company and release month (`YYYY-MM`).
+PARTITIONING = ds.partitioning(
+    pa.schema([('company', pa.string()), ('month', pa.string())]),
+    flavor='hive',
+)
+
+
+def get_schema(
+    cur: sqlite3.Cursor,
+    table: str,
+    *,
+    exclude_raw_xml: bool = False,
+) -> pa.Schema:
+    fields = []
+    columns = cur.execute(f'PRAGMA table_info({table})')
+    for _, name, col_type, _, _, _ in columns:
+        if exclude_raw_xml and name == 'raw_xml':
+            continue
+
+        if name in CATEGORICAL_COLUMNS[table]:
+            fields.append((name, pa.dictionary(pa.int32(), pa.string())))
+        elif col_type.upper() == 'INTEGER':
+            fields.append((name, pa.int64()))
+        else:
+            fields.append((name, pa.string()))
+
+    if not fields:
+        raise ValueError(f'table `{table}` does not exist.')
+
+    # Partition column.
+    fields.append(('month', pa.string()))
+    return pa.schema(fields)
+
+
+def iter_batches(
+    cur: sqlite3.Cursor,
+    table: str,
+    schema: pa.Schema,
+    *,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[pa.RecordBatch]:
+    columns = [name for name in schema.names if name != 'month']
+    datetime_idx = columns.index(DATETIME_COLUMNS[table])
+
+    cur.execute(f'SELECT {", ".join(columns)} FROM {table}')
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+
+        arrays = []
+        for idx, name in enumerate(columns):
+            values = [row[idx] for row in rows]
+            if pa.types.is_dictionary(schema.field(name).type):
+                arrays.append(
+                    pa.array(values, type=pa.string()).dictionary_encode()
+                )
+            else:
+                arrays.append(pa.array(values, type=schema.field(name).type))
+
+        # Empty datetime goes to hive default partition.
+        arrays.append(pa.array(
+            [row[datetime_idx][:7] if row[datetime_idx] else None
+             for row in rows],
+            type=pa.string(),
+        ))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_table(
+    db_name: str,
+    dataset_name: str,
+    *,
+    batch_size: int = BATCH_SIZE,
+    exclude_raw_xml: bool = False,
+    table: str = 'news',
+) -> int:
+    r'''
+    Stream `table` of `db_name` into Parquet files under `dataset_name`,
+    partitioned by company and release month. Both names are relative to
+    `news.db.util.DATA_PATH`. Return number of exported rows.
+    '''
+    if table not in DATETIME_COLUMNS:
+        raise ValueError(f'`table` must be one of {list(DATETIME_COLUMNS)}.')
+
+    db_path = news.db.util.get_path(db_name)
+    if not os.path.isfile(db_path):
+        raise FileNotFoundError(f'{db_path} is not file.')
+
+    # Batches are consumed by pyarrow writer thread.
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    cur = conn.cursor()
+
+    schema = get_schema(cur=cur, table=table, exclude_raw_xml=exclude_raw_xml)
+    stats = {'row_count': 0}
+
+    def count_rows(batches: Iterator[pa.RecordBatch]):
+        for batch in batches:
+            stats['row_count'] += batch.num_rows
+            yield batch
+
+    ds.write_dataset(
+        count_rows(iter_batches(
+            cur=cur,
+            table=table,
+            schema=schema,
+            batch_size=batch_size,
+        )),
+        news.db.util.get_path(dataset_name),
+        schema=schema,
+        format='parquet',
+        partitioning=PARTITIONING,
+        basename_template='part-{i}.parquet',
+        existing_data_behavior='delete_matching',
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression='zstd',
+        ),
+    )
+
+    conn.close()
+
+    return stats['row_count']
+
+
+def get_dataset(dataset_name: str) -> ds.Dataset:
+    return ds.dataset(
+        news.db.util.get_path(dataset_name),
+        format='parquet',
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+    )
+
+
+def read_columns(
+    dataset_name: str,
+    columns: Sequence[str],
+    *,
+    companies: Sequence[str] = None,
+    months: Sequence[str] = None,
+) -> Dict[str, List]:
+    r'''
+    Read `columns` from Parquet dataset as python lists. Only files under
+    matching `companies` and `months` partitions are scanned.
+    '''
+    dataset = get_dataset(dataset_name=dataset_name)
+
+    expr = None
+    if companies is not None:
+        expr = pc.field('company').isin(companies)
+    if months is not None:
+        month_expr = pc.field('month').isin(months)
+        expr = month_expr if expr is None else expr & month_expr
+
+    table = dataset.to_table(columns=list(columns), filter=expr)
+    return {name: table.column(name).to_pylist() for name in columns}
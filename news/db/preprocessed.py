@@ -0,0 +1,120 @@
+import itertools
+import sqlite3
+from typing import Dict, Iterable, Iterator, List
+
+# Number of records written in each transaction.
+BATCH_SIZE = 10000
+
+
+def create_table(cur: sqlite3.Cursor):
+    r'''
+    Table of preprocessed news, written by `news.preprocess.preprocess`.
+    '''
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS news_table (
+            id integer PRIMARY KEY,
+            url text,
+            time text,
+            company text,
+            label text,
+            reporter text,
+            title text,
+            article text,
+            raw_xml text
+        );
+    """)
+    create_index(cur=cur)
+
+
+def create_index(cur: sqlite3.Cursor):
+    # Same index as `news.db.merge` uses to find merged urls.
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS news_table_url_index
+        ON news_table (url);
+    """)
+
+
+def drop_index(cur: sqlite3.Cursor):
+    cur.execute('DROP INDEX IF EXISTS news_table_url_index')
+
+
+def get_columns(cur: sqlite3.Cursor) -> List[str]:
+    return list(map(
+        lambda row: row[1],
+        cur.execute('PRAGMA table_info(news_table)'),
+    ))
+
+
+def write_records(
+    cur: sqlite3.Cursor,
+    records: Iterable[Dict],
+    *,
+    batch_size: int = BATCH_SIZE,
+    defer_index: bool = False,
+) -> Iterator[int]:
+    r'''
+    Stream `records` into `news_table` and commit every `batch_size` records,
+    so only one batch is kept in memory. Values are taken by column name, and
+    columns missing in a record, e.g. `raw_xml`, are `NULL`. With
+    `defer_index`, indexes are built once after all records are written.
+
+    Yield number of written records after each committed batch.
+    '''
+    columns = get_columns(cur=cur)
+    if not columns:
+        raise ValueError('table `news_table` does not exist.')
+
+    # The same statement is prepared once and reused by every batch.
+    sql = f'''
+        INSERT INTO news_table({', '.join(columns)})
+        VALUES ({', '.join('?' * len(columns))})
+    '''
+
+    if defer_index:
+        drop_index(cur=cur)
+
+    column_set = set(columns)
+    records = iter(records)
+    n_written = 0
+    try:
+        while True:
+            batch = []
+            for record in itertools.islice(records, batch_size):
+                if not record.keys() <= column_set:
+                    raise ValueError(
+                        f'{sorted(record.keys() - column_set)} are not '
+                        'columns of `news_table`.'
+                    )
+                batch.append(tuple(map(record.get, columns)))
+            if not batch:
+                break
+
+            cur.executemany(sql, batch)
+            cur.connection.commit()
+            n_written += len(batch)
+            yield n_written
+    finally:
+        # Rebuild indexes even if writing stops halfway.
+        if defer_index:
+            create_index(cur=cur)
+            cur.connection.commit()
+
+
+def read_records(
+    cur: sqlite3.Cursor,
+    *,
+    with_raw_xml: bool = False,
+) -> Iterator[Dict]:
+    r'''
+    Stream records of `news_table` in `id` order as dictionaries like
+    `news.preprocess.dataset.Allcolumn`.
+    '''
+    columns = [
+        column
+        for column in get_columns(cur=cur)
+        if with_raw_xml or column != 'raw_xml'
+    ]
+    for row in cur.execute(
+        f'SELECT {", ".join(columns)} FROM news_table ORDER BY id'
+    ):
+        yield dict(zip(columns, row))
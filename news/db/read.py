@@ -1,49 +1,146 @@
 import sqlite3
-from typing import List
+from datetime import datetime, timezone
+from typing import Iterator, List, Sequence, Union
 
 import news.db
 from news.db.schema import News
 
 
+def to_db_datetime(value: Union[datetime, str]) -> str:
+    r'''
+    Convert `value` into the format stored in `news.datetime`.
+    Naive datetime is treated as UTC.
+    '''
+    if isinstance(value, str):
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def query_records(
+    cur: sqlite3.Cursor,
+    *,
+    company: Union[str, Sequence[str]] = None,
+    current_datetime: Union[datetime, str] = None,
+    past_datetime: Union[datetime, str] = None,
+    with_raw_xml: bool = True,
+) -> Iterator[News]:
+    r'''
+    Select news by company and release time `past_datetime <= t <=
+    current_datetime`. Filters which are `None` are ignored. Company and
+    datetime filters are served by `news_company_datetime_index`. News of
+    sharded database are selected from relevant shards only.
+    '''
+    if news.db.shard.has_shard_table(cur=cur):
+        yield from news.db.shard.query_records(
+            cur=cur,
+            company=company,
+            current_datetime=current_datetime,
+            past_datetime=past_datetime,
+            with_raw_xml=with_raw_xml,
+        )
+        return
+
+    conditions = []
+    params = []
+
+    if company is not None:
+        if isinstance(company, str):
+            company = [company]
+        conditions.append(f'company IN ({", ".join("?" * len(company))})')
+        params.extend(company)
+
+    if past_datetime is not None:
+        conditions.append('datetime >= ?')
+        params.append(to_db_datetime(past_datetime))
+
+    if current_datetime is not None:
+        conditions.append('datetime <= ?')
+        params.append(to_db_datetime(current_datetime))
+
+    sql = f'''
+        SELECT article, category, company, datetime,
+               {'raw_xml' if with_raw_xml else "''"}, reporter, title, url
+        FROM news
+        {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+    '''
+
+    for (
+        article, category, company, news_datetime, raw_xml,
+        reporter, title, url
+    ) in cur.execute(sql, params):
+        yield News(
+            article=article,
+            category=category,
+            company=company,
+            datetime=news_datetime,
+            raw_xml=raw_xml,
+            reporter=reporter,
+            title=title,
+            url=url,
+        )
+
+
+def load_records(
+    db_name: str,
+    cur: sqlite3.Cursor = None,
+    **kwargs,
+) -> List[News]:
+    if not db_name and cur is None:
+        raise ValueError(
+            'at least one of `db_name` or `cur` must be provided.'
+        )
+
+    conn: sqlite3.Connection = None
+
+    if db_name:
+        conn = news.db.util.get_conn(
+            db_name=db_name,
+            profile='read-only-scan',
+        )
+        cur = conn.cursor()
+
+    records = list(query_records(cur=cur, **kwargs))
+
+    if conn is not None:
+        conn.close()
+
+    return records
+
+
 class AllRecords:
     def __init__(self, db_name: str, cur: sqlite3.Cursor = None):
-        if not db_name and cur is None:
-            raise ValueError(
-                'at least one of `db_name` or `cur` must be provided.'
-            )
-
-        sql = '''
-            SELECT article, category, company, datetime, raw_xml, reporter, title, url
-            FROM news
-        '''
-        conn: sqlite3.Connection = None
-
-        self.records: List[News] = []
-
-        if db_name:
-            conn = news.db.util.get_conn(db_name=db_name)
-            cur = conn.cursor()
-
-        for (
-            article, category, company, datetime, raw_xml,
-            reporter, title, url
-        ) in cur.execute(sql):
-            self.records.append(News(
-                article=article,
-                category=category,
-                company=company,
-                datetime=datetime,
-                raw_xml=raw_xml,
-                reporter=reporter,
-                title=title,
-                url=url,
-            ))
-
-        if conn is not None:
-            conn.close()
+        self.records: List[News] = load_records(db_name=db_name, cur=cur)
 
     def __getitem__(self, idx: int) -> News:
         return self.records[idx]
 
     def __len__(self) -> int:
         return len(self.records)
+
+
+class RangeRecords(AllRecords):
+    r'''
+    News of `company` released within `[past_datetime, current_datetime]`.
+    See `query_records` for filters.
+    '''
+
+    def __init__(
+        self,
+        db_name: str,
+        cur: sqlite3.Cursor = None,
+        *,
+        company: Union[str, Sequence[str]] = None,
+        current_datetime: Union[datetime, str] = None,
+        past_datetime: Union[datetime, str] = None,
+        with_raw_xml: bool = True,
+    ):
+        self.records: List[News] = load_records(
+            db_name=db_name,
+            cur=cur,
+            company=company,
+            current_datetime=current_datetime,
+            past_datetime=past_datetime,
+            with_raw_xml=with_raw_xml,
+        )
@@ -0,0 +1,121 @@
+import re
+import sqlite3
+from typing import List
+
+# Continuous CJK characters, or other word characters.
+TOKEN_PATTERN = re.compile(
+    r'([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+)|([^\W_]+)'
+)
+
+# Weight of `title` and `article` in bm25 ranking.
+TITLE_WEIGHT = 2.0
+ARTICLE_WEIGHT = 1.0
+
+
+def to_bigrams(text: str, index: bool = False) -> str:
+    r'''
+    Split CJK text into overlapping character bigrams and keep other words as
+    is. Tokens are joined by space so that FTS5 `unicode61` tokenizer treats
+    each bigram as a token.
+
+    With `index`, the last character of each CJK run is kept as a token as
+    well, since single character queries only match starts of tokens.
+
+    Example: '台灣大學 NTU' -> '台灣 灣大 大學 NTU', or
+    '台灣 灣大 大學 學 NTU' with `index`.
+    '''
+    tokens = []
+    for cjk, word in TOKEN_PATTERN.findall(text or ''):
+        if word:
+            tokens.append(word)
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(cjk[idx:idx + 2] for idx in range(len(cjk) - 1))
+            if index:
+                tokens.append(cjk[-1])
+    return ' '.join(tokens)
+
+
+def to_query(text: str) -> str:
+    r'''
+    Convert space separated phrases into FTS5 query. Each phrase must appear in
+    matched news.
+    '''
+    phrases = []
+    for phrase in text.split():
+        tokens = to_bigrams(phrase).split()
+        if not tokens:
+            continue
+        # A single CJK character only matches as the start of bigrams.
+        if len(tokens) == 1 and len(tokens[0]) == 1:
+            phrases.append(f'"{tokens[0]}"*')
+        else:
+            phrases.append(f'"{" ".join(tokens)}"')
+
+    if not phrases:
+        raise ValueError('`text` contains no searchable word.')
+
+    return ' AND '.join(phrases)
+
+
+def has_fts_table(cur: sqlite3.Cursor) -> bool:
+    return bool(list(cur.execute('''
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name = 'news_fts'
+    ''')))
+
+
+def create_fts_table(cur: sqlite3.Cursor):
+    # Contentless table. Text is already stored in `news`, only the index is
+    # kept and `rowid` is the same as `news.id`.
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5 (
+            title,
+            article,
+            content='',
+            tokenize='unicode61'
+        );
+    """)
+
+
+def index_new_records(cur: sqlite3.Cursor) -> int:
+    r'''
+    Add news which are not in `news_fts` yet. Return number of indexed news.
+    '''
+    max_id = list(cur.execute('SELECT MAX(rowid) FROM news_fts'))[0][0] or 0
+
+    # Use another cursor since `cur` is used to insert.
+    rows = cur.connection.cursor().execute(
+        'SELECT id, title, article FROM news WHERE id > ? ORDER BY id',
+        [max_id],
+    )
+    before = cur.connection.total_changes
+    cur.executemany(
+        'INSERT INTO news_fts(rowid, title, article) VALUES (?, ?, ?)',
+        (
+            (
+                idx,
+                to_bigrams(title, index=True),
+                to_bigrams(article, index=True),
+            )
+            for idx, title, article in rows
+        ),
+    )
+    return cur.connection.total_changes - before
+
+
+def search(cur: sqlite3.Cursor, text: str, limit: int = 100) -> List[int]:
+    r'''
+    Return `news.id` of news whose title or article contains every phrase in
+    `text`, ranked by bm25.
+    '''
+    return list(map(lambda row: row[0], cur.execute(
+        f'''
+        SELECT rowid FROM news_fts
+        WHERE news_fts MATCH ?
+        ORDER BY bm25(news_fts, {TITLE_WEIGHT}, {ARTICLE_WEIGHT})
+        LIMIT ?
+        ''',
+        [to_query(text), limit],
+    )))
@@ -0,0 +1,259 @@
+import glob
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence, Union
+
+import news.db
+from news.db.schema import News
+
+# Shard of news without company or datetime.
+UNKNOWN = 'unknown'
+
+
+def has_shard_table(cur: sqlite3.Cursor) -> bool:
+    return bool(list(cur.execute('''
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name = 'news_shard'
+    ''')))
+
+
+# Database with this table stores news in shards instead of `news`. Shard of
+# each url is kept for fast lookup of existed urls.
+SHARD_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS news_shard (
+        url TEXT PRIMARY KEY,
+        shard TEXT
+    );
+"""
+
+
+def create_shard_table(cur: sqlite3.Cursor):
+    r'''
+    Store news of database in shards. News in `news` table would no longer be
+    read or deduplicated, so they must be moved by `move_records` instead.
+    '''
+    news.db.create.create_table(cur=cur)
+    if not has_shard_table(cur=cur) and list(cur.execute(
+        'SELECT 1 FROM news LIMIT 1'
+    )):
+        raise ValueError(
+            'Database has news in `news` table. Move them to shards by '
+            '`run_db_migrate.py --shard`.'
+        )
+    cur.execute(SHARD_TABLE_SQL)
+
+
+def get_shard_dir(cur: sqlite3.Cursor) -> str:
+    r'''
+    Shards of `data/raw/cna.db` are stored in `data/raw/cna.shards`.
+    '''
+    for _, name, path in cur.execute('PRAGMA database_list'):
+        if name == 'main':
+            break
+    if not path:
+        raise ValueError('In-memory database cannot be sharded.')
+    return f'{os.path.splitext(path)[0]}.shards'
+
+
+def get_shard_name(n: News) -> str:
+    r'''
+    News are sharded by company and month of release, e.g. `中央社/202106`.
+    '''
+    month = UNKNOWN
+    if n.datetime:
+        month = n.datetime[:4] + n.datetime[5:7]
+    return f'{n.company or UNKNOWN}/{month}'
+
+
+def get_shard_conn(
+    shard_dir: str,
+    shard: str,
+    profile: str = 'crawl-writer',
+) -> sqlite3.Connection:
+    shard_path = os.path.join(shard_dir, f'{shard}.db')
+    os.makedirs(os.path.dirname(shard_path), exist_ok=True)
+    conn = sqlite3.connect(shard_path)
+    news.db.util.set_profile(conn=conn, profile=profile)
+    return conn
+
+
+def get_existed_url(cur: sqlite3.Cursor, urls: Sequence[str]) -> set:
+    existed_url = set()
+    urls = list(urls)
+    for idx in range(0, len(urls), news.db.write.MAX_VARIABLE_NUMBER):
+        batch = urls[idx:idx + news.db.write.MAX_VARIABLE_NUMBER]
+        existed_url.update(map(lambda url: url[0], cur.execute(
+            f'''
+            SELECT url FROM news_shard
+            WHERE url IN ({', '.join('?' * len(batch))})
+            ''',
+            batch,
+        )))
+    return existed_url
+
+
+def write_new_records(
+    cur: sqlite3.Cursor,
+    news_list: Sequence[News],
+    *,
+    drop_near_duplicates: bool = False,
+):
+    r'''
+    Route new news to their shards. Each shard is committed on its own, while
+    urls are recorded with `cur` and committed by caller, so news written
+    before a crash are deduplicated by shards when written again.
+
+    Shards get full text search and near duplicate tables of the sharded
+    database, which are kept up to date by `news.db.write.write_new_records`
+    of each shard. Near duplicates are only found within the same shard.
+    '''
+    has_fts = news.db.search.has_fts_table(cur=cur)
+    has_dedup = news.db.dedup.has_dedup_table(cur=cur)
+    existed_url = get_existed_url(
+        cur=cur,
+        urls=set(map(lambda n: n.url, news_list)),
+    )
+
+    shards: Dict[str, List[News]] = {}
+    for n in news_list:
+        if n.url not in existed_url:
+            shards.setdefault(get_shard_name(n), []).append(n)
+            existed_url.add(n.url)
+
+    shard_dir = get_shard_dir(cur=cur)
+    for shard, shard_news_list in shards.items():
+        conn = get_shard_conn(shard_dir=shard_dir, shard=shard)
+        shard_cur = conn.cursor()
+        news.db.create.create_table(cur=shard_cur)
+        # Index news of shards created before the tables were added.
+        if has_fts and not news.db.search.has_fts_table(cur=shard_cur):
+            news.db.search.create_fts_table(cur=shard_cur)
+            news.db.search.index_new_records(cur=shard_cur)
+        if has_dedup and not news.db.dedup.has_dedup_table(cur=shard_cur):
+            news.db.dedup.create_dedup_table(cur=shard_cur)
+            news.db.dedup.index_new_records(cur=shard_cur)
+        news.db.write.write_new_records(
+            cur=shard_cur,
+            news_list=shard_news_list,
+            drop_near_duplicates=drop_near_duplicates,
+        )
+        conn.commit()
+        conn.close()
+
+        cur.executemany(
+            'INSERT OR IGNORE INTO news_shard(url, shard) VALUES (?, ?)',
+            [(n.url, shard) for n in shard_news_list],
+        )
+
+
+def move_records(cur: sqlite3.Cursor, batch_size: int = 10000) -> int:
+    r'''
+    Move news in `news` table to shards, and store news of database in shards
+    from now on. Return number of moved news.
+
+    News are indexed again in shards, so their rows of full text search and
+    near duplicate tables are deleted along with them in the transaction of
+    `cur`. The tables are kept empty so that shards get them as well.
+    '''
+    cur.execute(SHARD_TABLE_SQL)
+
+    # Read with another cursor while writing with `cur`.
+    read_cur = cur.connection.cursor()
+    read_cur.execute('''
+        SELECT article, category, company, datetime, raw_xml, reporter, title,
+               url
+        FROM news ORDER BY id
+    ''')
+    n_news = 0
+    while True:
+        rows = read_cur.fetchmany(batch_size)
+        if not rows:
+            break
+        write_new_records(cur=cur, news_list=[News(*row) for row in rows])
+        n_news += len(rows)
+    cur.execute('DELETE FROM news')
+    if news.db.search.has_fts_table(cur=cur):
+        # Contentless table only supports deleting all rows.
+        cur.execute("INSERT INTO news_fts(news_fts) VALUES ('delete-all')")
+    if news.db.dedup.has_dedup_table(cur=cur):
+        cur.execute('DELETE FROM news_signature')
+        cur.execute('DELETE FROM news_lsh')
+    return n_news
+
+
+def get_shards(
+    cur: sqlite3.Cursor,
+    *,
+    company: Union[str, Sequence[str]] = None,
+    current_datetime: Union[datetime, str] = None,
+    past_datetime: Union[datetime, str] = None,
+) -> List[str]:
+    r'''
+    Shards which may contain news of `company` released within
+    `[past_datetime, current_datetime]`, in order of company and month.
+    '''
+    if isinstance(company, str):
+        company = [company]
+
+    first_month = last_month = None
+    if past_datetime is not None:
+        past_datetime = news.db.read.to_db_datetime(past_datetime)
+        first_month = past_datetime[:4] + past_datetime[5:7]
+    if current_datetime is not None:
+        current_datetime = news.db.read.to_db_datetime(current_datetime)
+        last_month = current_datetime[:4] + current_datetime[5:7]
+
+    shard_dir = get_shard_dir(cur=cur)
+    shards = []
+    for path in sorted(glob.glob(os.path.join(shard_dir, '*', '*.db'))):
+        shard_company = os.path.basename(os.path.dirname(path))
+        month = os.path.splitext(os.path.basename(path))[0]
+
+        if company is not None and shard_company not in company:
+            continue
+        if month == UNKNOWN and (first_month or last_month):
+            continue
+        if first_month is not None and month < first_month:
+            continue
+        if last_month is not None and month > last_month:
+            continue
+        shards.append(f'{shard_company}/{month}')
+    return shards
+
+
+def query_records(
+    cur: sqlite3.Cursor,
+    *,
+    company: Union[str, Sequence[str]] = None,
+    current_datetime: Union[datetime, str] = None,
+    past_datetime: Union[datetime, str] = None,
+    with_raw_xml: bool = True,
+) -> Iterator[News]:
+    r'''
+    Select news from shards as if they were one table. Only shards of
+    selected companies and months are opened, and filters are applied by
+    `news_company_datetime_index` of each shard.
+    '''
+    shard_dir = get_shard_dir(cur=cur)
+    for shard in get_shards(
+        cur=cur,
+        company=company,
+        current_datetime=current_datetime,
+        past_datetime=past_datetime,
+    ):
+        conn = get_shard_conn(
+            shard_dir=shard_dir,
+            shard=shard,
+            profile='read-only-scan',
+        )
+        try:
+            yield from news.db.read.query_records(
+                cur=conn.cursor(),
+                company=company,
+                current_datetime=current_datetime,
+                past_datetime=past_datetime,
+                with_raw_xml=with_raw_xml,
+            )
+        finally:
+            conn.close()
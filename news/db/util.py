@@ -1,6 +1,6 @@
 import os
 import sqlite3
-from typing import Final
+from typing import Dict, Final, Union
 
 PROJECT_ROOT: Final[str] = os.path.abspath(os.path.join(
     os.path.abspath(__file__),
@@ -11,24 +11,68 @@ PROJECT_ROOT: Final[str] = os.path.abspath(os.path.join(
 
 DATA_PATH: Final[str] = os.path.join(PROJECT_ROOT, 'data')
 
+# SQLite pragmas applied by `get_conn`. Negative `cache_size` is in KiB.
+# `crawl-writer`: crawlers commit small batches frequently. WAL lets readers
+# scan the database while crawlers are writing.
+# `bulk-import`: one-off loading which can be redone if it crashes, so
+# durability is traded for speed.
+# `read-only-scan`: full table scan without any write.
+CONN_PROFILES: Final[Dict[str, Dict[str, Union[int, str]]]] = {
+    'crawl-writer': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 ** 2,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    'bulk-import': {
+        'journal_mode': 'MEMORY',
+        'synchronous': 'OFF',
+        'mmap_size': 1024 ** 3,
+        'cache_size': -512 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    'read-only-scan': {
+        'query_only': 'ON',
+        'mmap_size': 4 * 1024 ** 3,
+        'cache_size': -256 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
 
 def get_path(db_name: str) -> str:
     return os.path.join(DATA_PATH, db_name)
 
 
-def get_conn(db_name: str) -> sqlite3.Connection:
+def set_profile(conn: sqlite3.Connection, profile: str) -> None:
+    if profile not in CONN_PROFILES:
+        raise ValueError(f'`profile` must be one of {list(CONN_PROFILES)}.')
+
+    for pragma, value in CONN_PROFILES[profile].items():
+        conn.execute(f'PRAGMA {pragma} = {value}')
+
+
+def get_conn(db_name: str, profile: str = None) -> sqlite3.Connection:
     db_path = get_path(db_name)
     db_dir = os.path.dirname(db_path)
 
-    # Create database directory if not exists.
-    if not os.path.exists(db_dir):
-        os.makedirs(db_dir)
+    # Create database directory if not exists. Crawlers in daemon mode may
+    # create it at the same time.
+    os.makedirs(db_dir, exist_ok=True)
 
-    # Create database file if not exists.
+    # Create database file if not exists, without truncating file created by
+    # other threads.
     if not os.path.exists(db_path):
-        open(db_path, 'wb').close()
+        open(db_path, 'ab').close()
 
     if os.path.exists(db_path) and not os.path.isfile(db_path):
         raise FileExistsError(f'{db_path} is not file.')
 
-    return sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path)
+
+    # Use SQLite default settings when no profile is given.
+    if profile is not None:
+        set_profile(conn=conn, profile=profile)
+
+    return conn
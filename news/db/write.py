@@ -1,14 +1,52 @@
 import sqlite3
 from typing import Sequence
 
+import news.db.dedup
+import news.db.search
+import news.db.shard
 from news.db.schema import News
 
+# Keep number of bound parameters under SQLite limit.
+MAX_VARIABLE_NUMBER = 900
 
-def write_new_records(cur: sqlite3.Cursor, news_list: Sequence[News]):
-    existed_url = list(cur.execute('''
-        SELECT url FROM news
-    '''))
-    existed_url = set(map(lambda url: url[0], existed_url))
+
+def get_existed_url(cur: sqlite3.Cursor, urls: Sequence[str]) -> set:
+    if news.db.shard.has_shard_table(cur=cur):
+        return news.db.shard.get_existed_url(cur=cur, urls=urls)
+
+    existed_url = set()
+    urls = list(urls)
+    # Only look up given urls, which is fast with `news_url_index`.
+    for idx in range(0, len(urls), MAX_VARIABLE_NUMBER):
+        batch = urls[idx:idx + MAX_VARIABLE_NUMBER]
+        existed_url.update(map(lambda url: url[0], cur.execute(
+            f'''
+            SELECT url FROM news WHERE url IN ({', '.join('?' * len(batch))})
+            ''',
+            batch,
+        )))
+    return existed_url
+
+
+def write_new_records(
+    cur: sqlite3.Cursor,
+    news_list: Sequence[News],
+    *,
+    drop_near_duplicates: bool = False,
+):
+    # News of sharded database are stored in shards.
+    if news.db.shard.has_shard_table(cur=cur):
+        news.db.shard.write_new_records(
+            cur=cur,
+            news_list=news_list,
+            drop_near_duplicates=drop_near_duplicates,
+        )
+        return
+
+    existed_url = get_existed_url(
+        cur=cur,
+        urls=set(map(lambda n: n.url, news_list)),
+    )
 
     # Filter out existed news.
     tmp = []
@@ -17,12 +55,35 @@ def write_new_records(cur: sqlite3.Cursor, news_list: Sequence[News]):
             tmp.append(n)
             existed_url.add(n.url)
 
-    news_list = [tuple(news) for news in tmp]
-
-    cur.executemany(
-        '''
+    sql = '''
         INSERT INTO news(article, category, company, datetime, raw_xml, reporter, title, url)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''',
-        news_list
-    )
+    '''
+
+    if news.db.dedup.has_dedup_table(cur=cur):
+        # Insert one by one so that later news can be compared with earlier
+        # news in the same batch.
+        for n in tmp:
+            signature = news.db.dedup.get_signature(n.article)
+            duplicate_of = news.db.dedup.find_duplicate(
+                cur=cur,
+                signature=signature,
+            )
+            if duplicate_of is not None and drop_near_duplicates:
+                continue
+
+            cur.execute(sql, tuple(n))
+            news.db.dedup.add_signature(
+                cur=cur,
+                news_id=cur.lastrowid,
+                signature=signature,
+                duplicate_of=duplicate_of,
+            )
+    else:
+        news_list = [tuple(news) for news in tmp]
+
+        cur.executemany(sql, news_list)
+
+    # Keep full text search index up to date if it exists.
+    if news.db.search.has_fts_table(cur=cur):
+        news.db.search.index_new_records(cur=cur)
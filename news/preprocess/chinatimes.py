@@ -2,9 +2,26 @@ import re
 import unicodedata
 from datetime import datetime, timedelta
 
-from bs4 import BeautifulSoup
-
 from news.db.schema import News
+from news.preprocess.extract import Extractor
+
+EXTRACTOR = Extractor(
+    fields={
+        'article': 'div.article-body > p',
+        'article_body': 'div.article-body',
+        'category': 'nav.breadcrumb-wrapper > ol > li > a > span',
+        'datetime': 'header.article-header time[datetime]',
+        'reporter': 'div.author',
+        'title': 'h1.article-title',
+    },
+    regions=[
+        'div.article-body',
+        'nav.breadcrumb-wrapper',
+        'header.article-header',
+        'div.author',
+        'h1.article-title',
+    ],
+)
 
 
 def parse(ori_news: News) -> News:
@@ -22,14 +39,15 @@ def parse(ori_news: News) -> News:
 
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        article_tags = soup.select('div.article-body > p')
+        article_tags = fields.select('article')
 
         if article_tags:
             # Remove empty tags.
@@ -39,7 +57,7 @@ def parse(ori_news: News) -> News:
             ))
         # One line only news. Chinatime is trash.
         else:
-            article = soup.select('div.article-body')[0].text
+            article = fields.select('article_body')[0].text
 
         article = unicodedata.normalize('NFKC', article).strip()
     except Exception:
@@ -48,9 +66,7 @@ def parse(ori_news: News) -> News:
     # News category.
     category = ''
     try:
-        category = soup.select(
-            'nav.breadcrumb-wrapper > ol > li > a > span'
-        )[-1].text
+        category = fields.select('category')[-1].text
         category = unicodedata.normalize('NFKC', category).strip()
     except Exception:
         # There may not have category.
@@ -60,7 +76,7 @@ def parse(ori_news: News) -> News:
     news_datetime = ''
     try:
         news_datetime = datetime.strptime(
-            soup.select('header.article-header time[datetime]')[0]['datetime'],
+            fields.select('datetime')[0]['datetime'],
             '%Y-%m-%d %H:%M',
         )
         # Convert to UTC.
@@ -74,7 +90,7 @@ def parse(ori_news: News) -> News:
     # News reporter.
     reporter = ''
     try:
-        reporter_tag = soup.select('div.author')[0]
+        reporter_tag = fields.select('reporter')[0]
         format_1 = reporter_tag.select('a')
         if format_1:
             reporter = format_1[0].text
@@ -88,7 +104,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('h1.article-title')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
     except Exception:
         raise ValueError('Fail to parse Chinatimes news title.')
@@ -2,12 +2,25 @@ import re
 import unicodedata
 from datetime import datetime, timedelta
 
-from bs4 import BeautifulSoup
-
 from news.db.schema import News
+from news.preprocess.extract import Extractor
 
 REPORTER_PATTERN = re.compile(r'\((.*?)\)')
 
+EXTRACTOR = Extractor(
+    fields={
+        'dictionary': 'div.dictionary',
+        'paragraph': 'div.centralContent div.paragraph',
+        'category': 'div.breadcrumb > a',
+        'title': 'div.centralContent h1 span',
+    },
+    regions=[
+        'div.dictionary',
+        'div.centralContent',
+        'div.breadcrumb',
+    ],
+)
+
 
 def parse(ori_news: News) -> News:
     """Parse CNA news from raw HTML.
@@ -24,19 +37,20 @@ def parse(ori_news: News) -> News:
 
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        additional_tag = soup.select_one('div.dictionary')
-        if additional_tag:
-            article = additional_tag.text
+        additional_tags = fields.select('dictionary')
+        if additional_tags:
+            article = additional_tags[0].text
         article += ' '.join(map(
             lambda tag: tag.text,
-            soup.select_one('div.centralContent div.paragraph').select('p')
+            fields.select('paragraph')[0].select('p')
         ))
         article = unicodedata.normalize('NFKC', article).strip()
     except Exception:
@@ -45,7 +59,7 @@ def parse(ori_news: News) -> News:
     # News category.
     category = ''
     try:
-        category = soup.select('div.breadcrumb > a')[1].text
+        category = fields.select('category')[1].text
         category = unicodedata.normalize('NFKC', category).strip()
     except Exception:
         # There may not have category.
@@ -79,7 +93,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('div.centralContent h1 span')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
     except Exception:
         raise ValueError('Fail to parse CNA news title.')
@@ -1,8 +1,40 @@
+import os
 import sqlite3
 
+import pyarrow.dataset
 import torch
 
 
+def load_columns(db_path: str, columns: list):
+    r"""
+    Load `columns` of `news_table` as lists.
+    `db_path` can be either a SQLite file or a directory of Parquet files
+    exported by `news.db.parquet.export_table`.
+    """
+    # Parquet dataset.
+    if os.path.isdir(db_path):
+        table = pyarrow.dataset.dataset(
+            db_path,
+            format='parquet',
+            partitioning='hive',
+        ).to_table(columns=columns)
+        return [table.column(column).to_pylist() for column in columns]
+
+    # Connect to DB.
+    conn = sqlite3.connect(db_path)
+
+    # Get database cursor.
+    cursor = conn.cursor()
+
+    # Select all columns in one query, since order of rows may differ between
+    # queries, e.g. `id` alone is read from index of `url`.
+    rows = list(
+        cursor.execute(f'SELECT {", ".join(columns)} from news_table;')
+    )
+    conn.close()
+    return [[row[idx] for row in rows] for idx in range(len(columns))]
+
+
 class Seq2SeqNewsDataset(torch.utils.data.Dataset):
     r"""
     Dataset for seq2seq models.
@@ -14,18 +46,11 @@ class Seq2SeqNewsDataset(torch.utils.data.Dataset):
     def __init__(self, db_path: str):
         super().__init__()
 
-        # Connect to DB.
-        conn = sqlite3.connect(db_path)
-
-        # Set `conn.row_factory` to get right return format.
-        conn.row_factory = lambda cursor, row: row[0]
-
-        # Get database cursor.
-        cursor = conn.cursor()
-
         # Get all news title and article.
-        self.titles = list(cursor.execute('SELECT title from news_table;'))
-        self.articles = list(cursor.execute('SELECT article from news_table;'))
+        self.titles, self.articles = load_columns(
+            db_path,
+            ['title', 'article'],
+        )
 
     def __getitem__(self, index: int):
         return self.titles[index], self.articles[index]
@@ -45,18 +70,11 @@ class LMNewsDataset(torch.utils.data.Dataset):
     def __init__(self, db_path: str):
         super().__init__()
 
-        # Connect to DB.
-        conn = sqlite3.connect(db_path)
-
-        # Set `conn.row_factory` to get right return format.
-        conn.row_factory = lambda cursor, row: row[0]
-
-        # Get database cursor.
-        cursor = conn.cursor()
-
         # Get all news title and article.
-        self.titles = list(cursor.execute('SELECT title from news_table;'))
-        self.articles = list(cursor.execute('SELECT article from news_table;'))
+        self.titles, self.articles = load_columns(
+            db_path,
+            ['title', 'article'],
+        )
 
         # Merge title and article into single string.
         self.merge_data = [
@@ -72,24 +90,23 @@ class Allcolumn(torch.utils.data.Dataset):
     def __init__(self, db_path: str):
         super().__init__()
 
-        # Connect to DB.
-        conn = sqlite3.connect(db_path)
-
-        # Set `conn.row_factory` to get right return format.
-        conn.row_factory = lambda cursor, row: row[0]
-
-        # Get database cursor.
-        cursor = conn.cursor()
-
-        # Get all news title and article.
-        self.ids = list(cursor.execute('SELECT id from news_table;'))
-        self.urls = list(cursor.execute('SELECT url from news_table;'))
-        self.times = list(cursor.execute('SELECT time from news_table;'))
-        self.companys = list(cursor.execute('SELECT company from news_table;'))
-        self.labels = list(cursor.execute('SELECT label from news_table;'))
-        self.reporters = list(cursor.execute('SELECT reporter from news_table;'))
-        self.titles = list(cursor.execute('SELECT title from news_table;'))
-        self.articles = list(cursor.execute('SELECT article from news_table;'))
+        # Get all news columns except `raw_xml`.
+        (
+            self.ids,
+            self.urls,
+            self.times,
+            self.companys,
+            self.labels,
+            self.reporters,
+            self.titles,
+            self.articles,
+        ) = load_columns(
+            db_path,
+            [
+                'id', 'url', 'time', 'company', 'label', 'reporter', 'title',
+                'article',
+            ],
+        )
 
 
     def __getitem__(self, index: int):
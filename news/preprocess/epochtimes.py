@@ -2,15 +2,29 @@ import re
 import unicodedata
 
 import dateutil.parser
-from bs4 import BeautifulSoup
 
 from news.db.schema import News
+from news.preprocess.extract import Extractor
 
 REPORTER_PATTERN = re.compile(r'\(大紀元記者(.*?)報導\)')
 URL_PATTERN = re.compile(
     r'https://www.epochtimes.com/b5/(\d+)/(\d+)/(\d+)/n\d+\.htm'
 )
 
+EXTRACTOR = Extractor(
+    fields={
+        'article': 'div#artbody > p,h2',
+        'category': 'div#breadcrumb > a',
+        'title': 'h1.title',
+    },
+    regions=[
+        'div#artbody',
+        'h2',
+        'div#breadcrumb',
+        'h1.title',
+    ],
+)
+
 
 def parse(ori_news: News) -> News:
     """Parse Epochtimes news from raw HTML.
@@ -27,14 +41,15 @@ def parse(ori_news: News) -> News:
 
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        article_tags = soup.select('div#artbody > p,h2')
+        article_tags = fields.select('article')
         article = ' '.join(map(lambda tag: tag.text.strip(), article_tags))
         article = unicodedata.normalize('NFKC', article).strip()
     except Exception:
@@ -43,7 +58,7 @@ def parse(ori_news: News) -> News:
     # News category.
     category = ''
     try:
-        category = soup.select('div#breadcrumb > a')[-1].text
+        category = fields.select('category')[-1].text
         category = unicodedata.normalize('NFKC', category).strip()
     except Exception:
         # There may not have category.
@@ -76,7 +91,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('h1.title')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
     except Exception:
         raise ValueError('Fail to parse epochtimes news title.')
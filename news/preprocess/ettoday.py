@@ -3,9 +3,9 @@ import unicodedata
 from datetime import datetime, timedelta
 
 import dateutil.parser
-from bs4 import BeautifulSoup
 
 from news.db.schema import News
+from news.preprocess.extract import Extractor
 
 FILTER_WORDS = [
     '▲', '●', '▼', '★', '►', '※', '【更多新聞】', '以上言論不代表本網立場。', '圖一、',
@@ -16,6 +16,27 @@ REPORTER_WORDS = ['記者', '中央社', '報導']
 NON_REPORTER_WORDS = [',', '。', ':']
 TYPICAL_REPORTER_LENGTH = 20
 
+EXTRACTOR = Extractor(
+    fields={
+        'article': 'div.story > p:not([class])',
+        'article_link': 'div.story > link > p:not([class])',
+        'category': 'div.menu_bread_crumb, div.part_breadcrumb',
+        'datetime': 'time[datetime]',
+        'title': (
+            'h1.title, h1.title_article, div.subject_article > header > h1'
+        ),
+    },
+    regions=[
+        'div.story',
+        'div.menu_bread_crumb',
+        'div.part_breadcrumb',
+        'time[datetime]',
+        'h1.title',
+        'h1.title_article',
+        'div.subject_article',
+    ],
+)
+
 
 def parse(ori_news: News) -> News:
     """Parse ETtoday news from raw HTML.
@@ -32,17 +53,18 @@ def parse(ori_news: News) -> News:
 
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        article_tags = soup.select('div.story > p:not([class])')
+        article_tags = fields.select('article')
         if not article_tags:
             # ETtoday's bug. They accidentally put a </link>.
-            article_tags = soup.select('div.story > link > p:not([class])')
+            article_tags = fields.select('article_link')
 
         for article_tag in article_tags:
             # Remove redundant tags.
@@ -54,16 +76,20 @@ def parse(ori_news: News) -> News:
         # ETtoday's formatting sucks.
         for article_tag in article_tags:
             for strong_tag in article_tag.select('strong'):
+                # Nothing changes until a tag is removed, so text is only got
+                # once for all filter words.
+                previous_tag = strong_tag.previous_sibling
+                strong_text = strong_tag.text
                 for filter_word in FILTER_WORDS:
                     # Check if previous sibiling exists and contains filter words.
-                    if strong_tag.previous_sibling and filter_word in strong_tag.previous_sibling:
-                        strong_tag.previous_sibling.extract()
+                    if previous_tag and filter_word in previous_tag:
+                        previous_tag.extract()
                         strong_tag.extract()
                         break
                     # Check if strong tag contains filter words or too short.
                     # When text length equals to 1, it means the text is just a
                     # punctuation mark.
-                    if filter_word in strong_tag.text or len(strong_tag.text) <= 1:
+                    if filter_word in strong_text or len(strong_text) <= 1:
                         strong_tag.extract()
                         break
 
@@ -74,8 +100,9 @@ def parse(ori_news: News) -> News:
             if not text or len(text) <= 1:
                 article_tag.string = ''
             # Remove remaining paragraph which contains filter words.
+            text = article_tag.text
             for filter_word in FILTER_WORDS:
-                if filter_word in article_tag.text:
+                if filter_word in text:
                     article_tag.string = ''
                     break
 
@@ -92,7 +119,7 @@ def parse(ori_news: News) -> News:
     category = ''
     try:
         category = (
-            soup.select('div.menu_bread_crumb, div.part_breadcrumb')[-1]
+            fields.select('category')[-1]
             .select('div > a > span')[-1].text
         )
         category = unicodedata.normalize('NFKC', category).strip()
@@ -103,7 +130,7 @@ def parse(ori_news: News) -> News:
     # News datetime.
     news_datetime = ''
     try:
-        time_tag = soup.select('time[datetime]')[0]
+        time_tag = fields.select('datetime')[0]
         # When datetime is in UTC+8 format.
         if len(time_tag['datetime']) >= 10:
             news_datetime = dateutil.parser.isoparse(
@@ -163,9 +190,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select(
-            'h1.title, h1.title_article, div.subject_article > header > h1'
-        )[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
     except Exception:
         raise ValueError('Fail to parse ETtoday news title.')
@@ -0,0 +1,210 @@
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+try:
+    # Filters of tag creation are added in Beautiful Soup 4.13. Whole pages
+    # are parsed with older versions.
+    from bs4.filter import ElementFilter
+    HAS_ELEMENT_FILTER = True
+except ImportError:
+    ElementFilter = object
+    HAS_ELEMENT_FILTER = False
+
+# Whether parse regions of pages only. A stray end tag inside a region may
+# close a tag outside it, which parses differently than whole pages, so
+# regions are only parsed once output on crawled pages is compared, e.g. by
+# `python -m benchmark.parser --db_names ... --partial_parse`.
+PARTIAL = False
+REGION_PATTERN = re.compile(
+    r'([\w-]*)((?:[.#][\w-]+|\[[\w-]+(?:=[\w-]+)?\])*)'
+)
+CONDITION_PATTERN = re.compile(
+    r'([.#])([\w-]+)|\[([\w-]+)(?:=([\w-]+))?\]'
+)
+
+# `(attribute, value, is_class)`, where value is `None` if any value matches.
+Condition = Tuple[str, Optional[str], bool]
+
+
+class Extraction:
+    r'''
+    Tags of each field of one page, returned by `Extractor.extract`.
+    '''
+
+    def __init__(self, soup: BeautifulSoup, tags: Dict[str, List[Tag]]):
+        self.soup = soup
+        self.tags = tags
+
+    def is_attached(self, tag: Tag) -> bool:
+        while tag is not None:
+            if tag is self.soup:
+                return True
+            tag = tag.parent
+        return False
+
+    def select(self, name: str) -> List[Tag]:
+        r'''
+        Tags of field `name` in document order, like `soup.select`. Tags
+        removed from the tree after extraction, e.g. by `tag.extract()` of
+        parsers, are left out, so result is the same as selecting at the time
+        of calling.
+        '''
+        return [tag for tag in self.tags[name] if self.is_attached(tag)]
+
+
+def parse_region(region: str) -> Tuple[str, List[Condition]]:
+    r'''
+    Tag name and conditions of attributes of `region`, which is a CSS
+    selector of one tag without combinators, e.g. `div#main.article` and
+    `meta[name=pubdate]`.
+    '''
+    match = REGION_PATTERN.fullmatch(region.strip())
+    if not match or not region.strip():
+        raise ValueError(
+            f'Region must be a selector of one tag, got {region}.'
+        )
+
+    conditions = []
+    for symbol, name, key, value in CONDITION_PATTERN.findall(match.group(2)):
+        if symbol == '.':
+            conditions.append(('class', name, True))
+        elif symbol == '#':
+            conditions.append(('id', name, False))
+        else:
+            conditions.append((key, value or None, False))
+    return match.group(1).lower(), conditions
+
+
+class RegionFilter(ElementFilter):
+    r'''
+    Only create tags matching any of `regions` and their descendants while
+    parsing. Other tags and text are skipped, so no tree is built for them.
+    '''
+
+    def __init__(self, regions: Sequence[str]):
+        super().__init__()
+        self.regions = [parse_region(region) for region in regions]
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        attrs = attrs or {}
+        for tag_name, conditions in self.regions:
+            if tag_name and tag_name != name:
+                continue
+            for key, value, is_class in conditions:
+                attr = attrs.get(key)
+                if attr is None:
+                    break
+                if is_class:
+                    if value not in attr.split():
+                        break
+                elif value is not None and attr != value:
+                    break
+            else:
+                return True
+        return False
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+class Extractor:
+    r'''
+    Collect tags of fields declared by CSS selectors in one walk of the tree,
+    instead of walking the whole tree by `soup.select` of each field. Tags
+    matching `removals` are removed from the tree after the walk, e.g. scripts
+    and ads.
+
+    Each tag is only matched against selectors whose rightmost tag name is
+    the name of the tag. Selectors are matched before any tag is removed, so
+    selectors must not depend on siblings or children, e.g. `+`, `~`,
+    `:nth-child` and `:empty`.
+
+    `parse` only builds tree of `regions` and tags to remove, which must
+    contain every tag and every ancestor matched by selectors of fields, e.g.
+    `div.story` for `div.story > p`. Head, navigation and footer of pages are
+    skipped. Regions are closed by their own end tags, so pages whose end
+    tags inside a region close tags outside it, e.g. a stray `</section>`,
+    may differ from parsing whole pages.
+    '''
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        removals: Sequence[str] = (),
+        regions: Sequence[str] = None,
+    ):
+        self.fields = fields
+        self.removals = list(removals)
+        self.regions = None
+        if regions is not None:
+            # Tags to remove may contain fields, so they are parsed as well.
+            self.regions = RegionFilter([*regions, *self.removals])
+
+        # Indices of selectors which may match tags of each name. Selectors
+        # of any tag are included in all names.
+        self.selectors: List = list(fields.items())
+        if self.removals:
+            self.selectors.append((None, ', '.join(self.removals)))
+        self.named: Dict[str, List[int]] = {}
+        self.unnamed: List[int] = []
+        for idx, (name, selector) in enumerate(self.selectors):
+            compiled = soupsieve.compile(selector)
+            self.selectors[idx] = (name, compiled)
+            tag_names = get_tag_names(compiled)
+            if tag_names is None:
+                self.unnamed.append(idx)
+                continue
+            for tag_name in tag_names:
+                self.named.setdefault(tag_name, []).append(idx)
+        for indices in self.named.values():
+            indices.extend(self.unnamed)
+
+    def parse(self, markup: str) -> BeautifulSoup:
+        if self.regions is None or not PARTIAL or not HAS_ELEMENT_FILTER:
+            return BeautifulSoup(markup, 'html.parser')
+        return BeautifulSoup(markup, 'html.parser', parse_only=self.regions)
+
+    def extract(self, soup: BeautifulSoup) -> Extraction:
+        # Only public API of soupsieve is used. `SoupSieve.match` finds root
+        # of document for every tag, which is cheap compared to walking the
+        # whole tree by each selector.
+        matchers = [
+            (name, compiled.match)
+            for name, compiled in self.selectors
+        ]
+        tags = {name: [] for name in self.fields}
+        removed = []
+        named = self.named
+        unnamed = self.unnamed
+        for tag in soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            for idx in named.get(tag.name, unnamed):
+                name, match = matchers[idx]
+                if not match(tag):
+                    continue
+                if name is None:
+                    removed.append(tag)
+                else:
+                    tags[name].append(tag)
+
+        for tag in removed:
+            tag.extract()
+        return Extraction(soup=soup, tags=tags)
+
+
+def get_tag_names(compiled: soupsieve.SoupSieve):
+    r'''
+    Lower case tag names which `compiled` may match, or `None` if it may match
+    any tag, e.g. `.related_copy_content`.
+    '''
+    tag_names = set()
+    for selector in compiled.selectors:
+        if selector.tag is None or selector.tag.name == '*':
+            return None
+        tag_names.add(selector.tag.name.lower())
+    return tag_names
@@ -2,9 +2,8 @@ import re
 import unicodedata
 from datetime import datetime, timedelta
 
-from bs4 import BeautifulSoup
-
 from news.db.schema import News
+from news.preprocess.extract import Extractor
 
 REPORTER_END_PATTERNS = [
     re.compile(
@@ -77,6 +76,18 @@ CATEGORIES = {
     'W': '一般',
 }
 
+EXTRACTOR = Extractor(
+    fields={
+        'article': 'div#preface > p, div#newscontent > p',
+        'title': 'div.col-article > h1.text-center',
+    },
+    regions=[
+        'div#preface',
+        'div#newscontent',
+        'div.col-article',
+    ],
+)
+
 
 def parse(ori_news: News) -> News:
     """Parse FTV news from raw HTML.
@@ -93,14 +104,15 @@ def parse(ori_news: News) -> News:
 
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        article_tags = soup.select('div#preface > p, div#newscontent > p')
+        article_tags = fields.select('article')
         article = ' '.join(p_tag.text.strip() for p_tag in article_tags)
         article = unicodedata.normalize('NFKC', article).strip()
     except Exception:
@@ -165,7 +177,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('div.col-article > h1.text-center')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
         for pattern in BAD_TITLE_PATTERNS:
             match = pattern.search(title)
@@ -3,9 +3,9 @@ import unicodedata
 from datetime import datetime, timedelta
 
 import bs4
-from bs4 import BeautifulSoup
 
 from news.db.schema import News
+from news.preprocess.extract import Extractor
 
 BAD_ARTICLE_PATTERNS = [
     re.compile(r'^首次上稿.*?\d+:\d+$'),
@@ -31,6 +31,24 @@ REPORTER_PATTERNS = [
     re.compile(r'◎(.*?)\s+'),
 ]
 
+EXTRACTOR = Extractor(
+    fields={
+        'article': (
+            'div[itemprop=articleBody] div.boxText.text.boxTitle '
+            '> p:not([class])'
+        ),
+        'category': 'div.breadcrumbs > a',
+        'datetime': 'div.text.boxTitle.boxText > span.time',
+        'title': 'div.whitecon > h1',
+    },
+    regions=[
+        'div[itemprop=articleBody]',
+        'div.breadcrumbs',
+        'div.text.boxTitle.boxText',
+        'div.whitecon',
+    ],
+)
+
 
 def parse(ori_news: News) -> News:
     """Parse ltn news from raw HTML.
@@ -47,16 +65,15 @@ def parse(ori_news: News) -> News:
 
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        article_tags = soup.select(
-            'div[itemprop=articleBody] div.boxText.text.boxTitle > p:not([class])'
-        )
+        article_tags = fields.select('article')
         # Drop all p tags after related news.
         related_news_tag = list(filter(
             lambda tag: isinstance(tag.previous_sibling, bs4.element.Tag) and
@@ -83,7 +100,7 @@ def parse(ori_news: News) -> News:
     # News category.
     category = ''
     try:
-        category = soup.select('div.breadcrumbs > a')[-1].text
+        category = fields.select('category')[-1].text
         category = unicodedata.normalize('NFKC', category).strip()
     except Exception:
         # There may not have category.
@@ -93,7 +110,7 @@ def parse(ori_news: News) -> News:
     news_datetime = ''
     try:
         news_datetime = datetime.strptime(
-            soup.select('div.text.boxTitle.boxText > span.time')[0].text,
+            fields.select('datetime')[0].text,
             ' %Y/%m/%d %H:%M',
         )
         # Convert to UTC.
@@ -119,7 +136,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('div.whitecon > h1')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
     except Exception:
         raise ValueError('Fail to parse ltn news title.')
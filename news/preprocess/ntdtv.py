@@ -3,9 +3,9 @@ import unicodedata
 from datetime import datetime, timedelta
 
 import dateutil.parser
-from bs4 import BeautifulSoup
 
 from news.db.schema import News
+from news.preprocess.extract import Extractor
 
 BAD_TITLE_PATTERNS = [
     re.compile(r'【.*?】'),
@@ -30,6 +30,19 @@ URL_PATTERN = re.compile(
     r'https://www.ntdtv.com/b5/(\d+)/(\d+)/(\d+)/a\d+.html'
 )
 
+EXTRACTOR = Extractor(
+    fields={
+        'article': 'div[itemprop=articleBody].post_content > p',
+        'category': 'div#breadcrumb > a',
+        'title': 'div.article_title > h1',
+    },
+    regions=[
+        'div[itemprop=articleBody].post_content',
+        'div#breadcrumb',
+        'div.article_title',
+    ],
+)
+
 
 def parse(ori_news: News) -> News:
     """Parse ntdtv news from raw HTML.
@@ -45,16 +58,17 @@ def parse(ori_news: News) -> News:
     )
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
         article_tags = []
         # Drop p tags if they are related news.
-        for tag in soup.select('div[itemprop=articleBody].post_content > p'):
+        for tag in fields.select('article'):
             if '【熱門話題】' in tag.text:
                 break
             elif '相關鏈接：' in tag.text:
@@ -70,7 +84,7 @@ def parse(ori_news: News) -> News:
     # News category.
     category = ''
     try:
-        category = soup.select('div#breadcrumb > a')[-1].text
+        category = fields.select('category')[-1].text
         category = unicodedata.normalize('NFKC', category).strip()
     except Exception:
         # There may not have category.
@@ -115,7 +129,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('div.article_title > h1')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
         # Discard trash news.
         if '【熱門話題】' in title:
@@ -0,0 +1,390 @@
+import ast
+import contextlib
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import pickle
+import time
+import tracemalloc
+import types
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence, Set, Tuple
+
+import news.db
+import news.preprocess.profiler
+
+# Output of each stage is stored as `{key}.pkl`.
+CACHE_DIR = os.path.join(news.db.util.DATA_PATH, 'preprocess_cache')
+
+
+# Default settings of pipeline spec of `run_preprocess.py`.
+DEFAULT_SPEC: Dict[str, Any] = {
+    # Databases under `data` whose `news_table` is read and written.
+    'input_db': None,
+    'output_db': None,
+    # List of `{"name": ..., "params": {...}}`.
+    'stages': [],
+    'n_workers': 1,
+    # Number of records processed by each worker at a time, all records if
+    # `None`.
+    'chunk_size': None,
+    # Whether cache output of each stage.
+    'cache': True,
+}
+
+
+@dataclass
+class Stage:
+    r'''
+    Preprocessing function `func(dataset, **params)` which returns dataset,
+    e.g. `Stage(length_filter, {'min_bound': 200, 'max_bound': 1000})`.
+    Change `version` to invalidate cached output when behavior changes out of
+    the module of `func`, e.g. upgraded libraries, models or functions of
+    other modules.
+    '''
+    func: Callable[..., List[Dict]]
+    params: Dict[str, Any] = field(default_factory=dict)
+    version: str = ''
+
+    @property
+    def name(self) -> str:
+        return self.func.__name__
+
+
+def get_path_key(path: str) -> str:
+    r'''
+    Fingerprint of file or directory by names, sizes and modified times, so
+    that it changes when files are written again without reading them.
+    '''
+    paths = [path]
+    if os.path.isdir(path):
+        paths = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(path)
+            for name in names
+        )
+
+    h = hashlib.sha256()
+    for file_path in paths:
+        stat = os.stat(file_path)
+        h.update(
+            f'{file_path}\0{stat.st_size}\0{stat.st_mtime_ns}\0'.encode()
+        )
+    return h.hexdigest()
+
+
+def get_code_names(code: types.CodeType) -> Set[str]:
+    r'''
+    Names of globals and attributes referenced by `code`, including nested
+    functions, lambdas and comprehensions.
+    '''
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= get_code_names(const)
+    return names
+
+
+def get_func_source(func: Callable) -> str:
+    r'''
+    Source code of `func`, of functions and classes of its module which it
+    references recursively, and of assignments of other globals it
+    references, e.g. constants. Imported names, e.g. modules and functions of
+    other modules, are excluded, see `Stage.version`.
+    '''
+    module = inspect.getmodule(func)
+    module_source = inspect.getsource(module)
+    assignments: Dict[str, List[str]] = {}
+    for node in ast.parse(module_source).body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+            targets = [node.target]
+        else:
+            continue
+        for target in targets:
+            for name in ast.walk(target):
+                if isinstance(name, ast.Name):
+                    assignments.setdefault(name.id, []).append(
+                        ast.get_source_segment(module_source, node)
+                    )
+
+    sources = []
+    seen = {inspect.unwrap(func)}
+    stack = [inspect.unwrap(func)]
+    while stack:
+        obj = stack.pop()
+        sources.append(inspect.getsource(obj))
+        if inspect.isclass(obj):
+            codes = [
+                inspect.unwrap(attr).__code__
+                for attr in vars(obj).values()
+                if inspect.isfunction(inspect.unwrap(attr))
+            ]
+        else:
+            codes = [obj.__code__]
+
+        names = set()
+        for code in codes:
+            names |= get_code_names(code)
+        for name in sorted(names, reverse=True):
+            if name not in vars(module):
+                continue
+            value = vars(module)[name]
+            if inspect.ismodule(value):
+                continue
+            if inspect.isfunction(value) or inspect.isclass(value):
+                value = inspect.unwrap(value)
+                if inspect.getmodule(value) is module and value not in seen:
+                    seen.add(value)
+                    stack.append(value)
+            else:
+                # Source of assignment rather than value, which may be a
+                # cache filled while running, e.g. `NER_RESULTS`.
+                sources.extend(assignments.get(name, []))
+    return '\n'.join(sources)
+
+
+def get_stage_key(input_key: str, stage: Stage) -> str:
+    r'''
+    Key of stage output, which changes with key of stage input, version and
+    parameters of stage, source code of the stage with helpers and constants
+    of its module (see `get_func_source`), and files given as parameters,
+    e.g. NER results.
+    '''
+    h = hashlib.sha256()
+    h.update(input_key.encode())
+    h.update(get_func_source(stage.func).encode())
+    h.update(stage.version.encode())
+    h.update(json.dumps(stage.params, sort_keys=True).encode())
+    for value in stage.params.values():
+        if isinstance(value, str) and os.path.exists(value):
+            h.update(get_path_key(value).encode())
+    return h.hexdigest()
+
+
+def load_cache(cache_dir: str, key: str) -> List[Dict]:
+    with open(os.path.join(cache_dir, f'{key}.pkl'), 'rb') as f:
+        return pickle.load(f)
+
+
+def save_cache(cache_dir: str, key: str, dataset: List[Dict]):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f'{key}.pkl')
+    # Write to temporary file first so that interrupted writing is never
+    # loaded as cache.
+    with open(f'{path}.tmp', 'wb') as f:
+        pickle.dump(dataset, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f'{path}.tmp', path)
+
+
+def apply_stage(
+    stage: Stage,
+    chunk: List[Dict],
+    trace_memory: bool = False,
+    sample_interval: float = None,
+) -> Tuple[List[Dict], Dict[str, Any]]:
+    r'''
+    Run `stage` on `chunk` and measure it in the running process. Return
+    output and metrics of the chunk.
+    '''
+    metrics = {
+        'cpu_seconds': 0.0,
+        'n_chars': news.preprocess.profiler.count_chars(chunk),
+        'peak_bytes': None,
+        'samples': None,
+    }
+
+    sampler = contextlib.nullcontext()
+    if sample_interval is not None:
+        sampler = news.preprocess.profiler.Sampler(interval=sample_interval)
+    if trace_memory:
+        tracemalloc.start()
+    begin = time.process_time()
+    with sampler:
+        output = stage.func(chunk, **stage.params)
+    metrics['cpu_seconds'] = time.process_time() - begin
+    if trace_memory:
+        # Memory allocated by stage, excluding `chunk`.
+        metrics['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if sample_interval is not None:
+        metrics['samples'] = sampler.get_samples()
+
+    return output, metrics
+
+
+def run_stage(
+    stage: Stage,
+    dataset: List[Dict],
+    chunk_size: int = None,
+    executor: Executor = None,
+    *,
+    trace_memory: bool = False,
+    sample_interval: float = None,
+) -> Tuple[List[Dict], Dict[str, Any]]:
+    r'''
+    Run `stage` on chunks of `chunk_size` records, by `executor` if given.
+    Output of each record must only depend on the record itself, so that
+    chunks give the same output as the whole dataset. Data shared by records
+    is loaded by each process, e.g. NER results of `ner_tag_subs` and
+    `date_filter` are loaded once per process by
+    `news.preprocess.preprocess.get_ner_result` and reused by later chunks.
+    Return output and metrics summed over chunks, except `peak_bytes` of the
+    largest chunk.
+    '''
+    if chunk_size is None:
+        chunk_size = max(len(dataset), 1)
+    chunks = [
+        dataset[idx:idx + chunk_size]
+        for idx in range(0, len(dataset), chunk_size)
+    ]
+
+    args = (
+        itertools.repeat(stage),
+        chunks,
+        itertools.repeat(trace_memory),
+        itertools.repeat(sample_interval),
+    )
+    if executor is None:
+        outputs = map(apply_stage, *args)
+    else:
+        outputs = executor.map(apply_stage, *args)
+
+    result = []
+    metrics = {
+        'cpu_seconds': 0.0,
+        'n_chars': 0,
+        'peak_bytes': None,
+        'samples': None,
+    }
+    chunk_samples = []
+    for output, chunk_metrics in outputs:
+        result.extend(output)
+        metrics['cpu_seconds'] += chunk_metrics['cpu_seconds']
+        metrics['n_chars'] += chunk_metrics['n_chars']
+        if chunk_metrics['peak_bytes'] is not None:
+            metrics['peak_bytes'] = max(
+                metrics['peak_bytes'] or 0,
+                chunk_metrics['peak_bytes'],
+            )
+        if chunk_metrics['samples'] is not None:
+            chunk_samples.append(chunk_metrics['samples'])
+    if sample_interval is not None:
+        metrics['samples'] = news.preprocess.profiler.merge_samples(
+            chunk_samples
+        )
+    return result, metrics
+
+
+def run_stages(
+    load: Callable[[], List[Dict]],
+    input_key: str,
+    stages: Sequence[Stage],
+    cache_dir: str = CACHE_DIR,
+    *,
+    n_workers: int = 1,
+    chunk_size: int = None,
+    trace_memory: bool = False,
+    sample_interval: float = None,
+    debug: bool = False,
+) -> Tuple[List[Dict], List[Dict[str, Any]]]:
+    r'''
+    Run `stages` on dataset returned by `load`. Output of each stage is cached
+    in `cache_dir`, so only stages after the last unchanged stage are run, and
+    `load` is not called when any stage is cached. `input_key` identifies the
+    dataset, e.g. `get_path_key(db_path)`. Nothing is cached if `cache_dir` is
+    `None`.
+
+    Each stage runs on chunks of `chunk_size` records in `n_workers`
+    processes. Chunks only bound memory allocated by stages: whole dataset
+    and output of the running stage are kept in memory. Return dataset and
+    statistics of each stage: wall and CPU seconds, records in and out and
+    characters of input. Peak memory allocated by stage is traced with
+    `trace_memory`, which slows stages down. Stacks are sampled every
+    `sample_interval` seconds if given.
+    '''
+    keys = []
+    key = input_key
+    for stage in stages:
+        key = get_stage_key(input_key=key, stage=stage)
+        keys.append(key)
+
+    # Resume from the last cached stage.
+    start = 0
+    if cache_dir is not None:
+        for idx in reversed(range(len(stages))):
+            if os.path.exists(os.path.join(cache_dir, f'{keys[idx]}.pkl')):
+                start = idx + 1
+                break
+
+    stats = [{'stage': stage.name, 'cached': True} for stage in stages[:start]]
+    if start == 0:
+        dataset = load()
+    else:
+        if debug:
+            print(f'Load cached output of `{stages[start - 1].name}`.')
+        dataset = load_cache(cache_dir=cache_dir, key=keys[start - 1])
+
+    executor = None
+    if n_workers > 1 and start < len(stages):
+        executor = ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        for stage, key in zip(stages[start:], keys[start:]):
+            if debug:
+                print(f'Run `{stage.name}`.')
+            n_in = len(dataset)
+            begin = time.perf_counter()
+            dataset, metrics = run_stage(
+                stage=stage,
+                dataset=dataset,
+                chunk_size=chunk_size,
+                executor=executor,
+                trace_memory=trace_memory,
+                sample_interval=sample_interval,
+            )
+            stats.append({
+                'stage': stage.name,
+                'cached': False,
+                'seconds': time.perf_counter() - begin,
+                'n_in': n_in,
+                'n_out': len(dataset),
+                **metrics,
+            })
+            if cache_dir is not None:
+                save_cache(cache_dir=cache_dir, key=key, dataset=dataset)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return dataset, stats
+
+
+def get_stages(
+    spec: Sequence[Dict[str, Any]],
+    stage_dict: Dict[str, Callable[..., List[Dict]]],
+) -> List[Stage]:
+    r'''
+    Build stages from `spec`, e.g.
+    `[{"name": "length_filter", "params": {"min_bound": 200}}]`, where names
+    are keys of `stage_dict`. `version` of each stage is optional.
+    '''
+    stages = []
+    for stage_spec in spec:
+        unknown_keys = set(stage_spec) - {'name', 'params', 'version'}
+        if unknown_keys:
+            raise ValueError(f'Unknown stage settings {sorted(unknown_keys)}.')
+        if stage_spec.get('name') not in stage_dict:
+            raise ValueError(
+                f'Stage must be one of {sorted(stage_dict)}, '
+                f'got {stage_spec.get("name")}.'
+            )
+        stages.append(Stage(
+            func=stage_dict[stage_spec['name']],
+            params=stage_spec.get('params', {}),
+            version=stage_spec.get('version', ''),
+        ))
+    return stages
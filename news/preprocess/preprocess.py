@@ -3,13 +3,15 @@ import json
 import os
 import re
 import sqlite3
+import time
 import unicodedata
 
-from ckip_transformers import __version__
-from ckip_transformers.nlp import CkipNerChunker
-from dataset import Allcolumn
 from tqdm import tqdm
 
+import news.db
+import news.preprocess.pipeline
+from news.preprocess.pipeline import Stage
+
 
 def load_database(db_name):
     r"""
@@ -17,6 +19,9 @@ def load_database(db_name):
     Return a list of dictionary.
     The keys in dictionary is every column of database except `raw_xml`.
     """
+    # Import here so that stages can run without `torch`.
+    from news.preprocess.dataset import Allcolumn
+
     dataset = Allcolumn(db_name)
     dataset = [i for i in dataset]
     return dataset
@@ -65,59 +70,23 @@ def read_ner_result(NER_result_dir):
     return title_NER_results, article_NER_results
 
 
-def NER_dataset(dataset, save_dir):
-
-    if not os.path.exists(save_dir):
-        os.mkdir(save_dir)
-
-    ner_driver = CkipNerChunker(level=3, device=0)
-    # NER title.
-    index = 0
-    while index < len(dataset):
-        end = index + 20000
-        if end > len(dataset):
-            end = len(dataset)
-        sentences = [[dic['id'], unicodedata.normalize(
-            'NFKC', dic['title'])] for dic in dataset[index: end]]
-
-        ner = ner_driver(list(zip(*sentences))[1], batch_size=8)
-
-        ner_result = []
-        for sentence, sentence_ner in zip(sentences, ner):
-            ner_result.append(
-                {
-                    'id': sentence[0],
-                    'title': sentence[1],
-                    'NER_result': [{'word': enty.word, 'ner': enty.ner, 'idx': enty.idx} for enty in sentence_ner]
-                }
-            )
-        json.dump(ner_result, open(
-            f'{save_dir}/title-{index}.json', 'w', encoding='utf8'))
-        index = end
-
-    # NER article.
-    index = 0
-    while index < len(dataset):
-        end = index + 20000
-        if end > len(dataset):
-            end = len(dataset)
-        sentences = [[dic['id'], unicodedata.normalize(
-            'NFKC', dic['article'])] for dic in dataset[index: end]]
-
-        ner = ner_driver(list(zip(*sentences))[1], batch_size=8)
-
-        ner_result = []
-        for sentence, sentence_ner in zip(sentences, ner):
-            ner_result.append(
-                {
-                    'id': sentence[0],
-                    'article': sentence[1],
-                    'NER_result': [{'word': enty.word, 'ner': enty.ner, 'idx': enty.idx} for enty in sentence_ner]
-                }
-            )
-        json.dump(ner_result, open(
-            f'{save_dir}/article-{index}.json', 'w', encoding='utf8'))
-        index = end
+# NER results loaded by this process, keyed by directory. Stages run on many
+# chunks in each worker process, so results are only loaded again when files
+# change. Stages must not modify cached results.
+NER_RESULTS = {}
+
+
+def get_ner_result(NER_result_dir):
+    r"""
+    Load NER result once per process. See `read_ner_result`.
+    """
+    path_key = news.preprocess.pipeline.get_path_key(NER_result_dir)
+    if NER_RESULTS.get(NER_result_dir, (None,))[0] != path_key:
+        NER_RESULTS[NER_result_dir] = (
+            path_key,
+            read_ner_result(NER_result_dir),
+        )
+    return NER_RESULTS[NER_result_dir][1]
 
 
 def ner_tag_subs(dataset, tag_dict, NER_result_dir):
@@ -132,7 +101,7 @@ def ner_tag_subs(dataset, tag_dict, NER_result_dir):
     表示所有ORG的entity要被換為`<org>`這個tag，以及LOC和GPE都被換為`<loc1>`這種格式的tag(ID會根據名稱不同改變)
     """
 
-    title_ner, article_ner = read_ner_result(NER_result_dir)
+    title_ner, article_ner = get_ner_result(NER_result_dir)
     for data in tqdm(dataset):
         index = data['id']
         a_ner = next(i for i in article_ner if i['id'] == index)['NER_result']
@@ -213,11 +182,12 @@ def date_filter(dataset, NER_result_dir):
             return r'<num>月<num>日'
         else:
             return False
-    title_ner, article_ner = read_ner_result(NER_result_dir)
+    title_ner, article_ner = get_ner_result(NER_result_dir)
     for data in tqdm(dataset):
         index = data['id']
-        ner_result = next(i for i in article_ner if i['id'] == index)[
-            'NER_result']
+        # Copy since NER results are shared by chunks.
+        ner_result = list(next(i for i in article_ner if i['id'] == index)[
+            'NER_result'])
         ner_result.extend(
             next(i for i in title_ner if i['id'] == index)['NER_result'])
 
@@ -350,46 +320,30 @@ def language_filter(dataset):
     return dataset
 
 
-def save_in_db(db_name, data):
-    def create_table(db_name):
-        # If `db_name` not exist then create db file.
-        if not os.path.exists(db_name):
-            open(db_name, 'w').close()
-
-        instruct = u"""CREATE TABLE IF NOT EXISTS news_table (
-            id integer PRIMARY KEY,
-            url text,
-            time text,
-            company text,
-            label text,
-            reporter text,
-            title text,
-            article text,
-            raw_xml text
-        ); """
-        conn_db = sqlite3.connect(db_name)
-        c = conn_db.cursor()
-        c.execute(instruct)
-        conn_db.commit()
-        conn_db.close()
-
-    def write_in_db(data, db_name):
-        conn_db = sqlite3.connect(db_name)
-        c = conn_db.cursor()
-        # db_url = list(c.execute('SELECT url from news_table'))
-        # db_url = list(map(lambda x: x[0], db_url))
-
-        # preprocessed_data = [tuple(i.values())
-        #                      for i in data if i['url'] not in db_url]
-        data = [list(i.values()) for i in data]
-        for i in data:
-            i.append(None)
-        c.executemany(
-            'INSERT INTO news_table(id, url, time, company, label, reporter, title, article, raw_xml) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', tuple(data))
-        conn_db.commit()
-        conn_db.close()
-    create_table(db_name)
-    write_in_db(data, db_name)
+def save_in_db(db_name, data, batch_size=10000):
+    r"""
+    Write `data` into `news_table` of `db_name` in batches and report
+    throughput. `data` can be any iterable of dictionary whose keys are
+    columns of `news_table`.
+    """
+    conn_db = sqlite3.connect(db_name)
+    news.db.util.set_profile(conn=conn_db, profile='bulk-import')
+    c = conn_db.cursor()
+    news.db.preprocessed.create_table(cur=c)
+
+    start = time.perf_counter()
+    n_written = 0
+    for n_written in news.db.preprocessed.write_records(
+        cur=c,
+        records=data,
+        batch_size=batch_size,
+        defer_index=True,
+    ):
+        elapsed = time.perf_counter() - start
+        print(f'\rSaved {n_written} news, {n_written / elapsed:.1f} news/s.',
+              end='')
+    print()
+    conn_db.close()
 
 
 def deEmojify(text):
@@ -462,66 +416,75 @@ def get_id_data(id_list, dataset):
 
 def merge_db(input_db, save_db):
     r"""
-    Put `input_db` in `save_db`.
+    Put `input_db` in `save_db`, skipping news whose url is already in
+    `save_db`. Return number of merged news.
     """
-    def write_in_db(data, db_name):
-        conn_db = sqlite3.connect(db_name)
-        c = conn_db.cursor()
-        db_url = list(c.execute('SELECT url from news_table'))
-        db_url = list(map(lambda x: x[0], db_url))
-
-        preprocessed_data = [tuple(i.values())
-                             for i in data if i['url'] not in db_url]
-        data = [list(i.values())[1:] for i in data]
-        for i in data:
-            i.append(None)
-        c.executemany(
-            'INSERT INTO news_table(url, time, company, label, reporter, title, article, raw_xml) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', tuple(data))
-        conn_db.commit()
-        conn_db.close()
-
-    print('Loading `input_db` ...')
-    dataset = load_database(input_db)
-
-    print('Merging two db ...')
-    write_in_db(dataset, save_db)
-
-    # Load merged database as return value.
-    print('Loading return value ...')
-    dataset = load_database(save_db)
-
+    conn_db = sqlite3.connect(save_db)
+    n_merged = 0
+    for n_scanned, n_ids, n_merged in news.db.merge.merge_records(
+        cur=conn_db.cursor(),
+        src_path=input_db,
+        table='news_table',
+    ):
+        print(f'Merged {n_merged} news, scanned {n_scanned}/{n_ids} ids.')
+    conn_db.close()
+    return n_merged
+
+
+# Stages which can be used in pipeline spec of `run_preprocess.py`.
+STAGES = {
+    func.__name__: func
+    for func in [
+        NFKC,
+        date_filter,
+        emoji_filter,
+        guillemet_filter,
+        language_filter,
+        length_filter,
+        ner_tag_subs,
+        not_CJK_filter,
+        number_filter,
+        parentheses_filter,
+        url_filter,
+        whitespace_filter,
+    ]
+}
+
+# Not replace word to tag.
+BASE_STAGES = [
+    Stage(NFKC),
+    Stage(url_filter),
+    Stage(whitespace_filter),
+    Stage(length_filter, {'min_bound': 200, 'max_bound': 1000}),
+    Stage(parentheses_filter),
+    Stage(emoji_filter),
+    Stage(not_CJK_filter),
+    Stage(length_filter, {'min_bound': 200, 'max_bound': 1000}),
+]
+
+
+def run_pipeline(db_name, stages):
+    r"""
+    Run `stages` on database `db_name`. Output of each stage is cached, so
+    only stages after the last unchanged stage are run again.
+    """
+    dataset, _ = news.preprocess.pipeline.run_stages(
+        load=lambda: load_database(db_name),
+        input_key=news.preprocess.pipeline.get_path_key(db_name),
+        stages=stages,
+        debug=True,
+    )
     return dataset
 
 
 def base_preprocess(db_name, save_db_name):
-    # Not replace word to tag.
-    dataset = load_database(db_name)
-    dataset = NFKC(dataset)
-    dataset = url_filter(dataset)
-    dataset = whitespace_filter(dataset)
-    dataset = length_filter(dataset, 200, 1000)
-    dataset = parentheses_filter(dataset)
-    dataset = emoji_filter(dataset)
-    dataset = not_CJK_filter(dataset)
-    dataset = length_filter(dataset, 200, 1000)
+    dataset = run_pipeline(db_name, BASE_STAGES)
     save_in_db(save_db_name, dataset)
 
 
 def main():
-    dataset = load_database('temp_v2.3.db')
-
-    # Not replace word to tag.
-    # dataset = NFKC(dataset)
-    # dataset = url_filter(dataset)
-    # dataset = whitespace_filter(dataset)
-    # dataset = length_filter(dataset, min_bound=200, max_bound=1000)
-    # dataset = parentheses_filter(dataset)
-    # dataset = emoji_filter(dataset)
-    # dataset = not_CJK_filter(dataset)
-    # dataset = length_filter(dataset, min_bound=200, max_bound=1000)
-
     # NER dataset and save result.
-    # NER_dataset(dataset, 'temp_v2.3')
+    # NER_dataset(load_database('temp_v2.3.db'), 'temp_v2.3')
 
     # Replace tag preprocess.
     tag_dict = [
@@ -530,15 +493,16 @@ def main():
         {'type': ['PERSON'], 'tag': 'per', 'NeedID': True},
         {'type': ['FAC'], 'tag': 'fac', 'NeedID': True}
     ]
-    dataset = ner_tag_subs(
-        dataset,
-        tag_dict=tag_dict,
-        NER_result_dir='v2.3result'
-    )
-    dataset = date_filter(dataset, NER_result_dir='v2.3result')
-    dataset = language_filter(dataset)
-    dataset = guillemet_filter(dataset)
-    dataset = number_filter(dataset)
+    dataset = run_pipeline('temp_v2.3.db', [
+        Stage(
+            ner_tag_subs,
+            {'tag_dict': tag_dict, 'NER_result_dir': 'v2.3result'},
+        ),
+        Stage(date_filter, {'NER_result_dir': 'v2.3result'}),
+        Stage(language_filter),
+        Stage(guillemet_filter),
+        Stage(number_filter),
+    ])
     save_in_db(db_name='news_FAC_v2.4.2.db', data=dataset)
 
 
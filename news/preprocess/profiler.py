@@ -0,0 +1,144 @@
+import collections
+import os
+import sys
+import threading
+from typing import Any, Dict, Sequence
+
+# Number of functions shown by `format_samples`.
+TOP_N = 20
+
+
+def count_chars(dataset: Sequence[Dict]) -> int:
+    r'''
+    Number of characters of `title` and `article` in `dataset`.
+    '''
+    n_chars = 0
+    for data in dataset:
+        for column in ['title', 'article']:
+            if isinstance(data.get(column), str):
+                n_chars += len(data[column])
+    return n_chars
+
+
+class Sampler:
+    r'''
+    Sampling profiler of the thread which enters it. Another thread records
+    stack of the profiled thread every `interval` seconds, so overhead does
+    not grow with number of function calls like `cProfile`.
+
+    `self` counts samples where a function is running, and `total` counts
+    samples where a function is in stack.
+    '''
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = {
+            'self': collections.Counter(),
+            'total': collections.Counter(),
+        }
+        self.thread_id = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        self.thread_id = threading.get_ident()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop_event.set()
+        self.thread.join()
+
+    def sample(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            self.samples['self'][get_frame_name(frame)] += 1
+            names = set()
+            while frame is not None:
+                names.add(get_frame_name(frame))
+                frame = frame.f_back
+            self.samples['total'].update(names)
+
+    def get_samples(self) -> Dict[str, Dict[str, int]]:
+        return {
+            kind: dict(counter)
+            for kind, counter in self.samples.items()
+        }
+
+
+def get_frame_name(frame) -> str:
+    code = frame.f_code
+    return (
+        f'{code.co_name} '
+        f'({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+    )
+
+
+def merge_samples(
+    samples: Sequence[Dict[str, Dict[str, int]]],
+) -> Dict[str, Dict[str, int]]:
+    merged = {
+        'self': collections.Counter(),
+        'total': collections.Counter(),
+    }
+    for sample in samples:
+        for kind, counts in sample.items():
+            merged[kind].update(counts)
+    return {kind: dict(counter) for kind, counter in merged.items()}
+
+
+def format_stats(stats: Sequence[Dict[str, Any]]) -> str:
+    r'''
+    Table of statistics returned by `news.preprocess.pipeline.run_stages`.
+    '''
+    lines = [
+        f'{"stage":<20}{"in":>9}{"out":>9}{"dropped":>9}{"seconds":>9}'
+        f'{"cpu":>9}{"records/s":>11}{"chars/s":>12}{"peak MiB":>10}'
+    ]
+    for stat in stats:
+        if stat['cached']:
+            lines.append(f'{stat["stage"]:<20}{"cached":>9}')
+            continue
+
+        seconds = max(stat['seconds'], 1e-9)
+        peak = '-'
+        if stat['peak_bytes'] is not None:
+            peak = f'{stat["peak_bytes"] / 1024 ** 2:.1f}'
+        lines.append(
+            f'{stat["stage"]:<20}{stat["n_in"]:>9}{stat["n_out"]:>9}'
+            f'{stat["n_in"] - stat["n_out"]:>9}{stat["seconds"]:>9.2f}'
+            f'{stat["cpu_seconds"]:>9.2f}{stat["n_in"] / seconds:>11.1f}'
+            f'{stat["n_chars"] / seconds:>12.0f}{peak:>10}'
+        )
+    return '\n'.join(lines)
+
+
+def format_samples(
+    samples: Dict[str, Dict[str, int]],
+    top_n: int = TOP_N,
+) -> str:
+    r'''
+    Functions with the most samples, in percentage of all samples.
+    '''
+    n_samples = max(sum(samples['self'].values()), 1)
+    lines = [f'{"self %":>7}{"total %":>8}  function']
+    for name, count in collections.Counter(samples['self']).most_common(
+        top_n
+    ):
+        lines.append(
+            f'{count / n_samples:>7.1%}'
+            f'{samples["total"].get(name, 0) / n_samples:>8.1%}  {name}'
+        )
+    return '\n'.join(lines)
+
+
+def get_slowest_stage(stats: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    run_stats = [stat for stat in stats if not stat['cached']]
+    if not run_stats:
+        return None
+    return max(run_stats, key=lambda stat: stat['seconds'])
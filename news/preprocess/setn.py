@@ -2,9 +2,8 @@ import re
 import unicodedata
 from datetime import datetime, timedelta
 
-from bs4 import BeautifulSoup
-
 from news.db.schema import News
+from news.preprocess.extract import Extractor
 
 CATEGORIES = {
     0: '熱門',
@@ -34,6 +33,24 @@ REPORTER_PATTERNS = [
     re.compile(r'^.*?/(.*?)報導$'),
 ]
 
+EXTRACTOR = Extractor(
+    fields={
+        'article': 'div#Content1 > p:not([class]):not([style])',
+        'category': (
+            'input[type=hidden]#pageGroupID, input[type=hidden]#hfPageGroupId'
+        ),
+        'datetime': 'time.page-date',
+        'title': 'h1.news-title-3',
+    },
+    regions=[
+        'div#Content1',
+        'input#pageGroupID',
+        'input#hfPageGroupId',
+        'time.page-date',
+        'h1.news-title-3',
+    ],
+)
+
 
 def parse(ori_news: News) -> News:
     """Parse SET news from raw HTML.
@@ -50,16 +67,15 @@ def parse(ori_news: News) -> News:
 
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        article_tags = soup.select(
-            'div#Content1 > p:not([class]):not([style])'
-        )
+        article_tags = fields.select('article')
         # Joint remaining text.
         article = ' '.join(filter(
             bool,
@@ -72,9 +88,7 @@ def parse(ori_news: News) -> News:
     # News category.
     category = ''
     try:
-        category = CATEGORIES[soup.select(
-            'input[type=hidden]#pageGroupID, input[type=hidden]#hfPageGroupId'
-        )[0]['value']]
+        category = CATEGORIES[fields.select('category')[0]['value']]
         category = unicodedata.normalize('NFKC', category).strip()
     except Exception:
         # There may not have category.
@@ -83,7 +97,7 @@ def parse(ori_news: News) -> News:
     # News datetime.
     news_datetime = ''
     try:
-        time_tag = soup.select('time.page-date')[0]
+        time_tag = fields.select('datetime')[0]
         news_datetime = datetime.strptime(time_tag.text, '%Y/%m/%d %H:%M:%S')
         # Convert to UTC.
         news_datetime = news_datetime - timedelta(hours=8)
@@ -109,7 +123,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('h1.news-title-3')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
     except Exception:
         raise ValueError('Fail to parse SET news title.')
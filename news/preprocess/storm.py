@@ -2,9 +2,27 @@ import re
 import unicodedata
 from datetime import datetime, timedelta
 
-from bs4 import BeautifulSoup
-
 from news.db.schema import News
+from news.preprocess.extract import Extractor
+
+EXTRACTOR = Extractor(
+    fields={
+        'article': (
+            'div#article_inner_wrapper > article > div#CMS_wrapper > p[aid]'
+        ),
+        'category': 'div#title_tags_wrapper a',
+        'datetime': 'span#info_time',
+        'reporter': 'div#author_block span.info_author',
+        'title': 'h1#article_title',
+    },
+    regions=[
+        'div#article_inner_wrapper',
+        'div#title_tags_wrapper',
+        'span#info_time',
+        'div#author_block',
+        'h1#article_title',
+    ],
+)
 
 
 def parse(ori_news: News) -> News:
@@ -22,16 +40,15 @@ def parse(ori_news: News) -> News:
 
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        article_tags = soup.select(
-            'div#article_inner_wrapper > article > div#CMS_wrapper > p[aid]'
-        )
+        article_tags = fields.select('article')
         for article_tag in article_tags:
             # Discard related news.
             for related_tag in article_tag.select('.related_copy_content'):
@@ -48,7 +65,7 @@ def parse(ori_news: News) -> News:
     # News category.
     category = ''
     try:
-        category_tags = soup.select('div#title_tags_wrapper a')
+        category_tags = fields.select('category')
         category = ','.join(map(lambda tag: tag.text.strip(), category_tags))
         category = unicodedata.normalize('NFKC', category).strip()
     except Exception:
@@ -59,7 +76,7 @@ def parse(ori_news: News) -> News:
     news_datetime = ''
     try:
         news_datetime = datetime.strptime(
-            soup.select('span#info_time')[0].text,
+            fields.select('datetime')[0].text,
             '%Y-%m-%d %H:%M',
         )
         # Convert to UTC.
@@ -73,7 +90,7 @@ def parse(ori_news: News) -> News:
     # News reporter.
     reporter = ''
     try:
-        reporter = soup.select('div#author_block span.info_author')[0].text
+        reporter = fields.select('reporter')[0].text
         reporter = unicodedata.normalize('NFKC', reporter).strip()
     except Exception:
         # There may not have reporter.
@@ -82,7 +99,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('h1#article_title')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
     except Exception:
         # storm response 404 with status code 200.
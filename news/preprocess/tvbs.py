@@ -4,9 +4,9 @@ from datetime import timedelta
 
 import bs4
 import dateutil.parser
-from bs4 import BeautifulSoup
 
 from news.db.schema import News
+from news.preprocess.extract import Extractor
 
 DROP_ARTICLE_PATTERNS = [
     re.compile(r'因應新冠肺炎疫情，疾管署持續疫情監測與邊境管制措施，'),
@@ -42,6 +42,21 @@ CATEGORIES = {
 }
 CATEGORY_PATTERN = re.compile(r'https://news.tvbs.com.tw/(.*?)/\d+')
 
+EXTRACTOR = Extractor(
+    fields={
+        'article': 'div#news_detail_div > html > body',
+        'datetime': 'meta[name=pubdate]',
+        'reporter': 'div.author_box > div.author > a',
+        'title': 'div.title_box > h1.title',
+    },
+    regions=[
+        'div#news_detail_div',
+        'meta[name=pubdate]',
+        'div.author_box',
+        'div.title_box',
+    ],
+)
+
 
 def parse(ori_news: News) -> News:
     """Parse TVBS news from raw HTML.
@@ -58,14 +73,15 @@ def parse(ori_news: News) -> News:
 
     soup = None
     try:
-        soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(parsed_news.raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        article_node = soup.select('div#news_detail_div > html > body')[0]
+        article_node = fields.select('article')[0]
         # Discard image, caption and related news.
         for tag in article_node.select('div.img, div[style], span.endtext, b'):
             tag.extract()
@@ -115,7 +131,7 @@ def parse(ori_news: News) -> News:
     try:
         # Convert to UTC.
         news_datetime = dateutil.parser.isoparse(
-            soup.select('meta[name=pubdate]')[0]['content']
+            fields.select('datetime')[0]['content']
         ) - timedelta(hours=8)
         news_datetime = news_datetime.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
         news_datetime = unicodedata.normalize('NFKC', news_datetime)
@@ -126,7 +142,7 @@ def parse(ori_news: News) -> News:
     # News reporter.
     reporter = ''
     try:
-        reporter = soup.select('div.author_box > div.author > a')[0].text
+        reporter = fields.select('reporter')[0].text
         reporter = unicodedata.normalize('NFKC', reporter).strip()
     except Exception:
         # There may not have reporter.
@@ -135,7 +151,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('div.title_box > h1.title')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
     except Exception:
         # storm response 404 with status code 200.
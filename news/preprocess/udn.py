@@ -2,9 +2,8 @@ import re
 import unicodedata
 from datetime import datetime, timedelta
 
-from bs4 import BeautifulSoup
-
 from news.db.schema import News
+from news.preprocess.extract import Extractor
 
 REMOVE_XML_PATTERN = re.compile(
     r'<blockquote\s.*?>.*?<a\s.*?>\.\.\.more</a>.*?</blockquote>'
@@ -15,6 +14,34 @@ REMOVE_ARTICLE_PATTERNS = [
     re.compile(r'...more'),
 ]
 
+# Discard images, captions, styles, scripts and ads.
+EXTRACTOR = Extractor(
+    fields={
+        'blockquote': 'blockquote',
+        'article': (
+            'section.article-content__editor > p, '
+            'section.article-content__editor > blockquote'
+        ),
+        'category': 'nav.article-content__breadcrumb > a.breadcrumb-items',
+        'datetime': 'section.authors > time.article-content__time',
+        'reporter': 'section.authors > span.article-content__author > a',
+        'title': 'h1.article-content__title',
+    },
+    regions=[
+        'section.article-content__editor',
+        'blockquote',
+        'nav.article-content__breadcrumb',
+        'section.authors',
+        'h1.article-content__title',
+    ],
+    removals=[
+        'figure.article-content__image',
+        'style',
+        'script',
+        'div.inline-ads',
+    ],
+)
+
 
 def parse(ori_news: News) -> News:
     """Parse UDN news from raw HTML.
@@ -44,28 +71,22 @@ def parse(ori_news: News) -> News:
             r'</blockquote><p>',
             raw_xml,
         )
-        soup = BeautifulSoup(raw_xml, 'html.parser')
-        # soup = BeautifulSoup(parsed_news.raw_xml, 'html.parser')
+        soup = EXTRACTOR.parse(raw_xml)
     except Exception:
         raise ValueError('Invalid html format.')
+    fields = EXTRACTOR.extract(soup)
 
     # News article.
     article = ''
     try:
-        # Discard images, captions, styles, scripts and ads.
-        for tag in soup.select('figure.article-content__image, style, script, div.inline-ads'):
-            tag.extract()
-
         # Discard related links.
-        for blockquote_tag in soup.select('blockquote'):
+        for blockquote_tag in fields.select('blockquote'):
             for a_tag in blockquote_tag.select('a'):
                 if a_tag.text.strip() == '...more':
                     blockquote_tag.extract()
                     break
 
-        article_tags = soup.select(
-            'section.article-content__editor > p, section.article-content__editor > blockquote'
-        )
+        article_tags = fields.select('article')
         article = ' '.join(map(lambda tag: tag.text.strip(), article_tags))
 
         for pattern in REMOVE_ARTICLE_PATTERNS:
@@ -77,9 +98,7 @@ def parse(ori_news: News) -> News:
     # News category.
     category = ''
     try:
-        category = soup.select(
-            'nav.article-content__breadcrumb > a.breadcrumb-items'
-        )[-2].text
+        category = fields.select('category')[-2].text
         category = unicodedata.normalize('NFKC', category).strip()
     except Exception:
         # There may not have category.
@@ -88,9 +107,7 @@ def parse(ori_news: News) -> News:
     # News datetime.
     news_datetime = ''
     try:
-        news_datetime = soup.select(
-            'section.authors > time.article-content__time'
-        )[0].text
+        news_datetime = fields.select('datetime')[0].text
         # Convert to UTC.
         news_datetime = datetime.strptime(
             news_datetime,
@@ -105,9 +122,7 @@ def parse(ori_news: News) -> News:
     # News reporter.
     reporter = ''
     try:
-        reporter_tags = soup.select(
-            'section.authors > span.article-content__author > a'
-        )
+        reporter_tags = fields.select('reporter')
         reporter = ','.join(map(lambda tag: tag.text, reporter_tags))
         reporter = unicodedata.normalize('NFKC', reporter).strip()
     except Exception:
@@ -117,7 +132,7 @@ def parse(ori_news: News) -> News:
     # News title.
     title = ''
     try:
-        title = soup.select('h1.article-content__title')[0].text
+        title = fields.select('title')[0].text
         title = unicodedata.normalize('NFKC', title).strip()
     except Exception:
         # Some pages do not have title since we are not VIP.
@@ -1,9 +1,13 @@
 import argparse
+import json
+import os
+import socket
 from datetime import datetime, timedelta, timezone
 
 import dateutil.parser
 
 import news.crawlers
+import news.db
 
 CRAWLER_DICT = {
     'chinatimes': news.crawlers.chinatimes.main,
@@ -59,14 +63,110 @@ def parse_argument():
     parser.add_argument(
         '--first_idx',
         type=int,
-        default=1,
-        help='Specify first index id. (smallest)',
+        default=-1,
+        help='Specify first index id. (smallest) '
+        'Default searches the first id after `past_datetime`.',
     )
     parser.add_argument(
         '--latest_idx',
         type=int,
         default=-1,
-        help='Specify latest index id. (largest)',
+        help='Specify latest index id. (largest) '
+        'Default searches the current maximum id.',
+    )
+    parser.add_argument(
+        '--n_workers',
+        type=int,
+        default=1,
+        help='Specify number of (category, day) units crawled in parallel. '
+        'Only used by chinatimes, cna and ftv.',
+    )
+    parser.add_argument(
+        '--cache_db',
+        type=str,
+        default=None,
+        help='Assign database to cache raw responses. (e.g. cache/cna.db)',
+    )
+    parser.add_argument(
+        '--cache_mode',
+        choices=news.crawlers.cache.MODES,
+        type=str,
+        default='write',
+        help='Select how responses are cached. `replay` crawls offline.',
+    )
+    parser.add_argument(
+        '--seen_filter',
+        type=str,
+        default=None,
+        help='Assign bloom filter of crawled urls shared by crawler '
+        'processes. (e.g. seen/urls.bloom)',
+    )
+    parser.add_argument(
+        '--seen_db_names',
+        nargs='*',
+        type=str,
+        default=[],
+        help='Specify other crawled databases whose news are not requested '
+        'again. `db_name` is always included.',
+    )
+    parser.add_argument(
+        '--populate_seen',
+        action='store_true',
+        help='Select whether add urls in databases to existing bloom filter.',
+    )
+    parser.add_argument(
+        '--sharded',
+        action='store_true',
+        help='Select whether store news in shards of company and month '
+        'instead of one database.',
+    )
+    parser.add_argument(
+        '--daemon_config',
+        type=str,
+        default=None,
+        help='Assign json file of crawlers and their schedules to run all of '
+        'them forever. `crawler_name`, `db_name` and time range are ignored.',
+    )
+    parser.add_argument(
+        '--broker',
+        type=str,
+        default=None,
+        help='Assign work queue to crawl units of `crawler_name` from, either '
+        'database (e.g. queue/crawl.db) or url served by run_work_queue.py. '
+        'Time range and ids are ignored.',
+    )
+    parser.add_argument(
+        '--worker_id',
+        type=str,
+        default=f'{socket.gethostname()}-{os.getpid()}',
+        help='Specify name of worker. Default `db_name` of worker is '
+        '`{crawler_name}/{worker_id}.db`.',
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Select whether skip unchanged listing pages and stop paging at '
+        'the first crawled news. Only used by epochtimes, ltn, ntdtv and udn.',
+    )
+    parser.add_argument(
+        '--metrics_path',
+        type=str,
+        default=None,
+        help='Assign Prometheus text file of crawler metrics, e.g. in '
+        'textfile collector directory of node exporter.',
+    )
+    parser.add_argument(
+        '--metrics_snapshot_path',
+        type=str,
+        default=None,
+        help='Assign file which JSON snapshots of crawler metrics are '
+        'appended to.',
+    )
+    parser.add_argument(
+        '--metrics_interval_secs',
+        type=float,
+        default=60.0,
+        help='Specify seconds between metrics exports.',
     )
     args = parser.parse_args()
     return args
@@ -92,8 +192,82 @@ if __name__ == '__main__':
             args.past_datetime
         )
 
-    # Run crawler.
-    func = CRAWLER_DICT[args.crawler_name]
-    param = dict((k, v) for k, v in vars(args).items()
-                 if k in func.__code__.co_varnames)
-    func(**param)
+    # Cache raw responses.
+    news.crawlers.cache.set_cache(
+        db_name=args.cache_db,
+        mode=args.cache_mode,
+    )
+
+    # Export metrics of all crawlers periodically.
+    news.crawlers.metrics.set_exporter(
+        prometheus_path=args.metrics_path,
+        snapshot_path=args.metrics_snapshot_path,
+        interval_secs=args.metrics_interval_secs,
+    )
+
+    # Schedule of each crawler in daemon mode.
+    jobs = []
+    if args.daemon_config:
+        with open(args.daemon_config, 'r') as config_file:
+            jobs = news.crawlers.daemon.get_jobs(
+                config=json.load(config_file),
+                crawler_dict=CRAWLER_DICT,
+            )
+    # Workers write to their own database, which are merged later.
+    if args.broker and not args.db_name:
+        args.db_name = f'{args.crawler_name}/{args.worker_id}.db'
+    db_names = [job.db_name for job in jobs] or [args.db_name]
+
+    # News are routed to shards once database has shard table. Databases
+    # with news must be migrated by `run_db_migrate.py --shard` first.
+    if args.sharded:
+        for db_name in db_names:
+            conn = news.db.util.get_conn(
+                db_name=f'raw/{db_name}',
+                profile='crawl-writer',
+            )
+            news.db.shard.create_shard_table(cur=conn.cursor())
+            conn.commit()
+            conn.close()
+
+    # Skip news crawled by any process.
+    news.crawlers.seen.set_seen(
+        bloom_name=args.seen_filter,
+        db_names=[
+            f'raw/{db_name}'
+            for db_name in [*db_names, *args.seen_db_names]
+        ],
+        populate=args.populate_seen,
+    )
+
+    # Listing state is stored along with crawled news. Crawlers in daemon mode
+    # share the same listing state.
+    if args.incremental:
+        news.crawlers.listing.set_listing_state(
+            db_name='raw/listing.db' if jobs else f'raw/{args.db_name}'
+        )
+
+    try:
+        if jobs:
+            # Run all crawlers in one process.
+            news.crawlers.daemon.run_daemon(jobs=jobs, debug=args.debug)
+        elif args.broker:
+            # Crawl units leased from work queue into worker's own database.
+            n_units = news.crawlers.work_queue.run_worker(
+                broker=args.broker,
+                queue=args.crawler_name,
+                worker=args.worker_id,
+                func=CRAWLER_DICT[args.crawler_name],
+                db_name=args.db_name,
+                debug=args.debug,
+            )
+            print(f'{args.worker_id} finished {n_units} units.')
+        else:
+            # Run crawler.
+            func = CRAWLER_DICT[args.crawler_name]
+            param = dict((k, v) for k, v in vars(args).items()
+                         if k in func.__code__.co_varnames)
+            func(**param)
+    finally:
+        # Export final metrics.
+        news.crawlers.metrics.set_exporter()
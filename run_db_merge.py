@@ -0,0 +1,85 @@
+import argparse
+
+import news.db
+
+
+def parse_argument():
+    r'''
+    `src_db_names` example: raw/cna_a.db raw/cna_b.db
+    `dest_db_name` example: raw/cna.db
+    '''
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--src_db_names',
+        nargs='+',
+        type=str,
+        help='Select databases to merge.',
+    )
+    parser.add_argument(
+        '--dest_db_name',
+        type=str,
+        help='Assign database which news are merged into.',
+    )
+    parser.add_argument(
+        '--table',
+        choices=['news', 'news_table'],
+        type=str,
+        default='news',
+        help='Select table of raw or preprocessed news.',
+    )
+    parser.add_argument(
+        '--on_conflict',
+        choices=news.db.merge.CONFLICTS,
+        type=str,
+        default='ignore',
+        help='Select whether keep news of destination or source when urls '
+        'are the same.',
+    )
+    parser.add_argument(
+        '--batch_size',
+        type=int,
+        default=news.db.merge.BATCH_SIZE,
+        help='Specify number of source ids merged per commit.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    conn = news.db.util.get_conn(
+        db_name=args.dest_db_name,
+        profile='bulk-import',
+    )
+    cur = conn.cursor()
+
+    for db_name in args.src_db_names:
+        print(f'Merging {db_name} ...')
+        n_merged = 0
+        for n_scanned, n_ids, n_merged in news.db.merge.merge_records(
+            cur=cur,
+            src_path=news.db.util.get_path(db_name),
+            table=args.table,
+            on_conflict=args.on_conflict,
+            batch_size=args.batch_size,
+        ):
+            print(
+                f'\r{n_scanned / n_ids:.1%} of ids, merged {n_merged} news.',
+                end='',
+            )
+        print()
+
+    # Index merged news of indexed database.
+    if args.table == 'news':
+        if news.db.search.has_fts_table(cur=cur):
+            news.db.search.index_new_records(cur=cur)
+        if news.db.dedup.has_dedup_table(cur=cur):
+            n_news, n_duplicates = news.db.dedup.index_new_records(cur=cur)
+            print(f'{n_duplicates} of {n_news} news are near duplicates.')
+    # Update statistics used by query planner.
+    cur.execute('ANALYZE')
+
+    conn.commit()
+    conn.close()
@@ -0,0 +1,65 @@
+import argparse
+
+import news.db
+
+
+def parse_argument():
+    r'''
+    `db_names` example: raw/ftv.db raw/cna.db
+    '''
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--db_names',
+        nargs='+',
+        type=str,
+        help='Select databases to migrate.',
+    )
+    parser.add_argument(
+        '--fts',
+        action='store_true',
+        help='Select whether build full text search index.',
+    )
+    parser.add_argument(
+        '--dedup',
+        action='store_true',
+        help='Select whether flag near duplicated news.',
+    )
+    parser.add_argument(
+        '--shard',
+        action='store_true',
+        help='Select whether move news to shards of company and month.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    for db_name in args.db_names:
+        print(f'Migrating {db_name} ...')
+
+        conn = news.db.util.get_conn(db_name=db_name, profile='bulk-import')
+        cur = conn.cursor()
+
+        # Add missing tables and indexes to existing database.
+        news.db.create.create_table(cur=cur)
+        if args.fts:
+            news.db.search.create_fts_table(cur=cur)
+            news.db.search.index_new_records(cur=cur)
+        if args.dedup:
+            news.db.dedup.create_dedup_table(cur=cur)
+            n_news, n_duplicates = news.db.dedup.index_new_records(cur=cur)
+            print(f'{n_duplicates} of {n_news} news are near duplicates.')
+        if args.shard:
+            n_news = news.db.shard.move_records(cur=cur)
+            print(f'Moved {n_news} news to shards.')
+        # Update statistics used by query planner.
+        cur.execute('ANALYZE')
+
+        conn.commit()
+        # Release space of moved news.
+        if args.shard:
+            cur.execute('VACUUM')
+        conn.close()
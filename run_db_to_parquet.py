@@ -0,0 +1,55 @@
+import argparse
+
+import news.db
+
+
+def parse_argument():
+    r'''
+    `db_name` example: 'raw/ftv.db'
+    `dataset_name` example: 'parquet/ftv'
+    '''
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--db_name',
+        type=str,
+        help='Select database to export.',
+    )
+    parser.add_argument(
+        '--dataset_name',
+        type=str,
+        help='Assign directory to store Parquet files.',
+    )
+    parser.add_argument(
+        '--table',
+        choices=news.db.parquet.DATETIME_COLUMNS.keys(),
+        type=str,
+        default='news',
+        help='Select table to export.',
+    )
+    parser.add_argument(
+        '--exclude_raw_xml',
+        action='store_true',
+        help='Select whether drop `raw_xml` column.',
+    )
+    parser.add_argument(
+        '--batch_size',
+        type=int,
+        default=news.db.parquet.BATCH_SIZE,
+        help='Specify number of rows per record batch.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    row_count = news.db.parquet.export_table(
+        batch_size=args.batch_size,
+        dataset_name=args.dataset_name,
+        db_name=args.db_name,
+        exclude_raw_xml=args.exclude_raw_xml,
+        table=args.table,
+    )
+    print(f'Export {row_count} rows.')
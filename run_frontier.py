@@ -0,0 +1,83 @@
+import argparse
+
+import news.crawlers
+import news.db
+
+
+def parse_argument():
+    r'''
+    `db_name` example: cna.db
+    `unit_pattern` example: %/202106%
+    '''
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--db_name',
+        type=str,
+        help='Select crawled database.',
+    )
+    parser.add_argument(
+        '--crawler_name',
+        type=str,
+        default=None,
+        help='Select crawler whose units are reset.',
+    )
+    parser.add_argument(
+        '--status',
+        choices=news.crawlers.frontier.STATUSES,
+        type=str,
+        default=news.crawlers.frontier.DONE,
+        help='Select status of units to reset.',
+    )
+    parser.add_argument(
+        '--unit_pattern',
+        type=str,
+        default='%',
+        help='Specify SQL LIKE pattern of units to reset.',
+    )
+    parser.add_argument(
+        '--reset',
+        action='store_true',
+        help='Select whether mark selected units as pending. Only show '
+        'summary if not set.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    conn = news.db.util.get_conn(
+        db_name=f'raw/{args.db_name}',
+        profile='crawl-writer',
+    )
+    cur = conn.cursor()
+    news.crawlers.frontier.create_table(cur=cur)
+
+    if args.reset:
+        if not args.crawler_name:
+            raise ValueError('Must specify `crawler_name` to reset units.')
+        n_units = news.crawlers.frontier.reset_units(
+            cur=cur,
+            crawler=args.crawler_name,
+            status=args.status,
+            unit_pattern=args.unit_pattern,
+        )
+        conn.commit()
+        print(f'Reset {n_units} units.')
+
+    for crawler, counts in news.crawlers.frontier.get_summary(cur=cur).items():
+        print(crawler, ', '.join(f'{k}: {v}' for k, v in counts.items()))
+
+    for crawler, unit, attempts, last_error in cur.execute(
+        '''
+        SELECT crawler, unit, attempts, last_error FROM crawl_frontier
+        WHERE status = ?
+        ORDER BY crawler, unit
+        ''',
+        [news.crawlers.frontier.FAILED],
+    ):
+        print(f'{crawler} {unit} failed {attempts} times: {last_error}')
+
+    conn.close()
@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+
+import news.db
+import news.preprocess.pipeline
+import news.preprocess.preprocess
+import news.preprocess.profiler
+
+
+def parse_argument():
+    r'''
+    `spec` example: preprocess/base.json
+    '''
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--spec',
+        type=str,
+        help='Assign JSON file of pipeline spec.',
+    )
+    parser.add_argument(
+        '--n_workers',
+        type=int,
+        default=None,
+        help='Override number of worker processes in spec.',
+    )
+    parser.add_argument(
+        '--chunk_size',
+        type=int,
+        default=None,
+        help='Override number of records per chunk in spec.',
+    )
+    parser.add_argument(
+        '--stats_path',
+        type=str,
+        default=None,
+        help='Assign JSON file to write statistics of each stage.',
+    )
+    parser.add_argument(
+        '--trace_memory',
+        action='store_true',
+        help='Select whether trace peak memory of each stage, which slows '
+        'stages down.',
+    )
+    parser.add_argument(
+        '--sample_interval',
+        type=float,
+        default=None,
+        help='Specify seconds between stack samples to profile the slowest '
+        'stage.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    with open(args.spec, 'r', encoding='utf8') as f:
+        spec = json.load(f)
+    unknown_keys = set(spec) - set(news.preprocess.pipeline.DEFAULT_SPEC)
+    if unknown_keys:
+        raise ValueError(f'Unknown settings {sorted(unknown_keys)}.')
+    spec = {**news.preprocess.pipeline.DEFAULT_SPEC, **spec}
+    if args.n_workers is not None:
+        spec['n_workers'] = args.n_workers
+    if args.chunk_size is not None:
+        spec['chunk_size'] = args.chunk_size
+    if not spec['input_db'] or not spec['output_db']:
+        raise ValueError('Must specify `input_db` and `output_db`.')
+
+    stages = news.preprocess.pipeline.get_stages(
+        spec=spec['stages'],
+        stage_dict=news.preprocess.preprocess.STAGES,
+    )
+    input_path = news.db.util.get_path(spec['input_db'])
+    if not os.path.isfile(input_path):
+        raise FileNotFoundError(f'{input_path} does not exist.')
+
+    def load():
+        conn = news.db.util.get_conn(
+            db_name=spec['input_db'],
+            profile='read-only-scan',
+        )
+        dataset = list(news.db.preprocessed.read_records(cur=conn.cursor()))
+        conn.close()
+        return dataset
+
+    cache_dir = None
+    if spec['cache']:
+        cache_dir = news.preprocess.pipeline.CACHE_DIR
+
+    dataset, stats = news.preprocess.pipeline.run_stages(
+        load=load,
+        input_key=news.preprocess.pipeline.get_path_key(input_path),
+        stages=stages,
+        cache_dir=cache_dir,
+        n_workers=spec['n_workers'],
+        chunk_size=spec['chunk_size'],
+        trace_memory=args.trace_memory,
+        sample_interval=args.sample_interval,
+    )
+    print(news.preprocess.profiler.format_stats(stats))
+
+    slowest = news.preprocess.profiler.get_slowest_stage(stats)
+    if args.sample_interval is not None and slowest is not None:
+        print(f'\nSamples of the slowest stage `{slowest["stage"]}`:')
+        print(news.preprocess.profiler.format_samples(slowest['samples']))
+    if args.stats_path:
+        with open(args.stats_path, 'w', encoding='utf8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+
+    # Output is replaced so that running the same spec gives the same
+    # database.
+    conn = news.db.util.get_conn(
+        db_name=spec['output_db'],
+        profile='bulk-import',
+    )
+    conn.execute('DROP TABLE IF EXISTS news_table')
+    conn.commit()
+    conn.close()
+    news.preprocess.preprocess.save_in_db(
+        db_name=news.db.util.get_path(spec['output_db']),
+        data=dataset,
+    )
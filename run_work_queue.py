@@ -0,0 +1,125 @@
+import argparse
+
+import dateutil.parser
+
+import news.crawlers
+
+
+def parse_argument():
+    r'''
+    `broker` example: queue/crawl.db
+    `serve` example: 10.0.0.1:8000 (address of private network)
+    '''
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--broker',
+        type=str,
+        help='Assign database of work queue.',
+    )
+    parser.add_argument(
+        '--crawler_name',
+        type=str,
+        default=None,
+        help='Select crawler whose units are added or reset.',
+    )
+    parser.add_argument(
+        '--first_idx',
+        type=int,
+        default=-1,
+        help='Specify first index id of added units.',
+    )
+    parser.add_argument(
+        '--latest_idx',
+        type=int,
+        default=-1,
+        help='Specify latest index id of added units.',
+    )
+    parser.add_argument(
+        '--unit_size',
+        type=int,
+        default=10000,
+        help='Specify number of ids in each unit.',
+    )
+    parser.add_argument(
+        '--current_datetime',
+        type=str,
+        default=None,
+        help='Specify the upper bound of the news release time of added '
+        'units, which are split by day.',
+    )
+    parser.add_argument(
+        '--past_datetime',
+        type=str,
+        default=None,
+        help='Specify the lower bound of the news release time of added '
+        'units.',
+    )
+    parser.add_argument(
+        '--reset',
+        choices=news.crawlers.frontier.STATUSES,
+        type=str,
+        default=None,
+        help='Select status of units to retry.',
+    )
+    parser.add_argument(
+        '--lease_secs',
+        type=float,
+        default=600.0,
+        help='Specify seconds before units of silent workers are leased '
+        'again.',
+    )
+    parser.add_argument(
+        '--serve',
+        type=str,
+        default=None,
+        help='Specify `host:port` to serve work queue to workers on other '
+        'nodes.',
+    )
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+
+    args = parse_argument()
+
+    work_queue = news.crawlers.work_queue.WorkQueue(
+        db_name=args.broker,
+        lease_secs=args.lease_secs,
+    )
+
+    units = []
+    if args.first_idx != -1 and args.latest_idx != -1:
+        units = news.crawlers.work_queue.get_id_units(
+            first_idx=args.first_idx,
+            latest_idx=args.latest_idx,
+            unit_size=args.unit_size,
+        )
+    elif args.current_datetime and args.past_datetime:
+        units = news.crawlers.work_queue.get_day_units(
+            current_datetime=dateutil.parser.isoparse(args.current_datetime),
+            past_datetime=dateutil.parser.isoparse(args.past_datetime),
+        )
+
+    if (units or args.reset) and not args.crawler_name:
+        raise ValueError('Must specify `crawler_name` to add or reset units.')
+    if units:
+        n_units = work_queue.put(args.crawler_name, units)
+        print(f'Added {n_units} units.')
+    if args.reset:
+        n_units = work_queue.reset(args.crawler_name, args.reset)
+        print(f'Reset {n_units} units.')
+
+    for queue, counts in work_queue.get_summary().items():
+        print(queue, ', '.join(f'{k}: {v}' for k, v in counts.items()))
+
+    if args.serve:
+        host, port = args.serve.rsplit(':', 1)
+        print(f'Serving work queue at http://{host}:{port}')
+        news.crawlers.work_queue.get_server(
+            work_queue=work_queue,
+            host=host,
+            port=int(port),
+        ).serve_forever()
+
+    work_queue.close()
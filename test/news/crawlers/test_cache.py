@@ -0,0 +1,68 @@
+import pytest
+import requests
+
+import news.crawlers
+
+
+@pytest.fixture
+def site(monkeypatch):
+    requested = []
+
+    def get(url, headers=None, timeout=None):
+        requested.append(url)
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        if url.endswith('missing'):
+            response.status_code = 404
+        elif url.endswith('banned'):
+            response.status_code = 403
+        response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        response.encoding = 'utf-8'
+        response._content = '<html>新聞</html>'.encode('utf-8')
+        response._content_consumed = True
+        return response
+
+    monkeypatch.setattr(news.crawlers.util.SESSION, 'get', get)
+    yield requested
+    news.crawlers.cache.set_cache(db_name=None)
+
+
+def test_write_then_replay(site, tmp_path):
+    db_name = str(tmp_path / 'cache.db')
+    urls = [
+        'https://a.com/1',
+        'https://a.com/2',
+        'https://a.com/missing',
+        'https://a.com/banned',
+    ]
+
+    news.crawlers.cache.set_cache(db_name=db_name, mode='write')
+    for url in urls:
+        news.crawlers.util.get(url=url)
+    assert site == urls
+
+    # Identical bodies are stored once.
+    conn = news.crawlers.cache.CACHE.conn
+    assert list(conn.execute('SELECT COUNT(*) FROM body'))[0][0] == 1
+
+    # Replay without network.
+    site.clear()
+    news.crawlers.cache.set_cache(db_name=db_name, mode='replay')
+    response = news.crawlers.util.get(url=urls[0])
+    assert response.status_code == 200
+    assert response.text == '<html>新聞</html>'
+    assert response.headers['content-type'] == 'text/html; charset=utf-8'
+    assert news.crawlers.util.get(url=urls[2]).status_code == 404
+    with pytest.raises(Exception, match='Response not cached.'):
+        news.crawlers.util.get(url='https://a.com/3')
+    # Bans are not replayed.
+    with pytest.raises(Exception, match='Response not cached.'):
+        news.crawlers.util.get(url=urls[3])
+    assert site == []
+
+    # Read through only requests on cache miss.
+    news.crawlers.cache.set_cache(db_name=db_name, mode='read')
+    news.crawlers.util.get(url=urls[1])
+    news.crawlers.util.get(url='https://a.com/3')
+    assert site == ['https://a.com/3']
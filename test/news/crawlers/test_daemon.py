@@ -0,0 +1,158 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import news.crawlers
+import news.db
+from benchmark.mock_site import MockSite, get_server
+from run_crawler import CRAWLER_DICT
+
+
+@pytest.fixture(autouse=True)
+def rate_limits(monkeypatch):
+    monkeypatch.setattr(news.crawlers.util, 'MAX_REQUESTS_PER_SEC', {})
+    monkeypatch.setattr(news.crawlers.util, 'NEXT_REQUEST_TIME', {})
+
+
+def test_get_jobs():
+    def main(db_name, *, debug=False):
+        pass
+
+    jobs = news.crawlers.daemon.get_jobs(
+        config={'cna': {'max_requests_per_sec': 5, 'window_hours': 2}},
+        crawler_dict={'cna': main},
+    )
+    assert jobs[0].db_name == 'cna.db'
+    assert jobs[0].interval == timedelta(hours=1)
+    assert jobs[0].window == timedelta(hours=2)
+    assert news.crawlers.util.MAX_REQUESTS_PER_SEC == {'cna': 5.0}
+
+    with pytest.raises(ValueError):
+        news.crawlers.daemon.get_jobs(
+            config={'abc': {}},
+            crawler_dict={'cna': main},
+        )
+    with pytest.raises(ValueError):
+        news.crawlers.daemon.get_jobs(
+            config={'cna': {'interval': 1}},
+            crawler_dict={'cna': main},
+        )
+
+
+def test_rate_limit():
+    assert news.crawlers.util.get_company(
+        url='https://sports.ltn.com.tw/news/1'
+    ) == 'ltn'
+    assert news.crawlers.util.get_company(url='https://a.com/1') is None
+
+    news.crawlers.util.MAX_REQUESTS_PER_SEC['cna'] = 50.0
+    start = time.monotonic()
+    for _ in range(6):
+        news.crawlers.util.wait_rate_limit(url='https://www.cna.com.tw/1')
+    assert time.monotonic() - start >= 0.1
+
+    # Other companies are not limited.
+    start = time.monotonic()
+    for _ in range(6):
+        news.crawlers.util.wait_rate_limit(url='https://udn.com/1')
+    assert time.monotonic() - start < 0.05
+
+
+def test_run_daemon():
+    runs = {'fast': [], 'slow': []}
+    slow_running = threading.Event()
+
+    def fast(current_datetime, past_datetime, db_name, *, debug=False):
+        assert current_datetime - past_datetime == timedelta(hours=24)
+        runs['fast'].append(slow_running.is_set())
+
+    def slow(db_name, *, debug=False):
+        slow_running.set()
+        time.sleep(0.3)
+        slow_running.clear()
+        runs['slow'].append(db_name)
+        raise Exception('Got banned.')
+
+    jobs = news.crawlers.daemon.get_jobs(
+        config={
+            'fast': {'interval_mins': 0.001},
+            'slow': {'interval_mins': 0.001, 'db_name': 'slow/a.db'},
+        },
+        crawler_dict={'fast': fast, 'slow': slow},
+    )
+    news.crawlers.daemon.run_daemon(jobs=jobs, max_runs=3)
+
+    assert len(runs['fast']) == 3
+    assert runs['slow'] == ['slow/a.db'] * 3
+    # Slow crawler does not block others.
+    assert any(runs['fast'])
+    assert jobs[1].n_failures == 3
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setattr(news.db.util, 'DATA_PATH', str(tmp_path))
+    for company in news.crawlers.util.BEFORE_BANNED_SLEEP_SECS:
+        monkeypatch.setitem(
+            news.crawlers.util.BEFORE_BANNED_SLEEP_SECS,
+            company,
+            0.0,
+        )
+        monkeypatch.setitem(
+            news.crawlers.util.AFTER_BANNED_SLEEP_SECS,
+            company,
+            0.0,
+        )
+    # Keep requests of probing and paging few.
+    for module in [
+        news.crawlers.chinatimes,
+        news.crawlers.cna,
+        news.crawlers.ftv,
+    ]:
+        monkeypatch.setattr(module, 'CONTINUE_FAIL_COUNT', 10)
+    monkeypatch.setattr(news.crawlers.ltn, 'MAX_PAGE', 2)
+
+    # Daemon crawls news released until now. Websites use UTC+8.
+    site = MockSite(
+        now=datetime.now(timezone(timedelta(hours=8))).replace(tzinfo=None),
+        news_per_day=24,
+        miss_ratio=0.1,
+        page_size=1000,
+    )
+    server = get_server(site=site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        news.crawlers.util,
+        'BASE_URL',
+        f'http://127.0.0.1:{server.server_address[1]}',
+    )
+    yield site
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('crawler_name', list(CRAWLER_DICT))
+def test_run_job_on_mock_site(site, crawler_name):
+    config = {crawler_name: {'window_hours': 24}}
+
+    # TVBS needs explicit id range.
+    if crawler_name == 'tvbs':
+        with pytest.raises(ValueError):
+            news.crawlers.daemon.get_jobs(
+                config=config,
+                crawler_dict=CRAWLER_DICT,
+            )
+        return
+
+    jobs = news.crawlers.daemon.get_jobs(
+        config=config,
+        crawler_dict=CRAWLER_DICT,
+    )
+    news.crawlers.daemon.run_job(job=jobs[0])
+
+    conn = news.db.util.get_conn(db_name=f'raw/{crawler_name}.db')
+    n_news = list(conn.execute('SELECT COUNT(*) FROM news'))[0][0]
+    conn.close()
+    assert n_news > 0
@@ -0,0 +1,103 @@
+import sqlite3
+
+import pytest
+
+import news.crawlers
+import news.db
+from news.db.schema import News
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    news.db.create.create_table(cur=conn.cursor())
+    yield conn
+    conn.close()
+
+
+def test_resume_and_retry(conn):
+    calls = []
+
+    def get_news_list(unit):
+        def crawl():
+            calls.append(unit)
+            if unit == 'bad':
+                raise Exception('Got banned.')
+            return [News(url=f'{unit}/{idx}') for idx in range(2)]
+        return crawl
+
+    def run(units):
+        for unit in units:
+            try:
+                news.crawlers.frontier.run_unit(
+                    conn=conn,
+                    crawler='test',
+                    unit=unit,
+                    get_news_list=get_news_list(unit),
+                )
+            except Exception:
+                pass
+
+    run(['a', 'bad', 'b'])
+    assert calls == ['a', 'bad', 'b']
+
+    # Restart only crawls unfinished units.
+    calls.clear()
+    run(['a', 'bad', 'b', 'c'])
+    assert calls == ['bad', 'c']
+
+    cur = conn.cursor()
+    assert news.crawlers.frontier.get_summary(cur=cur) == {
+        'test': {'done': 3, 'failed': 1},
+    }
+    assert list(cur.execute('''
+        SELECT attempts, last_error FROM crawl_frontier WHERE unit = 'bad'
+    ''')) == [(2, "Exception('Got banned.')")]
+    assert list(cur.execute('SELECT COUNT(*) FROM news'))[0][0] == 6
+
+    # Force recrawl of done units.
+    assert news.crawlers.frontier.reset_units(
+        cur=cur,
+        crawler='test',
+        status='done',
+        unit_pattern='a',
+    ) == 1
+    calls.clear()
+    run(['a', 'b'])
+    assert calls == ['a']
+
+
+def test_unit_not_final(conn):
+    calls = []
+
+    def get_news_list():
+        calls.append(len(calls))
+        return [News(url=f'a/{len(calls)}')]
+
+    # Units which may get new news are crawled again by later runs.
+    for is_final in [False, False, True, True]:
+        news.crawlers.frontier.run_unit(
+            conn=conn,
+            crawler='test',
+            unit='today',
+            get_news_list=get_news_list,
+            is_final=is_final,
+        )
+    assert calls == [0, 1, 2]
+    assert news.crawlers.frontier.get_summary(cur=conn.cursor()) == {
+        'test': {'done': 1},
+    }
+
+
+def test_ltn_crawls_today_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(news.db.util, 'DATA_PATH', str(tmp_path))
+    calls = []
+
+    def get_news_list(api, category, debug):
+        calls.append(category)
+        return []
+
+    monkeypatch.setattr(news.crawlers.ltn, 'get_news_list', get_news_list)
+    news.crawlers.ltn.main(db_name='ltn.db')
+    news.crawlers.ltn.main(db_name='ltn.db')
+    assert len(calls) == 2 * len(news.crawlers.ltn.CATEGORIES)
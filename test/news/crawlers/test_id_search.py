@@ -0,0 +1,69 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import news.crawlers
+from news.db.schema import News
+
+START = datetime(2021, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def site():
+    random.seed(0)
+    # Sparse ids with gaps shorter than `GAP_WINDOW`, plus a long dead range.
+    live_ids = [
+        idx for idx in range(100, 50000)
+        if random.random() < 0.3 and not 20000 <= idx < 21000
+    ]
+    released = {
+        idx: START + timedelta(minutes=order)
+        for order, idx in enumerate(live_ids)
+    }
+    requested = []
+
+    def get_news(idx: int) -> News:
+        requested.append(idx)
+        if idx not in released:
+            raise Exception('News not found.')
+        return News(
+            datetime=released[idx].strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            url=str(idx),
+        )
+
+    return live_ids, released, requested, get_news
+
+
+def test_find_latest_idx(site):
+    live_ids, _, requested, get_news = site
+    latest_idx = news.crawlers.id_search.find_latest_idx(
+        get_news=get_news,
+        first_idx=1,
+    )
+    assert latest_idx == live_ids[-1]
+    assert len(requested) < 2000
+
+
+def test_find_idx_by_datetime(site):
+    live_ids, released, requested, get_news = site
+    for target_idx in [live_ids[0], live_ids[1234], live_ids[-1]]:
+        first_idx = news.crawlers.id_search.find_idx_by_datetime(
+            get_news=get_news,
+            target_datetime=released[target_idx],
+            first_idx=1,
+            latest_idx=live_ids[-1],
+        )
+        # No live id is skipped.
+        assert first_idx <= target_idx
+        assert all(
+            idx < first_idx or idx >= target_idx
+            for idx in live_ids
+        )
+
+    assert news.crawlers.id_search.find_idx_by_datetime(
+        get_news=get_news,
+        target_datetime=released[live_ids[-1]] + timedelta(days=1),
+        first_idx=1,
+        latest_idx=live_ids[-1],
+    ) == live_ids[-1] + 1
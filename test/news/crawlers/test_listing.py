@@ -0,0 +1,74 @@
+import pytest
+import requests
+
+import news.crawlers
+
+
+@pytest.fixture
+def site(monkeypatch):
+    pages = {}
+    requested = []
+
+    def get(url, headers=None, timeout=None):
+        etag, body = pages[url]
+        requested.append((url, headers))
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content_consumed = True
+        if etag is not None:
+            response.headers['ETag'] = etag
+        if etag is not None and (headers or {}).get('If-None-Match') == etag:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = body.encode('utf-8')
+        return response
+
+    monkeypatch.setattr(news.crawlers.util.SESSION, 'get', get)
+    yield pages, requested
+    news.crawlers.listing.set_listing_state(db_name=None)
+
+
+def test_without_state(site):
+    pages, requested = site
+    pages['https://a.com/1'] = ('"1"', 'news 1')
+    response = news.crawlers.listing.get(url='https://a.com/1')
+    news.crawlers.listing.save(url='https://a.com/1', response=response)
+    assert news.crawlers.listing.get(url='https://a.com/1') is not None
+    assert requested[-1] == ('https://a.com/1', None)
+
+
+def test_conditional_get(site, tmp_path):
+    pages, requested = site
+    news.crawlers.listing.set_listing_state(db_name=str(tmp_path / 'raw.db'))
+
+    pages['https://a.com/1'] = ('"1"', 'news 1')
+    response = news.crawlers.listing.get(url='https://a.com/1')
+    assert response.text == 'news 1'
+
+    # Page is crawled again until it is saved.
+    response = news.crawlers.listing.get(url='https://a.com/1')
+    assert response is not None
+    news.crawlers.listing.save(url='https://a.com/1', response=response)
+
+    assert news.crawlers.listing.get(url='https://a.com/1') is None
+    assert requested[-1] == ('https://a.com/1', {'If-None-Match': '"1"'})
+
+    pages['https://a.com/1'] = ('"2"', 'news 2')
+    assert news.crawlers.listing.get(url='https://a.com/1').text == 'news 2'
+
+
+def test_content_hash(site, tmp_path):
+    pages, _ = site
+    news.crawlers.listing.set_listing_state(db_name=str(tmp_path / 'raw.db'))
+
+    # Websites without validators are compared by content.
+    pages['https://a.com/1'] = (None, 'news 1')
+    response = news.crawlers.listing.get(url='https://a.com/1')
+    news.crawlers.listing.save(url='https://a.com/1', response=response)
+    assert news.crawlers.listing.get(url='https://a.com/1') is None
+
+    pages['https://a.com/1'] = (None, 'news 2')
+    assert news.crawlers.listing.get(url='https://a.com/1') is not None
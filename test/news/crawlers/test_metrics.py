@@ -0,0 +1,106 @@
+import json
+
+import pytest
+import requests
+
+import news.crawlers
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    metrics = news.crawlers.metrics.Metrics()
+    monkeypatch.setattr(news.crawlers.metrics, 'METRICS', metrics)
+
+    def get(url, headers=None, timeout=None):
+        if 'timeout' in url:
+            raise requests.exceptions.Timeout('Read timed out.')
+        response = requests.Response()
+        response.url = url
+        response.status_code = 404 if 'missing' in url else 200
+        response._content = b'<html></html>'
+        response._content_consumed = True
+        return response
+
+    monkeypatch.setattr(news.crawlers.util.SESSION, 'get', get)
+    return metrics
+
+
+def test_record_request(metrics):
+    news.crawlers.util.get(url='https://www.cna.com.tw/news/aipl/1.aspx')
+    news.crawlers.util.get(url='https://www.cna.com.tw/news/missing.aspx')
+    with pytest.raises(requests.exceptions.Timeout):
+        news.crawlers.util.get(url='https://udn.com/api/more?timeout=1')
+
+    assert metrics.get_counter('crawler_requests_total') == {
+        (('company', 'cna'), ('endpoint', 'news'), ('status', '200')): 1,
+        (('company', 'cna'), ('endpoint', 'news'), ('status', '404')): 1,
+        (('company', 'udn'), ('endpoint', 'api'), ('status', 'error')): 1,
+    }
+    assert metrics.get_counter('crawler_response_bytes_total') == {
+        (('company', 'cna'), ('endpoint', 'news')): 26,
+    }
+    histogram = metrics.to_dict()['histograms']['crawler_request_seconds']
+    assert sum(sample['buckets']['+Inf'] for sample in histogram) == 3
+
+
+def test_record_error(metrics):
+    news.crawlers.metrics.record_error(
+        company='cna',
+        message='https://www.cna.com.tw/news/1.aspx is weird.',
+    )
+    news.crawlers.metrics.record_error(company='cna', message='Got banned.')
+    news.crawlers.metrics.record_error(company='cna', message='Got banned.')
+    assert news.crawlers.metrics.get_errors(company='cna') == {
+        '<url> is weird.': 1,
+        'Got banned.': 2,
+    }
+    assert news.crawlers.metrics.get_errors(company='udn') == {}
+
+    # Only errors after the snapshot are counted.
+    errors = news.crawlers.metrics.get_errors(company='cna')
+    news.crawlers.metrics.record_error(company='cna', message='Got banned.')
+    assert news.crawlers.metrics.get_errors(
+        company='cna',
+        since=errors,
+    ) == {'Got banned.': 1}
+
+    # Errors of different news are counted as one label.
+    for idx in [123, 456]:
+        try:
+            requests.get(f'http://127.0.0.1:1/news/{idx}', timeout=1)
+        except requests.ConnectionError as err:
+            news.crawlers.metrics.record_error(
+                company='udn',
+                message=err.args[0],
+            )
+    assert list(news.crawlers.metrics.get_errors(company='udn').values()) == [
+        2,
+    ]
+
+    text = metrics.to_prometheus()
+    assert '# TYPE crawler_errors_total counter' in text
+    assert (
+        'crawler_errors_total{company="cna",error="Got banned."} 3' in text
+    )
+
+
+def test_exporter(metrics, tmp_path):
+    metrics.observe('crawler_request_seconds', {'company': 'cna'}, 0.07)
+    metrics.observe('crawler_request_seconds', {'company': 'cna'}, 100.0)
+    exporter = news.crawlers.metrics.Exporter(
+        metrics=metrics,
+        prometheus_path=str(tmp_path / 'crawler.prom'),
+        snapshot_path=str(tmp_path / 'crawler.jsonl'),
+        interval_secs=3600,
+    )
+    exporter.close()
+
+    text = (tmp_path / 'crawler.prom').read_text()
+    assert 'crawler_request_seconds_bucket{company="cna",le="0.05"} 0' in text
+    assert 'crawler_request_seconds_bucket{company="cna",le="0.1"} 1' in text
+    assert 'crawler_request_seconds_bucket{company="cna",le="+Inf"} 2' in text
+    assert 'crawler_request_seconds_count{company="cna"} 2' in text
+
+    snapshots = (tmp_path / 'crawler.jsonl').read_text().splitlines()
+    assert len(snapshots) == 1
+    assert json.loads(snapshots[0])['histograms']['crawler_request_seconds']
@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+import news.crawlers
+from news.db.schema import News
+
+
+def test_crawl_units(monkeypatch):
+    monkeypatch.setattr(news.crawlers.frontier, 'SETTLE_WINDOW', timedelta())
+    conn = sqlite3.connect(':memory:')
+    now = datetime.now(timezone.utc)
+    units = news.crawlers.parallel.get_units(
+        categories=['A', 'B'],
+        current_datetime=now,
+        past_datetime=now - timedelta(days=9),
+    )
+    assert len(units) == 20
+    assert units[0][0] == 'A' and units[0][1] == now
+    assert units[-1][0] == 'B' and units[-1][1] == now - timedelta(days=9)
+
+    threads = set()
+
+    def get_news_list(category, date, prober):
+        threads.add(threading.get_ident())
+        for idx in range(3):
+            prober.update(idx=idx, is_hit=True)
+        return [
+            News(url=f'{category}/{date.strftime("%Y%m%d")}/{idx}')
+            for idx in range(3)
+        ]
+
+    n_news = news.crawlers.parallel.crawl_units(
+        conn=conn,
+        company='test',
+        units=units,
+        get_news_list=get_news_list,
+        default_fail_limit=10,
+        n_workers=4,
+    )
+
+    assert n_news == 60
+    assert threading.get_ident() not in threads
+    cur = conn.cursor()
+    assert list(cur.execute('SELECT COUNT(*) FROM news'))[0][0] == 60
+    assert list(cur.execute('SELECT COUNT(*) FROM probe_stats'))[0][0] == 20
+
+    # Units done are skipped when crawling again, except units of today which
+    # is not over.
+    dates = []
+
+    def get_news_list_again(category, date, prober):
+        dates.append(date)
+        return get_news_list(category=category, date=date, prober=prober)
+
+    assert news.crawlers.parallel.crawl_units(
+        conn=conn,
+        company='test',
+        units=units,
+        get_news_list=get_news_list_again,
+        default_fail_limit=10,
+        n_workers=4,
+    ) == 6
+    assert dates == [now, now]
+    assert list(cur.execute('SELECT COUNT(*) FROM news'))[0][0] == 60
+    conn.close()
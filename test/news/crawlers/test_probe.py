@@ -0,0 +1,160 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import news.crawlers
+from benchmark.mock_site import EPOCH, MockSite, get_server
+from news.crawlers.probe import Prober
+
+
+@pytest.fixture
+def cur():
+    conn = sqlite3.connect(':memory:')
+    cur = conn.cursor()
+    news.crawlers.probe.create_table(cur=cur)
+    yield cur
+    conn.close()
+
+
+def crawl(prober: Prober, hit_idx, max_idx: int = 10000):
+    for idx in range(max_idx):
+        if prober.is_done(idx=idx):
+            break
+        prober.update(idx=idx, is_hit=idx in hit_idx)
+
+
+def test_default_without_history(cur):
+    prober = news.crawlers.probe.get_prober(
+        cur=cur,
+        company='cna',
+        category='',
+        date='20210101',
+        default_fail_limit=100,
+    )
+    crawl(prober=prober, hit_idx={0, 1, 2})
+    # Long gaps are recorded with the largest limit until enough history.
+    assert prober.hit_idx == [0, 1, 2]
+    assert prober.n_probes == 100 * news.crawlers.probe.MAX_FAIL_FACTOR + 3
+
+
+def test_learn_from_history(cur):
+    # News in `[0, 300)` with a long gap of deleted news.
+    hit_idx = set(range(0, 100, 2)) | set(range(250, 300, 2))
+    for day in range(news.crawlers.probe.MIN_HISTORY_DAYS):
+        prober = Prober(
+            company='cna',
+            category='',
+            date=f'202101{day + 1:02d}',
+            fail_limit=200,
+        )
+        crawl(prober=prober, hit_idx=hit_idx)
+        news.crawlers.probe.save_prober(cur=cur, prober=prober)
+
+    prober = news.crawlers.probe.get_prober(
+        cur=cur,
+        company='cna',
+        category='',
+        date='20210201',
+        default_fail_limit=100,
+    )
+    crawl(prober=prober, hit_idx=hit_idx)
+
+    # Long gap is crossed and probing stops shortly after last news.
+    assert set(prober.hit_idx) == hit_idx
+    assert prober.fail_limit > 151
+    assert prober.n_probes < 300 + 100
+
+
+def test_explore_day(cur):
+    hit_idx = set(range(0, 100, 2))
+    for day in range(news.crawlers.probe.MIN_HISTORY_DAYS):
+        prober = Prober(
+            company='cna',
+            category='',
+            date=f'202101{day + 1:02d}',
+            fail_limit=100,
+        )
+        crawl(prober=prober, hit_idx=hit_idx)
+        news.crawlers.probe.save_prober(cur=cur, prober=prober)
+
+    # Learned limit is small without long gaps, except on explore days.
+    limits = {}
+    for date in ['20210201', '20210108']:
+        limits[date] = news.crawlers.probe.get_prober(
+            cur=cur,
+            company='cna',
+            category='',
+            date=date,
+            default_fail_limit=100,
+        ).fail_limit
+    assert not news.crawlers.probe.is_explore_day(date='20210201')
+    assert news.crawlers.probe.is_explore_day(date='20210108')
+    assert limits['20210201'] < 100
+    assert limits['20210108'] == 100 * news.crawlers.probe.MAX_FAIL_FACTOR
+
+
+@pytest.fixture
+def site(monkeypatch):
+    site = MockSite(
+        now=EPOCH + timedelta(days=10),
+        news_per_day=20,
+        miss_ratio=0.1,
+        page_size=1000,
+    )
+    server = get_server(site=site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        news.crawlers.util,
+        'BASE_URL',
+        f'http://127.0.0.1:{server.server_address[1]}',
+    )
+    yield site
+    server.shutdown()
+    server.server_close()
+
+
+def test_fewer_requests_on_mock_site(cur, site):
+    def crawl_cna(date: datetime, prober: Prober):
+        n_requests = sum(site.stats.values())
+        news_list = news.crawlers.cna.get_news_list(
+            current_datetime=date,
+            past_datetime=date - timedelta(days=1),
+            prober=prober,
+        )
+        n_requests = sum(site.stats.values()) - n_requests
+        return {n.url for n in news_list}, n_requests
+
+    fail_limit = 30
+    for day in range(10):
+        date = EPOCH + timedelta(days=day)
+        prober = news.crawlers.probe.get_prober(
+            cur=cur,
+            company='cna',
+            category='',
+            date=date.strftime('%Y%m%d'),
+            default_fail_limit=fail_limit,
+        )
+        urls, n_requests = crawl_cna(date=date, prober=prober)
+        news.crawlers.probe.save_prober(cur=cur, prober=prober)
+        # Warm-up and explore days probe with the largest limit.
+        if (
+            day < news.crawlers.probe.MIN_HISTORY_DAYS
+            or news.crawlers.probe.is_explore_day(date=prober.date)
+        ):
+            continue
+
+        fixed_urls, fixed_n_requests = crawl_cna(
+            date=date,
+            prober=Prober(
+                company='cna',
+                category='',
+                date=date.strftime('%Y%m%d'),
+                fail_limit=fail_limit,
+            ),
+        )
+        # Same news with fewer requests than fixed fail count.
+        assert urls == fixed_urls
+        assert len(urls) > 10
+        assert n_requests < fixed_n_requests
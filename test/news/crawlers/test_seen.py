@@ -0,0 +1,182 @@
+import threading
+from datetime import timedelta, timezone
+
+import pytest
+
+import news.crawlers
+import news.db
+from benchmark.mock_site import EPOCH, MockSite, get_server
+from news.db.schema import News
+
+
+@pytest.fixture
+def db_name(tmp_path):
+    db_name = str(tmp_path / 'raw.db')
+    conn = news.db.util.get_conn(db_name=db_name, profile='crawl-writer')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.db.write.write_new_records(cur=cur, news_list=[
+        News(url=f'https://a.com/{idx}') for idx in range(100)
+    ])
+    conn.commit()
+    conn.close()
+    yield db_name
+    news.crawlers.seen.set_seen(bloom_name=None)
+
+
+def test_bloom_filter_is_shared(tmp_path):
+    path = str(tmp_path / 'urls.bloom')
+    bloom = news.crawlers.seen.BloomFilter(path=path, capacity=1000)
+    other = news.crawlers.seen.BloomFilter(path=path)
+    assert bloom.is_new and not other.is_new
+
+    urls = [f'https://a.com/{idx}' for idx in range(1000)]
+    for url in urls:
+        bloom.add(url)
+
+    # Processes mapping the same file see added urls.
+    assert all(url in other for url in urls)
+    n_false_positives = sum(
+        f'https://b.com/{idx}' in other for idx in range(10000)
+    )
+    assert n_false_positives < 100
+
+    bloom.close()
+    other.close()
+
+
+def test_populate_and_exact_check(db_name, tmp_path):
+    bloom_name = str(tmp_path / 'urls.bloom')
+    n_urls = news.crawlers.seen.set_seen(
+        bloom_name=bloom_name,
+        db_names=[db_name],
+    )
+    assert n_urls == 100
+    assert news.crawlers.seen.is_seen(url='https://a.com/0')
+    assert not news.crawlers.seen.is_seen(url='https://a.com/100')
+
+    # Positive of bloom filter is not seen until news is in database.
+    news.crawlers.seen.add_urls(urls=['https://a.com/100'])
+    assert 'https://a.com/100' in news.crawlers.seen.SEEN.bloom
+    assert not news.crawlers.seen.is_seen(url='https://a.com/100')
+
+    # Existing filter is not populated again.
+    assert news.crawlers.seen.set_seen(
+        bloom_name=bloom_name,
+        db_names=[db_name],
+    ) == 0
+    assert news.crawlers.seen.is_seen(url='https://a.com/99')
+
+
+def test_run_unit_adds_urls(db_name, tmp_path):
+    news.crawlers.seen.set_seen(
+        bloom_name=str(tmp_path / 'urls.bloom'),
+        db_names=[db_name],
+    )
+    conn = news.db.util.get_conn(db_name=db_name, profile='crawl-writer')
+    news.crawlers.frontier.run_unit(
+        conn=conn,
+        crawler='a',
+        unit='1',
+        get_news_list=lambda: [News(url='https://a.com/new')],
+    )
+    conn.close()
+    assert news.crawlers.seen.is_seen(url='https://a.com/new')
+
+
+def test_backfill_crosses_crawled_units(tmp_path, monkeypatch):
+    monkeypatch.setattr(news.db.util, 'DATA_PATH', str(tmp_path))
+    monkeypatch.setattr(news.crawlers.udn, 'PAGE_INTERVAL', 1)
+    # Websites use UTC+8.
+    now = EPOCH + timedelta(days=3)
+    site = MockSite(now=now, news_per_day=20, miss_ratio=0.0, page_size=1000)
+    server = get_server(site=site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        news.crawlers.util,
+        'BASE_URL',
+        f'http://127.0.0.1:{server.server_address[1]}',
+    )
+    conn = news.db.util.get_conn(db_name='raw/udn.db')
+    news.db.create.create_table(cur=conn.cursor())
+    conn.close()
+    news.crawlers.seen.set_seen(
+        bloom_name='urls.bloom',
+        db_names=['raw/udn.db'],
+    )
+
+    def crawl(days: int) -> int:
+        current_datetime = (now - timedelta(hours=8)).replace(
+            tzinfo=timezone.utc,
+        )
+        news.crawlers.udn.main(
+            current_datetime=current_datetime,
+            db_name='udn.db',
+            past_datetime=current_datetime - timedelta(days=days),
+        )
+        conn = news.db.util.get_conn(db_name='raw/udn.db')
+        n_news = list(conn.execute('SELECT COUNT(*) FROM news'))[0][0]
+        conn.close()
+        return n_news
+
+    try:
+        n_news = crawl(days=1)
+        # Units whose news are all crawled do not stop backfill, so news of
+        # one more day in both channels are crawled.
+        assert crawl(days=2) == n_news + 2 * 20
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize('crawler_name', ['epochtimes', 'ntdtv'])
+def test_crawled_news_end_paging(tmp_path, monkeypatch, crawler_name):
+    monkeypatch.setattr(news.db.util, 'DATA_PATH', str(tmp_path))
+    # Websites use UTC+8.
+    now = EPOCH + timedelta(days=10)
+    site = MockSite(now=now, news_per_day=20, miss_ratio=0.0, page_size=1000)
+    server = get_server(site=site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        news.crawlers.util,
+        'BASE_URL',
+        f'http://127.0.0.1:{server.server_address[1]}',
+    )
+    crawler = getattr(news.crawlers, crawler_name)
+    current_datetime = (now - timedelta(hours=8)).replace(tzinfo=timezone.utc)
+
+    # Count requested listing pages.
+    listing_urls = []
+    get_listing = news.crawlers.listing.get
+
+    def count_listing(url: str):
+        listing_urls.append(url)
+        return get_listing(url=url)
+
+    monkeypatch.setattr(news.crawlers.listing, 'get', count_listing)
+
+    def crawl(db_name: str, days: int) -> int:
+        listing_urls.clear()
+        crawler.main(
+            current_datetime=current_datetime,
+            db_name=db_name,
+            past_datetime=current_datetime - timedelta(days=days),
+        )
+        return len(listing_urls)
+
+    try:
+        # Dates in urls are local dates, so paging may cross one more day.
+        n_pages = crawl(db_name='unseen.db', days=2)
+
+        # Crawl history, whose news are skipped by seen filter later.
+        crawl(db_name='seen.db', days=9)
+        news.crawlers.seen.set_seen(
+            bloom_name='urls.bloom',
+            db_names=['raw/seen.db'],
+        )
+        # Skipped news still stop paging by release date in their urls.
+        assert crawl(db_name='seen.db', days=1) <= n_pages
+    finally:
+        news.crawlers.seen.set_seen(bloom_name=None)
+        server.shutdown()
+        server.server_close()
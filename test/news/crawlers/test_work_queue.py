@@ -0,0 +1,135 @@
+import threading
+import time
+import xmlrpc.client
+from datetime import datetime, timezone
+
+import pytest
+
+import news.crawlers
+
+
+def test_lease(tmp_path):
+    work_queue = news.crawlers.work_queue.WorkQueue(
+        db_name=str(tmp_path / 'queue.db'),
+        lease_secs=0.1,
+        max_attempts=2,
+    )
+    units = news.crawlers.work_queue.get_id_units(
+        first_idx=1,
+        latest_idx=25,
+        unit_size=10,
+    )
+    assert [unit for unit, _ in units] == ['1-10', '11-20', '21-25']
+    assert work_queue.put('ettoday', units) == 3
+    assert work_queue.put('ettoday', units) == 0
+
+    lease = work_queue.lease('ettoday', 'a')
+    assert lease == {
+        'unit': '1-10',
+        'params': {'first_idx': 1, 'latest_idx': 10},
+        'attempts': 1,
+    }
+    assert work_queue.heartbeat('ettoday', '1-10', 'a')
+    assert work_queue.lease('ettoday', 'b')['unit'] == '11-20'
+
+    # Failed units are retried until `max_attempts`.
+    assert work_queue.fail('ettoday', '11-20', 'b', 'Got banned.')
+    assert work_queue.lease('ettoday', 'b')['unit'] == '11-20'
+    assert work_queue.fail('ettoday', '11-20', 'b', 'Got banned.')
+    assert work_queue.lease('ettoday', 'b')['unit'] == '21-25'
+    assert work_queue.complete('ettoday', '21-25', 'b')
+
+    # Unit of silent worker is leased again.
+    time.sleep(0.2)
+    assert work_queue.lease('ettoday', 'b')['attempts'] == 2
+    assert not work_queue.heartbeat('ettoday', '1-10', 'a')
+    assert not work_queue.complete('ettoday', '1-10', 'a')
+    assert work_queue.lease('ettoday', 'c') is None
+
+    assert work_queue.get_summary() == {
+        'ettoday': {'done': 1, 'failed': 1, 'running': 1},
+    }
+    assert work_queue.reset('ettoday', 'failed') == 1
+    assert work_queue.lease('ettoday', 'c')['unit'] == '11-20'
+    work_queue.close()
+
+
+def test_get_day_units():
+    units = news.crawlers.work_queue.get_day_units(
+        current_datetime=datetime(2021, 1, 3, 12, tzinfo=timezone.utc),
+        past_datetime=datetime(2021, 1, 1, 6, tzinfo=timezone.utc),
+    )
+    assert [unit for unit, _ in units] == ['20210103', '20210102', '20210101']
+    assert units[0][1] == {
+        'current_datetime': '2021-01-03T12:00:00+00:00',
+        'past_datetime': '2021-01-03T00:00:00+00:00',
+    }
+    assert units[2][1]['past_datetime'] == '2021-01-01T06:00:00+00:00'
+
+
+def test_run_worker(tmp_path):
+    work_queue = news.crawlers.work_queue.WorkQueue(
+        db_name=str(tmp_path / 'queue.db'),
+    )
+    work_queue.put('cna', news.crawlers.work_queue.get_day_units(
+        current_datetime=datetime(2021, 1, 10, tzinfo=timezone.utc),
+        past_datetime=datetime(2021, 1, 1, tzinfo=timezone.utc),
+    ))
+    server = news.crawlers.work_queue.get_server(work_queue=work_queue)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    crawled = []
+    failed = []
+
+    def main(current_datetime, past_datetime, db_name, *, debug=False):
+        if current_datetime.day == 5 and not failed:
+            failed.append(db_name)
+            raise Exception('Got banned.')
+        crawled.append(current_datetime.day)
+
+    workers = [
+        threading.Thread(
+            target=news.crawlers.work_queue.run_worker,
+            kwargs={
+                'broker': f'http://127.0.0.1:{server.server_address[1]}',
+                'queue': 'cna',
+                'worker': worker,
+                'func': main,
+                'db_name': f'cna/{worker}.db',
+                'heartbeat_secs': 0.01,
+            },
+        )
+        for worker in ['a', 'b']
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    server.shutdown()
+
+    # Each day is crawled once and failed day is retried.
+    assert sorted(crawled) == list(range(1, 11))
+    assert failed
+    assert work_queue.get_summary() == {'cna': {'done': 10}}
+
+
+def test_server_only_serves_worker_methods(tmp_path):
+    work_queue = news.crawlers.work_queue.WorkQueue(
+        db_name=str(tmp_path / 'queue.db'),
+    )
+    work_queue.put('cna', [('20210101', {})])
+    server = news.crawlers.work_queue.get_server(work_queue=work_queue)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    proxy = news.crawlers.work_queue.get_work_queue(
+        broker=f'http://127.0.0.1:{server.server_address[1]}',
+    )
+    assert proxy.lease('cna', 'a')['unit'] == '20210101'
+    for name in ['put', 'reset', 'close', 'get_summary', 'update_lease']:
+        with pytest.raises(xmlrpc.client.Fault):
+            getattr(proxy, name)('cna')
+    assert proxy.fail('cna', '20210101', 'a', 'Got banned.')
+    server.shutdown()
+    server.server_close()
+    work_queue.close()
+    work_queue.close()
@@ -0,0 +1,38 @@
+import random
+import sqlite3
+
+import news.db
+from news.db.schema import News
+
+
+def random_text(length: int) -> str:
+    return ''.join(chr(random.randint(0x4E00, 0x9FFF)) for _ in range(length))
+
+
+def test_near_duplicates():
+    random.seed(0)
+    original = random_text(500)
+    edited = '(中央社記者台北電)' + original[:200] + random_text(10) + original[210:]
+
+    conn = sqlite3.connect(':memory:')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.db.dedup.create_dedup_table(cur=cur)
+
+    news.db.write.write_new_records(cur=cur, news_list=[
+        News(article=original, url='a'),
+        News(article=random_text(500), url='b'),
+        News(article=edited, url='c'),
+        News(article='', url='d'),
+        News(article='', url='e'),
+    ])
+    assert news.db.dedup.get_duplicate_ids(cur=cur) == [3]
+
+    news.db.write.write_new_records(
+        cur=cur,
+        news_list=[News(article=original, url='f')],
+        drop_near_duplicates=True,
+    )
+    assert len(news.db.read.AllRecords(db_name=None, cur=cur)) == 5
+
+    conn.close()
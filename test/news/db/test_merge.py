@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+
+import news.db
+
+
+def write_db(path, urls, title):
+    conn = sqlite3.connect(path)
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    # Insert directly since `write_new_records` drops duplicated urls.
+    cur.executemany(
+        'INSERT INTO news(title, url) VALUES (?, ?)',
+        [(f'{title} {idx}', url) for idx, url in enumerate(urls)],
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def conn(tmp_path):
+    write_db(tmp_path / 'dest.db', ['a', 'b'], 'dest')
+    write_db(tmp_path / 'src.db', ['b', 'c', 'd', 'c', 'e'], 'src')
+    conn = sqlite3.connect(tmp_path / 'dest.db')
+    yield conn
+    conn.close()
+
+
+def test_merge_records(conn, tmp_path):
+    cur = conn.cursor()
+    progress = list(news.db.merge.merge_records(
+        cur=cur,
+        src_path=str(tmp_path / 'src.db'),
+        batch_size=2,
+    ))
+    assert progress == [(2, 5, 1), (4, 5, 2), (5, 5, 3)]
+    assert list(cur.execute('SELECT id, title, url FROM news')) == [
+        (1, 'dest 0', 'a'),
+        (2, 'dest 1', 'b'),
+        (3, 'src 1', 'c'),
+        (4, 'src 2', 'd'),
+        (5, 'src 4', 'e'),
+    ]
+
+    # Merging again adds nothing, so interrupted merge can be resumed.
+    progress = list(news.db.merge.merge_records(
+        cur=cur,
+        src_path=str(tmp_path / 'src.db'),
+    ))
+    assert progress == [(5, 5, 0)]
+    assert list(cur.execute('PRAGMA database_list'))[-1][1] == 'main'
+
+
+def test_replace(conn, tmp_path):
+    cur = conn.cursor()
+    list(news.db.merge.merge_records(
+        cur=cur,
+        src_path=str(tmp_path / 'src.db'),
+        on_conflict='replace',
+    ))
+    assert list(cur.execute('SELECT title, url FROM news ORDER BY url')) == [
+        ('dest 0', 'a'),
+        ('src 0', 'b'),
+        ('src 3', 'c'),
+        ('src 2', 'd'),
+        ('src 4', 'e'),
+    ]
+
+    news.db.search.create_fts_table(cur=cur)
+    with pytest.raises(ValueError):
+        list(news.db.merge.merge_records(
+            cur=cur,
+            src_path=str(tmp_path / 'src.db'),
+            on_conflict='replace',
+        ))
+
+
+def test_merge_new_table(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'preprocessed.db')
+    conn.execute('''
+        CREATE TABLE news_table (
+            id integer PRIMARY KEY,
+            url text,
+            title text,
+            article text
+        )
+    ''')
+    conn.executemany(
+        'INSERT INTO news_table(url, title, article) VALUES (?, ?, ?)',
+        [('a', '標題', '內文'), ('b', '標題', '內文')],
+    )
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(tmp_path / 'merged.db')
+    cur = conn.cursor()
+    list(news.db.merge.merge_records(
+        cur=cur,
+        src_path=str(tmp_path / 'preprocessed.db'),
+        table='news_table',
+    ))
+    assert list(cur.execute('SELECT * FROM news_table')) == [
+        (1, 'a', '標題', '內文'),
+        (2, 'b', '標題', '內文'),
+    ]
+    conn.close()
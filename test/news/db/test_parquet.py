@@ -0,0 +1,125 @@
+import sqlite3
+
+import pytest
+
+import news.db
+from news.db.schema import News
+
+
+def get_news_list():
+    return [
+        News(
+            article=f'article {idx}',
+            category=category,
+            company=company,
+            datetime=datetime,
+            raw_xml=f'<p>article {idx}</p>',
+            title=f'title {idx}',
+            url=f'https://example.com/{company}/{idx}',
+        )
+        for idx, (company, category, datetime) in enumerate([
+            ('民視', '政治', '2021-05-31T23:00:00.000000Z'),
+            ('民視', '社會', '2021-06-15T04:00:00.000000Z'),
+            ('民視', '政治', '2021-07-01T04:00:00.000000Z'),
+            ('中央社', '政治', '2021-06-15T04:00:00.000000Z'),
+            ('中央社', None, ''),
+        ])
+    ]
+
+
+@pytest.fixture
+def data_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(news.db.util, 'DATA_PATH', str(tmp_path))
+    conn = sqlite3.connect(tmp_path / 'raw.db')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.db.write.write_new_records(cur=cur, news_list=get_news_list())
+    conn.commit()
+    conn.close()
+    return tmp_path
+
+
+def test_export_table(data_path):
+    row_count = news.db.parquet.export_table(
+        db_name='raw.db',
+        dataset_name='raw',
+        batch_size=2,
+        exclude_raw_xml=True,
+    )
+    assert row_count == 5
+
+    # Partitioned by company and release month, one file each.
+    partitions = news.db.parquet.read_columns(
+        dataset_name='raw',
+        columns=['company', 'month'],
+    )
+    assert sorted(zip(*partitions.values()), key=str) == [
+        ('中央社', '2021-06'),
+        ('中央社', None),
+        ('民視', '2021-05'),
+        ('民視', '2021-06'),
+        ('民視', '2021-07'),
+    ]
+    assert len(news.db.parquet.get_dataset('raw').files) == 5
+    assert 'raw_xml' not in news.db.parquet.get_dataset('raw').schema.names
+
+    columns = news.db.parquet.read_columns(
+        dataset_name='raw',
+        columns=['title', 'category', 'datetime'],
+        companies=['民視'],
+        months=['2021-06', '2021-07'],
+    )
+    assert sorted(zip(*columns.values())) == [
+        ('title 1', '社會', '2021-06-15T04:00:00.000000Z'),
+        ('title 2', '政治', '2021-07-01T04:00:00.000000Z'),
+    ]
+
+    with pytest.raises(ValueError):
+        news.db.parquet.export_table(
+            db_name='raw.db',
+            dataset_name='raw',
+            table='raw',
+        )
+
+
+def test_load_columns(data_path):
+    # Both SQLite file and Parquet dataset give the same rows, with values of
+    # each row at the same index of columns.
+    dataset = pytest.importorskip('news.preprocess.dataset')
+    conn = sqlite3.connect(data_path / 'news.db')
+    cur = conn.cursor()
+    news.db.preprocessed.create_table(cur=cur)
+    list(news.db.preprocessed.write_records(
+        cur=cur,
+        records=[
+            {
+                'id': idx + 1,
+                'url': n.url,
+                'time': n.datetime,
+                'company': n.company,
+                'label': n.category,
+                'title': n.title,
+                'article': n.article,
+            }
+            for idx, n in enumerate(get_news_list())
+        ],
+    ))
+    conn.commit()
+    conn.close()
+
+    news.db.parquet.export_table(
+        db_name='news.db',
+        dataset_name='news',
+        table='news_table',
+    )
+    columns = ['id', 'title', 'label']
+    sqlite_columns = dataset.load_columns(
+        db_path=str(data_path / 'news.db'),
+        columns=columns,
+    )
+    parquet_columns = dataset.load_columns(
+        db_path=str(data_path / 'news'),
+        columns=columns,
+    )
+    assert sorted(zip(*parquet_columns)) == sorted(zip(*sqlite_columns))
+    assert len(sqlite_columns[0]) == 5
@@ -0,0 +1,55 @@
+import sqlite3
+
+import pytest
+
+import news.db
+
+
+@pytest.fixture
+def cur():
+    conn = sqlite3.connect(':memory:')
+    cur = conn.cursor()
+    news.db.preprocessed.create_table(cur=cur)
+    yield cur
+    conn.close()
+
+
+def get_records(n: int):
+    for idx in range(n):
+        # Keys are mapped by name regardless of order.
+        yield {
+            'title': f'title {idx}',
+            'url': f'https://example.com/{idx}',
+            'id': idx + 1,
+            'article': f'article {idx}',
+        }
+
+
+def test_write_records(cur):
+    progress = list(news.db.preprocessed.write_records(
+        cur=cur,
+        records=get_records(5),
+        batch_size=2,
+        defer_index=True,
+    ))
+    assert progress == [2, 4, 5]
+    assert list(cur.execute('SELECT * FROM news_table WHERE id = 2')) == [
+        (2, 'https://example.com/1', None, None, None, None, 'title 1',
+         'article 1', None),
+    ]
+    # Deferred index is built after writing.
+    assert list(cur.execute('''
+        SELECT name FROM sqlite_master WHERE type = 'index'
+    ''')) == [('news_table_url_index',)]
+
+
+def test_unknown_column(cur):
+    with pytest.raises(ValueError):
+        list(news.db.preprocessed.write_records(
+            cur=cur,
+            records=[{'url': 'a', 'time_': ''}],
+            defer_index=True,
+        ))
+    assert list(cur.execute('''
+        SELECT name FROM sqlite_master WHERE type = 'index'
+    ''')) == [('news_table_url_index',)]
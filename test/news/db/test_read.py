@@ -0,0 +1,75 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+import news.db
+from news.db.schema import News
+
+
+@pytest.fixture
+def cur():
+    conn = sqlite3.connect(':memory:')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.db.write.write_new_records(cur=cur, news_list=[
+        News(
+            article=f'article {idx}',
+            company=company,
+            datetime=f'2021-06-{day:02d}T04:00:00.000000Z',
+            raw_xml='<html></html>',
+            title=f'title {idx}',
+            url=f'https://example.com/{company}/{idx}',
+        )
+        for idx, (company, day) in enumerate([
+            ('民視', 1),
+            ('民視', 15),
+            ('民視', 30),
+            ('中央社', 15),
+        ])
+    ])
+    yield cur
+    conn.close()
+
+
+def test_create_index(cur):
+    index_names = set(map(lambda row: row[0], cur.execute('''
+        SELECT name FROM sqlite_master WHERE type = 'index'
+    ''')))
+    assert 'news_company_datetime_index' in index_names
+    assert 'news_url_index' in index_names
+
+    plan = ' '.join(map(lambda row: row[-1], cur.execute('''
+        EXPLAIN QUERY PLAN
+        SELECT url FROM news WHERE company = ? AND datetime >= ?
+    ''', ['民視', ''])))
+    assert 'news_company_datetime_index' in plan
+
+
+def test_write_existed_url(cur):
+    news.db.write.write_new_records(cur=cur, news_list=[
+        News(url='https://example.com/民視/0'),
+        News(url='https://example.com/new'),
+        News(url='https://example.com/new'),
+    ])
+    assert len(news.db.read.AllRecords(db_name=None, cur=cur)) == 5
+
+
+def test_range_records(cur):
+    records = news.db.read.RangeRecords(
+        db_name=None,
+        cur=cur,
+        company='民視',
+        current_datetime=datetime(2021, 6, 30, tzinfo=timezone.utc),
+        past_datetime='2021-06-10T00:00:00.000000Z',
+        with_raw_xml=False,
+    )
+    assert [n.title for n in records] == ['title 1']
+    assert records[0].raw_xml == ''
+
+    records = news.db.read.RangeRecords(
+        db_name=None,
+        cur=cur,
+        company=['民視', '中央社'],
+    )
+    assert len(records) == 4
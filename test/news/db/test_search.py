@@ -0,0 +1,49 @@
+import sqlite3
+
+import pytest
+
+import news.db
+from news.db.schema import News
+
+
+@pytest.fixture
+def cur():
+    conn = sqlite3.connect(':memory:')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.db.search.create_fts_table(cur=cur)
+    yield cur
+    conn.close()
+
+
+def test_to_bigrams():
+    assert news.db.search.to_bigrams('台灣大學NTU，好') == '台灣 灣大 大學 NTU 好'
+    assert news.db.search.to_bigrams(
+        '台灣大學NTU，好',
+        index=True,
+    ) == '台灣 灣大 大學 學 NTU 好'
+
+
+def test_search(cur):
+    news.db.write.write_new_records(cur=cur, news_list=[
+        News(title='台灣大學開學', article='今天台大開學。', url='a'),
+        News(title='颱風', article='台灣大學停課，NTU 宣布。', url='b'),
+        News(title='台灣，大學', article='', url='c'),
+    ])
+    # Indexed incrementally by `write_new_records`.
+    news.db.write.write_new_records(cur=cur, news_list=[
+        News(title='清華大學', article='台灣大學 與 清華大學。', url='d'),
+    ])
+
+    # Title matches are ranked first.
+    assert news.db.search.search(cur=cur, text='台灣大學')[0] == 1
+    assert set(news.db.search.search(cur=cur, text='台灣大學')) == {1, 2, 4}
+    assert news.db.search.search(cur=cur, text='台灣大學 ntu') == [2]
+    assert news.db.search.search(cur=cur, text='颱') == [2]
+    # Characters at the end of CJK runs are found as well.
+    assert news.db.search.search(cur=cur, text='風') == [2]
+    assert set(news.db.search.search(cur=cur, text='學')) == {1, 2, 3, 4}
+    # Whole runs still match longer runs.
+    assert news.db.search.search(cur=cur, text='開學') == [1]
+    assert news.db.search.search(cur=cur, text='台大開學') == [1]
+    assert news.db.search.index_new_records(cur=cur) == 0
@@ -0,0 +1,150 @@
+import dataclasses
+import os
+import sqlite3
+
+import pytest
+
+import news.db
+from news.db.schema import News
+
+
+def get_news_list(start: int = 0):
+    return [
+        News(
+            article=f'article {idx}',
+            company=company,
+            datetime=datetime,
+            title=f'title {idx}',
+            url=f'https://example.com/{company}/{idx}',
+        )
+        for idx, (company, datetime) in enumerate([
+            ('民視', '2021-05-31T23:00:00.000000Z'),
+            ('民視', '2021-06-15T04:00:00.000000Z'),
+            ('民視', '2021-07-01T04:00:00.000000Z'),
+            ('中央社', '2021-06-15T04:00:00.000000Z'),
+            ('中央社', ''),
+        ], start)
+    ]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'raw.db')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.db.shard.create_shard_table(cur=cur)
+    news.db.write.write_new_records(cur=cur, news_list=get_news_list())
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_write_new_records(conn, tmp_path):
+    cur = conn.cursor()
+    shard_dir = tmp_path / 'raw.shards'
+    assert sorted(
+        os.path.relpath(path, shard_dir)
+        for path in shard_dir.glob('*/*.db')
+    ) == [
+        '中央社/202106.db',
+        '中央社/unknown.db',
+        '民視/202105.db',
+        '民視/202106.db',
+        '民視/202107.db',
+    ]
+    assert list(cur.execute('SELECT COUNT(*) FROM news'))[0][0] == 0
+
+    # Existed urls are found without opening shards.
+    assert news.db.write.get_existed_url(
+        cur=cur,
+        urls=['https://example.com/民視/0', 'https://example.com/a'],
+    ) == {'https://example.com/民視/0'}
+    news.db.write.write_new_records(cur=cur, news_list=get_news_list())
+    assert len(list(news.db.read.query_records(cur=cur))) == 5
+
+
+def test_query_records(conn):
+    cur = conn.cursor()
+    assert news.db.shard.get_shards(
+        cur=cur,
+        company='民視',
+        past_datetime='2021-06-01T00:00:00.000000Z',
+    ) == ['民視/202106', '民視/202107']
+
+    records = list(news.db.read.query_records(
+        cur=cur,
+        company=['民視', '中央社'],
+        past_datetime='2021-06-01T00:00:00.000000Z',
+        current_datetime='2021-06-30T00:00:00.000000Z',
+        with_raw_xml=False,
+    ))
+    assert sorted(n.url for n in records) == [
+        'https://example.com/中央社/3',
+        'https://example.com/民視/1',
+    ]
+
+
+def test_move_records(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'old.db')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.db.write.write_new_records(cur=cur, news_list=get_news_list())
+
+    # News in `news` table would be hidden by shards.
+    with pytest.raises(ValueError):
+        news.db.shard.create_shard_table(cur=cur)
+    assert news.db.shard.move_records(cur=cur, batch_size=2) == 5
+    conn.commit()
+
+    assert list(cur.execute('SELECT COUNT(*) FROM news'))[0][0] == 0
+    assert len(list(news.db.read.query_records(cur=cur))) == 5
+
+    # Moved urls are still deduplicated.
+    news.db.write.write_new_records(cur=cur, news_list=get_news_list())
+    assert len(list(news.db.read.query_records(cur=cur))) == 5
+    news.db.shard.create_shard_table(cur=cur)
+    conn.close()
+
+
+def test_move_records_with_indexes(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'old.db')
+    cur = conn.cursor()
+    news.db.create.create_table(cur=cur)
+    news.db.search.create_fts_table(cur=cur)
+    news.db.dedup.create_dedup_table(cur=cur)
+    news_list = get_news_list()
+    # Near duplicate of news in the same shard.
+    news_list[0].article = '颱風 ' * 40
+    news_list.append(dataclasses.replace(
+        news_list[0],
+        url='https://example.com/copy',
+    ))
+    news.db.write.write_new_records(cur=cur, news_list=news_list)
+
+    assert news.db.shard.move_records(cur=cur) == 6
+    conn.commit()
+
+    # No stale index rows are left in the source database.
+    assert news.db.search.search(cur=cur, text='article') == []
+    for table in ['news_signature', 'news_lsh']:
+        assert list(cur.execute(f'SELECT COUNT(*) FROM {table}'))[0][0] == 0
+
+    # Shards are indexed on write.
+    shard_conn = news.db.shard.get_shard_conn(
+        shard_dir=news.db.shard.get_shard_dir(cur=cur),
+        shard='民視/202105',
+    )
+    shard_cur = shard_conn.cursor()
+    assert len(news.db.search.search(cur=shard_cur, text='颱風')) == 2
+    assert len(news.db.dedup.get_duplicate_ids(cur=shard_cur)) == 1
+    shard_conn.close()
+
+    # News written later are indexed as well.
+    news.db.write.write_new_records(cur=cur, news_list=get_news_list(5))
+    shard_conn = news.db.shard.get_shard_conn(
+        shard_dir=news.db.shard.get_shard_dir(cur=cur),
+        shard='中央社/202106',
+    )
+    assert news.db.search.search(cur=shard_conn.cursor(), text='title 8')
+    shard_conn.close()
+    conn.close()
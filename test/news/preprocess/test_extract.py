@@ -0,0 +1,89 @@
+import pytest
+from bs4 import BeautifulSoup
+
+import news.preprocess.extract
+from news.preprocess.extract import Extractor
+
+HTML = (
+    '<html><body>'
+    '<nav><a href="/">home</a></nav>'
+    '<div class="story">'
+    '<p>first</p><script>var a;</script><p class="ad">ad</p>'
+    '<figure><p>caption</p></figure><p>second <a>link</a></p>'
+    '</div>'
+    '<h1 class="title">title</h1>'
+    '</body></html>'
+)
+FIELDS = {
+    'article': 'div.story > p:not([class])',
+    'caption': 'figure p',
+    'link': 'div.story a',
+    'title': 'h1.title, h2.title',
+    'ad': '.ad',
+}
+
+
+def test_extract():
+    extractor = Extractor(fields=FIELDS, removals=['script', 'figure'])
+    soup = BeautifulSoup(HTML, 'html.parser')
+    fields = extractor.extract(soup)
+
+    assert [tag.text for tag in fields.select('article')] == [
+        'first', 'second link',
+    ]
+    assert [tag.text for tag in fields.select('title')] == ['title']
+    assert [tag.text for tag in fields.select('ad')] == ['ad']
+    # Removed tags and their descendants are not selected.
+    assert fields.select('caption') == []
+    assert soup.select('script, figure') == []
+
+    # Tags removed by parser after extraction are not selected either.
+    soup.select('div.story > p')[-1].extract()
+    assert fields.select('link') == []
+
+
+def test_extract_same_as_select():
+    extractor = Extractor(fields=FIELDS)
+    soup = BeautifulSoup(HTML, 'html.parser')
+    fields = extractor.extract(soup)
+    for name, selector in FIELDS.items():
+        tags = fields.select(name)
+        expected = soup.select(selector)
+        assert len(tags) == len(expected)
+        assert all(tag is other for tag, other in zip(tags, expected))
+
+
+def test_parse_regions(monkeypatch):
+    monkeypatch.setattr(news.preprocess.extract, 'PARTIAL', True)
+    extractor = Extractor(
+        fields=FIELDS,
+        removals=['script', 'figure'],
+        regions=['div.story', 'h1.title'],
+    )
+    soup = extractor.parse(HTML)
+    # Navigation is not parsed.
+    assert soup.select('nav') == []
+
+    fields = extractor.extract(soup)
+    whole_fields = extractor.extract(BeautifulSoup(HTML, 'html.parser'))
+    for name in FIELDS:
+        assert [tag.text for tag in fields.select(name)] == [
+            tag.text for tag in whole_fields.select(name)
+        ]
+
+    with pytest.raises(ValueError):
+        Extractor(fields=FIELDS, regions=['div.story > p'])
+
+
+def test_parse_whole_page_by_default():
+    # Stray end tag inside region closes `section` outside it.
+    html = (
+        '<section><div class="story"><p>first</p></section>'
+        '<p>second</p></div></section>'
+    )
+    extractor = Extractor(
+        fields={'article': 'div.story > p'},
+        regions=['div.story'],
+    )
+    fields = extractor.extract(extractor.parse(html))
+    assert [tag.text for tag in fields.select('article')] == ['first']
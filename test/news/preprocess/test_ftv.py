@@ -1,7 +1,39 @@
+import os
+
 import pytest
+import requests
+
+import news.crawlers
 import news.preprocess.ftv
 from news.db.schema import News
-import requests
+
+# Pages of news saved as `{id}.html`.
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'ftv')
+
+
+@pytest.fixture(autouse=True)
+def response_cache(tmp_path):
+    # Replay saved pages, so that no request is sent.
+    news.crawlers.cache.set_cache(
+        db_name=str(tmp_path / 'cache.db'),
+        mode='replay',
+    )
+    for file_name in os.listdir(FIXTURE_DIR):
+        url = (
+            'https://www.ftvnews.com.tw/news/detail/'
+            f'{os.path.splitext(file_name)[0]}'
+        )
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        response.encoding = 'utf-8'
+        with open(os.path.join(FIXTURE_DIR, file_name), 'rb') as f:
+            response._content = f.read()
+        response._content_consumed = True
+        news.crawlers.cache.CACHE.store(url=url, response=response)
+    yield
+    news.crawlers.cache.set_cache(db_name=None)
 
 
 @pytest.fixture(params=[
@@ -43,8 +75,7 @@ def news_sample(request):
 def test_consistency(news_sample):
     # Fetch news.
     url = news_sample['url']
-    response = requests.get(url)
-    response.close()
+    response = news.crawlers.util.get(url=url)
 
     # Parse news.
     parserd_news = news.preprocess.ftv.parse(News(
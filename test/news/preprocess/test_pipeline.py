@@ -0,0 +1,138 @@
+import importlib
+import sys
+
+import pytest
+
+import news.preprocess.pipeline
+from news.preprocess.pipeline import Stage
+
+CALLS = []
+
+
+def upper(dataset):
+    CALLS.append('upper')
+    return [{'title': data['title'].upper()} for data in dataset]
+
+
+def length_filter(dataset, min_bound):
+    CALLS.append('length_filter')
+    return [data for data in dataset if len(data['title']) > min_bound]
+
+
+def test_run_stages(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+
+    def load():
+        CALLS.append('load')
+        return [{'title': 'a'}, {'title': 'bcd'}]
+
+    def run(min_bound):
+        CALLS.clear()
+        return news.preprocess.pipeline.run_stages(
+            load=load,
+            input_key='input',
+            stages=[
+                Stage(upper),
+                Stage(length_filter, {'min_bound': min_bound}),
+            ],
+            cache_dir=cache_dir,
+        )
+
+    assert run(min_bound=1)[0] == [{'title': 'BCD'}]
+    assert CALLS == ['load', 'upper', 'length_filter']
+
+    # Unchanged stages are loaded from cache.
+    dataset, stats = run(min_bound=1)
+    assert dataset == [{'title': 'BCD'}]
+    assert CALLS == []
+    assert all(stat['cached'] for stat in stats)
+
+    # Only changed stage runs again.
+    assert run(min_bound=0)[0] == [{'title': 'A'}, {'title': 'BCD'}]
+    assert CALLS == ['length_filter']
+
+
+def test_get_path_key(tmp_path):
+    (tmp_path / 'ner').mkdir()
+    (tmp_path / 'ner' / 'title-0.json').write_text('[]')
+    key = news.preprocess.pipeline.get_path_key(str(tmp_path / 'ner'))
+
+    (tmp_path / 'ner' / 'article-0.json').write_text('[]')
+    assert news.preprocess.pipeline.get_path_key(str(tmp_path / 'ner')) != key
+
+
+def test_get_stage_key(tmp_path, monkeypatch):
+    (tmp_path / 'stages.py').write_text(
+        'MIN_BOUND = 1\n'
+        '\n'
+        '\n'
+        'def get_length(data):\n'
+        '    return len(data)\n'
+        '\n'
+        '\n'
+        'def length_filter(dataset):\n'
+        '    return [d for d in dataset if get_length(d) > MIN_BOUND]\n'
+        '\n'
+        '\n'
+        'def upper(dataset):\n'
+        '    return [data.upper() for data in dataset]\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'stages', raising=False)
+    stages = importlib.import_module('stages')
+
+    def get_key(**kwargs):
+        return news.preprocess.pipeline.get_stage_key(
+            input_key='input',
+            stage=Stage(stages.length_filter, **kwargs),
+        )
+
+    def edit(old, new):
+        (tmp_path / 'stages.py').write_text(
+            (tmp_path / 'stages.py').read_text().replace(old, new)
+        )
+        importlib.reload(stages)
+
+    key = get_key()
+    assert get_key(version='2') != key
+
+    # Functions not used by stage are not part of the key.
+    edit('data.upper()', 'data.lower()')
+    assert get_key() == key
+
+    # Helpers and constants used by stage are part of the key.
+    edit('len(data)', 'len(data.strip())')
+    assert get_key() != key
+    key = get_key()
+    edit('= 1', '= 2')
+    assert get_key() != key
+    monkeypatch.delitem(sys.modules, 'stages')
+
+
+def test_run_stages_in_chunks():
+    stages = news.preprocess.pipeline.get_stages(
+        spec=[
+            {'name': 'upper'},
+            {'name': 'length_filter', 'params': {'min_bound': 1}},
+        ],
+        stage_dict={'upper': upper, 'length_filter': length_filter},
+    )
+    dataset, stats = news.preprocess.pipeline.run_stages(
+        load=lambda: [{'title': 'a' * (idx % 3)} for idx in range(10)],
+        input_key='input',
+        stages=stages,
+        cache_dir=None,
+        n_workers=2,
+        chunk_size=3,
+    )
+    assert dataset == [{'title': 'AA'}] * 3
+    assert [(s['stage'], s['n_in'], s['n_out']) for s in stats] == [
+        ('upper', 10, 10),
+        ('length_filter', 10, 3),
+    ]
+
+    with pytest.raises(ValueError):
+        news.preprocess.pipeline.get_stages(
+            spec=[{'name': 'number_filter'}],
+            stage_dict={'upper': upper},
+        )
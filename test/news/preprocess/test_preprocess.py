@@ -0,0 +1,48 @@
+import json
+
+import news.preprocess.pipeline
+import news.preprocess.preprocess
+from news.preprocess.pipeline import Stage
+
+
+def test_date_filter_loads_ner_result_once(tmp_path, monkeypatch):
+    dataset = [
+        {'id': idx, 'title': '5月1日', 'article': f'{idx}年5月1日'}
+        for idx in range(4)
+    ]
+    ner_dir = tmp_path / 'ner'
+    ner_dir.mkdir()
+    for field in ['title', 'article']:
+        (ner_dir / f'{field}-0.json').write_text(json.dumps([
+            {
+                'id': data['id'],
+                field: data[field],
+                'NER_result': [{'word': data[field], 'ner': 'DATE'}],
+            }
+            for data in dataset
+        ]))
+
+    calls = []
+    read_ner_result = news.preprocess.preprocess.read_ner_result
+
+    def count_read_ner_result(NER_result_dir):
+        calls.append(NER_result_dir)
+        return read_ner_result(NER_result_dir)
+
+    monkeypatch.setattr(news.preprocess.preprocess, 'NER_RESULTS', {})
+    monkeypatch.setattr(
+        news.preprocess.preprocess,
+        'read_ner_result',
+        count_read_ner_result,
+    )
+    output, _ = news.preprocess.pipeline.run_stage(
+        stage=Stage(
+            news.preprocess.preprocess.date_filter,
+            {'NER_result_dir': str(ner_dir)},
+        ),
+        dataset=dataset,
+        chunk_size=1,
+    )
+    assert calls == [str(ner_dir)]
+    assert [data['article'] for data in output] == ['<num>年<num>月<num>日'] * 4
+    assert [data['title'] for data in output] == ['<num>月<num>日'] * 4
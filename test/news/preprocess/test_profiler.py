@@ -0,0 +1,37 @@
+import time
+
+import news.preprocess.pipeline
+import news.preprocess.profiler
+from news.preprocess.pipeline import Stage
+
+
+def busy_filter(dataset):
+    end = time.perf_counter() + 0.1
+    while time.perf_counter() < end:
+        pass
+    return [data for data in dataset if data['title']]
+
+
+def test_run_stages_stats():
+    dataset, stats = news.preprocess.pipeline.run_stages(
+        load=lambda: [{'title': '標題', 'article': '內文'}, {'title': ''}],
+        input_key='input',
+        stages=[Stage(busy_filter)],
+        cache_dir=None,
+        trace_memory=True,
+        sample_interval=0.001,
+    )
+    assert len(dataset) == 1
+    stat = stats[0]
+    assert (stat['n_in'], stat['n_out'], stat['n_chars']) == (2, 1, 4)
+    assert stat['cpu_seconds'] > 0.05
+    assert stat['peak_bytes'] is not None
+
+    # Most samples are taken in `busy_filter`.
+    name = max(stat['samples']['self'], key=stat['samples']['self'].get)
+    assert name.startswith('busy_filter ')
+    assert news.preprocess.profiler.get_slowest_stage(stats) is stat
+    assert 'busy_filter' in news.preprocess.profiler.format_stats(stats)
+    assert 'busy_filter' in news.preprocess.profiler.format_samples(
+        stat['samples']
+    )
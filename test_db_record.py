@@ -1,14 +1,8 @@
 import news.db
 from bs4 import BeautifulSoup
-from tqdm import tqdm
 
 if __name__ == '__main__':
-    dset = news.db.read.AllRecords(db_name='test.db')
-
-    res = []
-    for n in tqdm(dset):
-        if n.company == '新唐人':
-            res.append(n)
+    res = news.db.read.RangeRecords(db_name='test.db', company='新唐人')
 
     print(f'number of news: {len(res)}')
     n_article = [r for r in res if not r.article]
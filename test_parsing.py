@@ -4,15 +4,15 @@ from bs4 import BeautifulSoup
 from tqdm import tqdm
 
 if __name__ == '__main__':
-    dset = news.db.read.AllRecords(db_name='ftv.db')
+    dset = news.db.read.RangeRecords(db_name='ftv.db', company='民視')
 
     res = []
     for i, n in enumerate(tqdm(dset)):
         try:
             # if '120940/5544528' in n.url:
-            if n.company == '民視':
-                # if any(map(lambda url: url in n.url, ['2021702W0010', '2021702W0111'])):
-                res.append(news.preprocess.ftv.parse(n))
+            # if any(map(lambda url: url in n.url,
+            #            ['2021702W0010', '2021702W0111'])):
+            res.append(news.preprocess.ftv.parse(n))
         except Exception as err:
             print(err.args)
 